@@ -0,0 +1,125 @@
+# availability.py
+"""
+Cheap "is this session published yet?" checks for readme_machine.
+
+Instead of loading a session's laps to find out whether FastF1 has data for
+it, ``probe_session`` downloads only the session's status stream from the
+F1 live timing API and looks for the session having finished. Answers are
+kept in a small JSON index (``cache/availability.json``) keyed by year,
+event and session:
+
+- a published session stays published, so positive answers never expire;
+- negative answers expire after ``ttl`` seconds, so a session that is not
+  out yet gets probed again on a later run.
+
+Every run that fetches a season's event schedule also keeps the events and
+their last session times in ``cache/schedule_<year>.json``, so
+``readme_machine --plan`` can pick the event without FastF1 or the network.
+"""
+import json
+import os
+import time
+
+INDEX_PATH = os.path.join("cache", "availability.json")
+SCHEDULE_PATH = os.path.join("cache", "schedule_{year}.json")
+DEFAULT_TTL = 30 * 60
+
+# SessionStatus values sent once a session is over
+_FINISHED = {"Finished", "Finalised", "Ends"}
+
+
+def finished(statuses):
+    """True if the SessionStatus values *statuses* include a finished one."""
+    return any(status in _FINISHED for status in statuses)
+
+
+def probe_session(sess):
+    """True if the live timing API has a finished status for *sess*."""
+    from fastf1 import _api
+    response = _api.fetch_page(sess.api_path, "session_status")
+    if not response:
+        return False
+    return finished(row.get("Status") for _, row in response if isinstance(row, dict))
+
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def save_index(index, path=INDEX_PATH):
+    _write_json(path, index)
+
+
+def save_schedule(year, events, path=SCHEDULE_PATH):
+    """
+    Keep the events of *year*, dicts with ``EventName``, ``EventFormat`` and
+    ``LastSessionUtc`` (ISO 8601 in UTC, or None), for ``load_schedule``.
+    """
+    _write_json(path.format(year=year), events)
+
+
+def load_schedule(year, path=SCHEDULE_PATH):
+    """The events kept by ``save_schedule`` for *year*, or None if there are none."""
+    try:
+        with open(path.format(year=year), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def completed_from_schedule(events, now=None):
+    """The *events* whose last session is over, newest first."""
+    now = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(now))
+    done = [ev for ev in events if ev.get("LastSessionUtc") and ev["LastSessionUtc"] < now]
+    return sorted(done, key=lambda ev: ev["LastSessionUtc"], reverse=True)
+
+
+def _key(year, event_name, code):
+    return f"{year}|{event_name}|{code}"
+
+
+def cached_availability(index, year, event_name, code, ttl=DEFAULT_TTL, now=None):
+    """The indexed answer for a session, or None if unknown or expired."""
+    entry = index.get(_key(year, event_name, code))
+    if entry is None:
+        return None
+    if entry["available"]:
+        return True
+    now = time.time() if now is None else now
+    if now - entry["checked"] < ttl:
+        return False
+    return None
+
+
+def record_availability(index, year, event_name, code, available, now=None):
+    index[_key(year, event_name, code)] = {
+        "available": bool(available),
+        "checked": time.time() if now is None else now,
+    }
+
+
+def session_available(index, year, event_name, code, probe, ttl=DEFAULT_TTL):
+    """
+    Whether a session has data, from the index or, if that has no fresh
+    answer, by calling ``probe()`` and recording its result.
+    """
+    available = cached_availability(index, year, event_name, code, ttl)
+    if available is None:
+        available = bool(probe())
+        record_availability(index, year, event_name, code, available)
+    return available
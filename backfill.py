@@ -0,0 +1,173 @@
+# backfill.py
+"""
+Re-render past weekends without touching the code.
+
+    python backfill.py 2025                      # every completed 2025 event
+    python backfill.py 2024 --to 2025 --workers 4
+    python backfill.py 2025 --events "Austria" "British Grand Prix"
+
+The backfill is a list of (event, session, plot) jobs. Jobs are grouped by
+session, so each session is loaded once, with only the data its remaining
+plots need, and the sessions run on a pool of ``--workers`` processes.
+Every plot that renders is written to a checkpoint file as soon as its
+session finishes, so an interrupted backfill picks up where it stopped;
+plots that failed are tried again on the next run. Checkpoint entries
+include the plot's version and the image options, so a later backfill
+renders a plot again once its version is bumped or the images are asked
+for in another format or size.
+
+README.md is only rewritten when the latest event with data is part of the
+backfill, and then only from the images of that event.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from instrumentation import print_summary, write_report
+from image_output import ImageOptions
+from manifest import load_manifest
+from plot_registry import plot_version
+from readme_machine import (
+    add_image_arguments, completed_events, configure, event_dir,
+    get_latest_event_with_fastf1_data,
+    image_options, planned_plots, readme_sections, render_session, session_images,
+    update_readme_sections, weekend_sessions,
+)
+
+CHECKPOINT_PATH = os.path.join("cache", "backfill.json")
+REPORT_PATH = os.path.join("cache", "backfill_report.json")
+
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        return set()
+
+
+def save_checkpoint(done, path=CHECKPOINT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sorted(done), f, indent=0)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _job_key(year, event_name, tag, plot, output=None):
+    params = (output or ImageOptions()).fingerprint_params()
+    return "|".join([str(year), event_name, tag, plot, f"v{plot_version(plot)}", *params])
+
+
+def select_events(year, names=None):
+    """Completed events of ``year``, oldest first, optionally only ``names``."""
+    import fastf1
+
+    done = completed_events(year).iloc[::-1]
+    if not names:
+        return [ev for _, ev in done.iterrows()]
+    sched = fastf1.get_event_schedule(year, include_testing=False)
+    wanted = {sched.get_event_by_name(name)["EventName"] for name in names}
+    return [ev for _, ev in done.iterrows() if ev["EventName"] in wanted]
+
+
+def build_jobs(years, names=None):
+    """Every (year, event, tag, code, plot) of a backfill."""
+    jobs = []
+    for year in years:
+        for ev in select_events(year, names):
+            is_sprint = "sprint" in str(ev.get("EventFormat", "")).strip().lower()
+            for tag, code in weekend_sessions(is_sprint):
+                for plot in planned_plots(tag):
+                    jobs.append((year, ev["EventName"], tag, code, plot))
+    return jobs
+
+
+def rendered_plots(folder, image_paths):
+    """Names of the plots behind ``image_paths``, read from the manifest."""
+    manifest = load_manifest(folder)
+    return [manifest[os.path.basename(p)]["plot"] for p in image_paths]
+
+
+def backfill(years, names=None, workers=1, threads=1, force=False,
+             checkpoint=CHECKPOINT_PATH, report=REPORT_PATH, output=None, low_memory=False):
+    started = time.perf_counter()
+    configure()
+    done = set() if force else load_checkpoint(checkpoint)
+    jobs = build_jobs(years, names)
+
+    # one task per session, carrying the plots it still has to render
+    sessions = {}
+    for year, event_name, tag, code, plot in jobs:
+        if _job_key(year, event_name, tag, plot, output) in done:
+            continue
+        sessions.setdefault((year, event_name, tag, code), []).append(plot)
+    print(f"Backfill: {len(jobs)} plots, {len(jobs) - sum(map(len, sessions.values()))} "
+          f"already done, {len(sessions)} sessions to load")
+
+    tasks = [(year, event_name, event_dir(year, event_name), tag, code, threads, force, plots,
+              output, None, low_memory)
+             for (year, event_name, tag, code), plots in sessions.items()]
+
+    stats = []
+
+    def finish(task, result):
+        year, event_name, year_gp, tag = task[:4]
+        folder = os.path.join("visualization", year_gp, tag)
+        for plot in rendered_plots(folder, result[1]):
+            done.add(_job_key(year, event_name, tag, plot, output))
+        save_checkpoint(done, checkpoint)
+        stats.append(dict(result[2], session=f"{year_gp}/{tag}"))
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                 initializer=configure) as pool:
+            futures = {pool.submit(render_session, *task): task for task in tasks}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    else:
+        for task in tasks:
+            finish(task, render_session(*task))
+
+    wall = time.perf_counter() - started
+    write_report(report, stats, wall)
+    print_summary(stats, wall)
+
+    # the README always shows the latest event, so only refresh it for that one
+    latest_year = time.gmtime().tm_year
+    if latest_year not in years:
+        return
+    ev = get_latest_event_with_fastf1_data(latest_year)
+    if ev is None or ev["EventName"] not in {job[1] for job in jobs if job[0] == latest_year}:
+        return
+    is_sprint = "sprint" in str(ev.get("EventFormat", "")).strip().lower()
+    year_gp = event_dir(latest_year, ev["EventName"])
+    results = [(tag, session_images(os.path.join("visualization", year_gp, tag), tag))
+               for tag, _ in weekend_sessions(is_sprint)]
+    update_readme_sections(readme_sections(results, is_sprint))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render the plots of past weekends")
+    parser.add_argument("year", type=int, help="season to backfill")
+    parser.add_argument("--to", type=int, default=None,
+                        help="last season of a range of seasons (default: only YEAR)")
+    parser.add_argument("--events", nargs="+", default=None,
+                        help="only these events (names as accepted by FastF1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="load and render sessions in this many worker processes (default: 1)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="render each session's plots in this many threads (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the checkpoint and the render manifests")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="compact each session's laps and telemetry and drop the telemetry "
+                             "once no plot needs it")
+    add_image_arguments(parser)
+    args = parser.parse_args()
+    years = list(range(args.year, (args.to or args.year) + 1))
+    backfill(years, args.events, workers=args.workers, threads=args.threads, force=args.force,
+             output=image_options(args), low_memory=args.low_memory)
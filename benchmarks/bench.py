@@ -0,0 +1,272 @@
+# benchmarks/bench.py
+"""
+Offline benchmarks for visualization.py and the readme_machine pipeline.
+
+    python benchmarks/bench.py                                 # print a table
+    python benchmarks/bench.py --out benchmarks/baseline.json  # store a baseline
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+
+Every plot the README pipeline draws is run on synthetic sessions (see
+synthetic_session.py) and its time is split into three stages:
+
+- prep: from the call until the plot enters its figure style
+- draw: building the figure inside the style block
+- save: ``savefig``, where Agg actually rasterises the figure
+
+Each run starts cold (the session's shared tables are dropped first) and
+the fastest of ``--repeat`` runs is kept. The full pipeline is timed by
+running ``readme_machine.main`` on a synthetic weekend, with session
+generation standing in for the FastF1 download; the generation times are
+reported separately under ``sessions``.
+
+``--compare`` flags every total that got slower than the baseline by more
+than ``--threshold`` (relative) and ``--min-delta`` seconds, and exits with
+status 1 if there is any.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+# (README tag, FastF1 session code); FP2/FP3 and the sprint sessions draw the
+# same plots as FP1 and the race
+SESSIONS = [("FP1", "FP1"), ("QUALIFYING", "Q"), ("RACE", "R")]
+EVENT_NAME = "Synthetic Grand Prix"
+
+# SC and VSC laps of the synthetic race, as [first, last] laps of a
+# RACE_LAPS-lap race; shorter or longer races have them at the same stage
+RACE_LAPS = 55
+RACE_SC = [(12, 15)]
+RACE_VSC = [(30, 31)]
+
+
+def race_periods(periods, n_laps):
+    """*periods* of a RACE_LAPS-lap race moved to the same stage of an *n_laps* one."""
+    scale = n_laps / RACE_LAPS
+    return [(max(1, min(n_laps, round(a * scale))), max(1, min(n_laps, round(b * scale))))
+            for a, b in periods]
+
+
+class StageClock:
+    """Splits a plot call into prep/draw/save by wrapping two visualization hooks."""
+
+    def __init__(self, viz):
+        self.viz = viz
+        self.marks = {}
+
+    def __enter__(self):
+        viz = self.viz
+        self._figure_style, self._save = viz._figure_style, viz._save
+        clock = self
+
+        @contextmanager
+        def figure_style(*styles):
+            clock.marks.setdefault("draw", time.perf_counter())
+            with clock._figure_style(*styles):
+                yield
+
+        def save(*args, **kwargs):
+            clock.marks.setdefault("save", time.perf_counter())
+            return clock._save(*args, **kwargs)
+
+        viz._figure_style, viz._save = figure_style, save
+        return self
+
+    def __exit__(self, *exc):
+        self.viz._figure_style, self.viz._save = self._figure_style, self._save
+
+    def run(self, fn, args):
+        self.marks = {}
+        t0 = time.perf_counter()
+        fn(*args)
+        t1 = time.perf_counter()
+        draw = self.marks.get("draw", t1)
+        save = self.marks.get("save", t1)
+        return {"prep": draw - t0, "draw": save - draw, "save": t1 - save,
+                "total": t1 - t0}
+
+
+def _plot_jobs(rm, tag, sess, folder):
+    """The (fn, args) pairs render_session would run for this session."""
+    from plot_registry import compares_drivers
+
+    d1, d2 = rm.get_top_two_drivers(sess)
+    jobs = []
+    for name in rm.planned_plots(tag):
+        out = os.path.join(folder, f"{name}.png")
+        if compares_drivers(name):
+            jobs.append((rm.plot_function(name), (sess, d1, d2, out)))
+        else:
+            jobs.append((rm.plot_function(name), (sess, out)))
+    return jobs
+
+
+def bench_plots(session_kw, repeat, only=None):
+    import visualization as viz
+    import readme_machine as rm
+    from synthetic_session import make_session
+
+    sessions, plots = {}, {}
+    with StageClock(viz) as clock:
+        for tag, code in SESSIONS:
+            t0 = time.perf_counter()
+            sess = make_session(code, event_name=EVENT_NAME, **session_kw(code))
+            sessions[tag] = time.perf_counter() - t0
+
+            folder = os.path.join("plots", tag)
+            os.makedirs(folder, exist_ok=True)
+            for fn, args in _plot_jobs(rm, tag, sess, folder):
+                if only and fn.__name__ not in only:
+                    continue
+                runs = []
+                for _ in range(repeat):
+                    viz._SESSION_TABLES.pop(sess, None)
+                    runs.append(clock.run(fn, args))
+                best = min(runs, key=lambda r: r["total"])
+                best["bytes"] = os.path.getsize(args[-1])
+                plots[f"{tag}/{fn.__name__}"] = best
+                print(f"  {tag:<11} {fn.__name__:<23}"
+                      + "".join(f" {best[k]:7.3f}" for k in ("prep", "draw", "save", "total")))
+    return sessions, plots
+
+
+def bench_pipeline(session_kw, workers, threads):
+    import pandas as pd
+    import readme_machine as rm
+    from synthetic_session import make_session
+
+    def get_session(year, event_name, code):
+        sess = make_session(code, year=year, event_name=event_name, **session_kw(code))
+        sess.load = lambda **kwargs: None
+        return sess
+
+    ev = pd.Series({"EventName": EVENT_NAME, "EventFormat": "conventional"})
+    rm.get_session = get_session
+    rm.get_latest_event_with_fastf1_data = lambda year: ev
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rm.main(workers=workers, threads=threads, force=True)
+    return {"total": time.perf_counter() - t0, "workers": workers, "threads": threads}
+
+
+def _totals(results):
+    totals = {f"plots/{key}": row["total"] for key, row in results.get("plots", {}).items()}
+    if "pipeline" in results:
+        totals["pipeline"] = results["pipeline"]["total"]
+    return totals
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Print current vs baseline totals; returns the regressed keys."""
+    current, base = _totals(results), _totals(baseline)
+    regressions = []
+    print(f"\n  {'':<36} {'base':>7} {'now':>7} {'ratio':>6}")
+    for key in sorted(current.keys() & base.keys()):
+        now, before = current[key], base[key]
+        ratio = now / before if before else float("inf")
+        slower = now > before * (1 + threshold) and now - before > min_delta
+        if slower:
+            regressions.append(key)
+        print(f"  {key:<36} {before:7.3f} {now:7.3f} {ratio:6.2f}"
+              + ("  REGRESSION" if slower else ""))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline plot and pipeline benchmarks")
+    parser.add_argument("--drivers", type=int, default=20, help="cars per session (default: 20)")
+    parser.add_argument("--laps", type=int, default=None,
+                        help="laps per driver (default: 24 in practice/quali, 55 in the race)")
+    parser.add_argument("--hz", type=float, default=4.0, help="telemetry sample rate (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per plot, fastest is kept (default: 3)")
+    parser.add_argument("--only", nargs="+", default=None, help="only these plot functions")
+    parser.add_argument("--no-pipeline", action="store_true", help="skip the readme_machine run")
+    parser.add_argument("--workers", type=int, default=1, help="pipeline worker processes (default: 1)")
+    parser.add_argument("--threads", type=int, default=1, help="pipeline plot threads (default: 1)")
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.02,
+                        help="ignore slowdowns smaller than this many seconds (default: 0.02)")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    def session_kw(code):
+        kw = {"n_drivers": args.drivers, "telemetry_hz": args.hz}
+        if args.laps is not None:
+            kw["n_laps"] = args.laps
+        if code == "R":
+            n_laps = RACE_LAPS if args.laps is None else args.laps
+            kw["sc_periods"] = race_periods(RACE_SC, n_laps)
+            kw["vsc_periods"] = race_periods(RACE_VSC, n_laps)
+        return kw
+
+    # the pipeline uses ./cache and rewrites README.md, so everything runs
+    # in a scratch folder
+    work = tempfile.mkdtemp(prefix="f1-bench-")
+    os.makedirs(os.path.join(work, "cache"))
+    shutil.copy(os.path.join(ROOT, "README.md"), work)
+    cwd = os.getcwd()
+    os.chdir(work)
+    try:
+        import matplotlib
+        import numpy as np
+        import pandas as pd
+        import fastf1
+        import readme_machine
+
+        readme_machine.configure()
+
+        results = {"meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "versions": {"fastf1": fastf1.__version__, "matplotlib": matplotlib.__version__,
+                         "numpy": np.__version__, "pandas": pd.__version__},
+            "config": {"drivers": args.drivers, "laps": args.laps, "hz": args.hz,
+                       "repeat": args.repeat},
+        }}
+        print(f"  {'session':<11} {'plot':<23} {'prep':>7} {'draw':>7} {'save':>7} {'total':>7}")
+        results["sessions"], results["plots"] = bench_plots(session_kw, args.repeat, args.only)
+        if not args.no_pipeline:
+            results["pipeline"] = bench_pipeline(session_kw, args.workers, args.threads)
+            print(f"\n  pipeline (readme_machine.main): {results['pipeline']['total']:.2f} s")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nResults written to {out}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}")
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# benchmarks/stub_source.py
+"""
+Offline stand-in for FastF1 in ``readme_machine.watch``.
+
+    python benchmarks/stub_source.py             # watch a synthetic weekend land
+    python benchmarks/stub_source.py --sprint
+
+``StubSource`` has the methods of ``readme_machine.FastF1Source`` and
+serves one synthetic weekend (see synthetic_session.py) on a fake clock:
+session ``i`` of the weekend is published ``start + i * gap`` seconds after
+the clock starts, and ``sleep`` only moves the clock forward, so a whole
+weekend of polling runs in the time it takes to render it.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from synthetic_session import make_session  # noqa: E402
+
+EPOCH = pd.Timestamp("2025-07-04 11:30", tz="UTC")
+
+
+class StubSource:
+    def __init__(self, event_name="Synthetic Grand Prix", sprint=False,
+                 start=3600.0, gap=6 * 3600.0, **session_kw):
+        from readme_machine import weekend_sessions
+
+        self.event = pd.Series({
+            "EventName": event_name,
+            "EventFormat": "sprint_qualifying" if sprint else "conventional",
+        })
+        self.sprint = sprint
+        self.session_kw = session_kw
+        self.lands = {code: start + i * gap
+                      for i, (_, code) in enumerate(weekend_sessions(sprint))}
+        self.clock = 0.0
+        self.probes = []
+
+    def now(self):
+        return EPOCH + pd.Timedelta(seconds=self.clock)
+
+    def sleep(self, seconds):
+        self.clock += seconds
+
+    def current_event(self, year):
+        return self.event
+
+    def probe(self, year, event_name, code):
+        self.probes.append((self.clock, code))
+        return self.clock >= self.lands[code]
+
+    def get_session(self, year, event_name, code):
+        sess = make_session(code, year=year, event_name=event_name,
+                            sprint=self.sprint, **self.session_kw)
+        sess.load = lambda **kwargs: None
+        return sess
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run readme_machine.watch on a synthetic weekend")
+    parser.add_argument("--sprint", action="store_true", help="sprint weekend format")
+    parser.add_argument("--interval", type=float, default=600, help="seconds between polls")
+    parser.add_argument("--max-interval", type=float, default=3 * 3600)
+    parser.add_argument("--backoff", type=float, default=2.0)
+    parser.add_argument("--polls", type=int, default=40)
+    parser.add_argument("--laps", type=int, default=8, help="laps per driver (default: 8)")
+    args = parser.parse_args(argv)
+
+    # watch writes visualization/, cache/ and README.md, so it runs in a
+    # scratch folder
+    work = tempfile.mkdtemp(prefix="f1-watch-")
+    shutil.copy(os.path.join(ROOT, "README.md"), work)
+    cwd = os.getcwd()
+    os.chdir(work)
+    try:
+        import readme_machine as rm
+
+        source = StubSource(sprint=args.sprint, n_laps=args.laps)
+        rm.watch(args.interval, args.max_interval, args.backoff,
+                 source=source, sleep=source.sleep, polls=args.polls)
+
+        print("\nsession  published   rendered")
+        for tag, code in rm.weekend_sessions(args.sprint):
+            hits = [t for t, c in source.probes if c == code and t >= source.lands[code]]
+            seen = f"{hits[0] / 3600:8.1f} h" if hits else f"{'never':>10}"
+            print(f"{tag:<18} {source.lands[code] / 3600:5.1f} h {seen}")
+        print(f"{len(source.probes)} probes in {args.polls} polls, "
+              f"{source.clock / 3600:.1f} h of fake time")
+        with open("README.md", "r", encoding="utf-8") as f:
+            linked = sum(line.startswith("![") for line in f)
+        print(f"README.md links {linked} images")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# benchmarks/synthetic_session.py
+"""
+Build realistic fake FastF1 sessions that work fully offline.
+
+The sessions are real ``fastf1.core.Session`` objects with laps, results,
+car/pos telemetry, track status and a circuit info stub filled in, so every
+plot in ``visualization.py`` can run on them without network access.
+
+    from synthetic_session import make_session
+    sess = make_session("R", n_drivers=20, n_laps=55, sc_periods=[(12, 15)])
+"""
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import fastf1
+import fastf1._api
+from fastf1.core import Laps, Session, SessionResults, Telemetry
+from fastf1.events import Event
+from fastf1.mvapi import CircuitInfo
+from fastf1.plotting._interface import _get_driver_team_mapping
+
+
+# (number, abbreviation, first name, last name, team, team colour)
+GRID = [
+    ("4",  "NOR", "Lando",     "Norris",     "McLaren",         "FF8000"),
+    ("81", "PIA", "Oscar",     "Piastri",    "McLaren",         "FF8000"),
+    ("16", "LEC", "Charles",   "Leclerc",    "Ferrari",         "E8002D"),
+    ("44", "HAM", "Lewis",     "Hamilton",   "Ferrari",         "E8002D"),
+    ("1",  "VER", "Max",       "Verstappen", "Red Bull Racing", "3671C6"),
+    ("22", "TSU", "Yuki",      "Tsunoda",    "Red Bull Racing", "3671C6"),
+    ("63", "RUS", "George",    "Russell",    "Mercedes",        "27F4D2"),
+    ("12", "ANT", "Andrea",    "Antonelli",  "Mercedes",        "27F4D2"),
+    ("14", "ALO", "Fernando",  "Alonso",     "Aston Martin",    "229971"),
+    ("18", "STR", "Lance",     "Stroll",     "Aston Martin",    "229971"),
+    ("10", "GAS", "Pierre",    "Gasly",      "Alpine",          "0093CC"),
+    ("43", "COL", "Franco",    "Colapinto",  "Alpine",          "0093CC"),
+    ("31", "OCO", "Esteban",   "Ocon",       "Haas F1 Team",    "B6BABD"),
+    ("87", "BEA", "Oliver",    "Bearman",    "Haas F1 Team",    "B6BABD"),
+    ("30", "LAW", "Liam",      "Lawson",     "Racing Bulls",    "6692FF"),
+    ("6",  "HAD", "Isack",     "Hadjar",     "Racing Bulls",    "6692FF"),
+    ("23", "ALB", "Alexander", "Albon",      "Williams",        "64C4FF"),
+    ("55", "SAI", "Carlos",    "Sainz",      "Williams",        "64C4FF"),
+    ("27", "HUL", "Nico",      "Hulkenberg", "Kick Sauber",     "52E252"),
+    ("5",  "BOR", "Gabriel",   "Bortoleto",  "Kick Sauber",     "52E252"),
+]
+
+SESSION_NAMES = {
+    "FP1": "Practice 1", "FP2": "Practice 2", "FP3": "Practice 3",
+    "SQ": "Sprint Qualifying", "S": "Sprint",
+    "Q": "Qualifying", "R": "Race",
+}
+
+TRACK_LENGTH = 4300.0      # metres
+# (distance [m], apex speed [km/h], half-width [m])
+CORNERS = [(350, 95, 110), (950, 210, 90), (1500, 120, 100),
+           (2100, 250, 80), (2600, 85, 120), (3150, 175, 90),
+           (3700, 140, 100), (4050, 230, 70)]
+V_MAX = 335.0
+
+
+def _speed_profile(dist, pace=1.0):
+    """Speed [km/h] along the lap for a car running at *pace* (1 = pole)."""
+    v = np.full_like(dist, V_MAX * pace, dtype=float)
+    for d0, apex, width in CORNERS:
+        dip = (V_MAX - apex) * np.exp(-((dist - d0) / width) ** 2)
+        v = np.minimum(v, V_MAX * pace - dip * pace)
+    return np.clip(v, 60.0, None)
+
+
+def _track_xy(dist):
+    """Closed wobbly loop so the track map has some character."""
+    a = 2 * np.pi * dist / TRACK_LENGTH
+    r = 1.0 + 0.18 * np.sin(3 * a) + 0.07 * np.cos(5 * a)
+    return 6000 * r * np.cos(a), 3500 * r * np.sin(a)
+
+
+def _event(year, event_name, sprint):
+    names = (["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying",
+              "Race"] if sprint else
+             ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"])
+    base = pd.Timestamp(f"{year}-06-27 11:30")
+    data = {
+        "RoundNumber": 11, "Country": "Synthland", "Location": "Synthville",
+        "OfficialEventName": f"FORMULA 1 {event_name.upper()} {year}",
+        "EventDate": base + pd.Timedelta(days=2),
+        "EventName": event_name,
+        "EventFormat": "sprint_qualifying" if sprint else "conventional",
+        "F1ApiSupport": True,
+    }
+    for i, name in enumerate(names, start=1):
+        date = base + pd.Timedelta(hours=26 * (i - 1))
+        data[f"Session{i}"] = name
+        data[f"Session{i}Date"] = date.tz_localize("UTC")
+        data[f"Session{i}DateUtc"] = date
+    return Event(pd.Series(data), year=year)
+
+
+def make_session(code="Q", *, year=2025, event_name="Synthetic Grand Prix",
+                 n_drivers=20, n_laps=None, telemetry_hz=4.0,
+                 sc_periods=(), vsc_periods=(), sprint=False, seed=0):
+    """Return a loaded, offline ``fastf1.core.Session``.
+
+    Args:
+        code: session identifier (FP1, FP2, FP3, SQ, S, Q, R)
+        n_drivers: number of cars (max 20)
+        n_laps: laps per driver; defaults to a realistic value per session
+        telemetry_hz: car/pos data sample rate
+        sc_periods / vsc_periods: iterables of (first_lap, last_lap) tuples
+        sprint: build a sprint-format weekend
+        seed: RNG seed, equal seeds give identical sessions
+    """
+    rng = np.random.default_rng(seed)
+    race_like = code in ("R", "S")
+    if n_laps is None:
+        n_laps = {"R": 55, "S": 20}.get(code, 24)
+
+    event = _event(year, event_name, sprint or code in ("SQ", "S"))
+    session = Session(event, SESSION_NAMES[code], f1_api_support=True)
+    grid = GRID[:n_drivers]
+
+    sc_laps = {lap for a, b in sc_periods for lap in range(a, b + 1)}
+    vsc_laps = {lap for a, b in vsc_periods for lap in range(a, b + 1)}
+
+    t0 = pd.Timestamp(session.date)
+    start = pd.Timedelta(minutes=5)
+    fine = np.linspace(0, TRACK_LENGTH, 2000)
+    dt_step = 1.0 / telemetry_hz
+
+    lap_rows, car_data, pos_data = [], {}, {}
+    for slot, (num, abb, first, last, team, colour) in enumerate(grid):
+        pace = 1.0 - 0.0025 * slot - rng.uniform(0, 0.002)
+        stint_len = max(1, n_laps // 3)
+        compounds = ["SOFT", "MEDIUM", "HARD"]
+        t = start + pd.Timedelta(seconds=float(rng.uniform(0, 30))) \
+            if not race_like else start
+        samples_t, samples_d, samples_v = [], [], []
+        for lap_no in range(1, n_laps + 1):
+            stint = (lap_no - 1) // stint_len + 1
+            tyre_life = (lap_no - 1) % stint_len + 1
+            lap_pace = pace * (1 - 0.0009 * tyre_life) \
+                * rng.normal(1.0, 0.003)
+            if lap_no in sc_laps:
+                lap_pace *= 0.62
+            elif lap_no in vsc_laps:
+                lap_pace *= 0.7
+            elif not race_like and lap_no % 3 == 1:
+                lap_pace *= 0.8       # out/cool-down lap
+            v = _speed_profile(fine, lap_pace)
+            seg = np.diff(fine) / (v[1:] / 3.6)
+            cum = np.concatenate([[0.0], np.cumsum(seg)])
+            lap_s = float(cum[-1])
+            sector_s = np.interp([TRACK_LENGTH / 3, 2 * TRACK_LENGTH / 3],
+                                 fine, cum)
+            # all cars share one broadcast clock, like the live timing feed
+            k0 = np.ceil(t.total_seconds() / dt_step)
+            k1 = np.ceil((t.total_seconds() + lap_s) / dt_step)
+            ts = np.arange(k0, k1) * dt_step - t.total_seconds()
+            samples_t.append(t.total_seconds() + ts)
+            samples_d.append(np.interp(ts, cum, fine))
+            samples_v.append(np.interp(ts, cum, v))
+
+            status = "1"
+            if lap_no in sc_laps:
+                status = "14"
+            elif lap_no in vsc_laps:
+                status = "16"
+            lap_time = pd.Timedelta(seconds=lap_s)
+            lap_rows.append({
+                "Time": t + lap_time, "Driver": abb, "DriverNumber": num,
+                "LapTime": lap_time, "LapNumber": float(lap_no),
+                "Stint": float(stint),
+                "PitOutTime": t if tyre_life == 1 and lap_no > 1 else pd.NaT,
+                "PitInTime": pd.NaT,
+                "Sector1Time": pd.Timedelta(seconds=sector_s[0]),
+                "Sector2Time": pd.Timedelta(seconds=sector_s[1] - sector_s[0]),
+                "Sector3Time": pd.Timedelta(seconds=lap_s - sector_s[1]),
+                "Sector1SessionTime": t + pd.Timedelta(seconds=sector_s[0]),
+                "Sector2SessionTime": t + pd.Timedelta(seconds=sector_s[1]),
+                "Sector3SessionTime": t + lap_time,
+                "SpeedI1": float(v[400]), "SpeedI2": float(v[1300]),
+                "SpeedFL": float(v[-1]), "SpeedST": float(v.max()),
+                "IsPersonalBest": False,
+                "Compound": compounds[(stint - 1) % 3],
+                "TyreLife": float(tyre_life),
+                "FreshTyre": bool(stint != 2),
+                "Team": team, "LapStartTime": t,
+                "LapStartDate": t0 + t, "TrackStatus": status,
+                "Position": np.nan, "Deleted": False, "DeletedReason": "",
+                "FastF1Generated": False, "IsAccurate": True,
+            })
+            t = t + lap_time
+
+        st = np.concatenate(samples_t)
+        dist = np.concatenate(samples_d)
+        speed = np.concatenate(samples_v)
+        session_time = pd.to_timedelta(st, unit="s")
+        n = len(st)
+        drs = np.where(speed > V_MAX * 0.93, 12, 1)
+        throttle = np.clip((speed - 80) / 2.2 + rng.normal(0, 2, n), 0, 100)
+        brake = np.r_[np.diff(speed) < -2.0, False]
+        car_data[num] = Telemetry({
+            "Date": t0 + session_time,
+            "SessionTime": session_time,
+            "Time": session_time - session_time[0],
+            "RPM": (speed * 36 + rng.normal(0, 80, n)).clip(4000, 12500),
+            "Speed": speed,
+            "nGear": np.clip((speed // 45).astype(int) + 1, 1, 8),
+            "Throttle": throttle,
+            "Brake": brake,
+            "DRS": drs,
+            "Source": "car",
+        }, session=session, driver=num)
+        x, y = _track_xy(dist)
+        pos_data[num] = Telemetry({
+            "Date": t0 + session_time + pd.Timedelta(milliseconds=110),
+            "SessionTime": session_time + pd.Timedelta(milliseconds=110),
+            "Time": session_time - session_time[0],
+            "X": x, "Y": y, "Z": np.zeros(n),
+            "Status": "OnTrack",
+            "Source": "pos",
+        }, session=session, driver=num)
+
+    laps = pd.DataFrame(lap_rows)
+    best = laps.groupby("Driver")["LapTime"].idxmin()
+    laps.loc[best, "IsPersonalBest"] = True
+    if race_like:
+        laps["Position"] = (laps.groupby("LapNumber")["Time"]
+                            .rank(method="first"))
+    session._laps = Laps(laps, session=session)
+
+    order = laps.loc[best].sort_values("LapTime")
+    res = pd.DataFrame({
+        "DriverNumber": order["DriverNumber"].values,
+        "Abbreviation": order["Driver"].values,
+        "TeamName": order["Team"].values,
+    })
+    info = {d[0]: d for d in grid}
+    res["BroadcastName"] = [f"{info[n][2][0]} {info[n][3].upper()}"
+                            for n in res["DriverNumber"]]
+    res["FirstName"] = [info[n][2] for n in res["DriverNumber"]]
+    res["LastName"] = [info[n][3] for n in res["DriverNumber"]]
+    res["FullName"] = res["FirstName"] + " " + res["LastName"]
+    res["TeamColor"] = [info[n][5] for n in res["DriverNumber"]]
+    res["Position"] = np.arange(1, len(res) + 1, dtype=float)
+    if code in ("Q", "SQ"):
+        best_t = order["LapTime"].values
+        res["Q1"] = best_t + pd.Timedelta(seconds=0.6)
+        res["Q2"] = best_t + pd.Timedelta(seconds=0.3)
+        res["Q3"] = best_t
+    res.index = res["DriverNumber"].values
+    session._results = SessionResults(res, _force_default_cols=True)
+
+    session._t0_date = t0
+    session._session_start_time = start
+    session._total_laps = n_laps if race_like else None
+    session._car_data = car_data
+    session._pos_data = pos_data
+    session._session_info = {"Meeting": {"Circuit": {"Key": 0,
+                                                     "ShortName": "Synth"}}}
+    status_rows = [{"Time": start, "Status": "1", "Message": "AllClear"}]
+    lap_start = laps[laps["DriverNumber"] == grid[0][0]]
+    for (a, b), code_, msg in ([(p, "4", "SCDeployed") for p in sc_periods]
+                               + [(p, "6", "VSCDeployed")
+                                  for p in vsc_periods]):
+        status_rows.append({"Time": lap_start["LapStartTime"].iloc[a - 1],
+                            "Status": code_, "Message": msg})
+        status_rows.append({"Time": lap_start["Time"].iloc[b - 1],
+                            "Status": "1", "Message": "AllClear"})
+    session._track_status = (pd.DataFrame(status_rows)
+                             .sort_values("Time").reset_index(drop=True))
+    session._session_status = pd.DataFrame(
+        {"Time": [start, laps["Time"].max()],
+         "Status": ["Started", "Finished"]})
+    session._race_control_messages = pd.DataFrame()
+    session._weather_data = pd.DataFrame()
+
+    corners = pd.DataFrame({
+        "X": _track_xy(np.array([c[0] for c in CORNERS], float))[0],
+        "Y": _track_xy(np.array([c[0] for c in CORNERS], float))[1],
+        "Number": np.arange(1, len(CORNERS) + 1),
+        "Letter": "", "Angle": 0.0,
+        "Distance": [float(c[0]) for c in CORNERS],
+    })
+    circuit = CircuitInfo(corners=corners,
+                          marshal_lights=corners.iloc[:0].copy(),
+                          marshal_sectors=corners.iloc[:0].copy(),
+                          rotation=0.0)
+    session.get_circuit_info = lambda: circuit
+
+    # teach fastf1.plotting about our drivers without hitting livetiming
+    driver_info = {num: {"RacingNumber": num, "Tla": abb, "FirstName": fn,
+                         "LastName": ln, "TeamName": team,
+                         "TeamColour": colour}
+                   for num, abb, fn, ln, team, colour in grid}
+    with mock.patch.object(fastf1._api, "driver_info",
+                           return_value=driver_info):
+        _get_driver_team_mapping(session)
+    return session
@@ -0,0 +1,114 @@
+# image_output.py
+"""
+How plot images are encoded and written.
+
+Every plot saves through ``visualization._save``, which hands the figure to
+``write_figure``. The process-wide ``ImageOptions`` (set with ``configure``)
+choose:
+
+- format: ``png`` (matplotlib's own PNG, the default), ``png8`` (PNG with a
+  256-colour palette, about a quarter of the size) or ``webp`` (lossless
+  WebP); the README links use the matching file extension;
+- dpi: rendering resolution, ``None`` keeps the figure's own;
+- max_bytes: size budget per image. An image over budget is rendered again
+  at a lower DPI until it fits, but never below ``MIN_DPI``.
+
+An encoded image that is byte-identical to the file already on disk is not
+written again, so unchanged plots keep their timestamps.
+"""
+import io
+import os
+from typing import NamedTuple, Optional
+
+FORMATS = {"png": ".png", "png8": ".png", "webp": ".webp"}
+MIN_DPI = 50
+
+
+class ImageOptions(NamedTuple):
+    format: str = "png"
+    dpi: Optional[float] = None
+    max_bytes: Optional[int] = None
+
+    @property
+    def extension(self):
+        return FORMATS[self.format]
+
+    def fingerprint_params(self):
+        """Extra plot fingerprint parameters; none for the defaults, so
+        manifests written before these options existed stay valid."""
+        if self == ImageOptions():
+            return ()
+        return (f"image:{self.format}:{self.dpi}:{self.max_bytes}",)
+
+
+_options = ImageOptions()
+
+
+def configure(options=None):
+    """Use *options* for every image this process writes from now on."""
+    global _options
+    _options = options or ImageOptions()
+
+
+def output_dpi(fig, options=None):
+    """The DPI *fig* will be written at (before any size-budget shrinking)."""
+    return (options or _options).dpi or fig.dpi
+
+
+def _encode(fig, fmt, dpi):
+    buf = io.BytesIO()
+    dpi = dpi or fig.dpi
+    if fmt == "png":
+        # no "Software: matplotlib x.y" tag, so re-rendering the same image
+        # gives the same bytes and leaves no git diff
+        fig.savefig(buf, format="png", dpi=dpi, metadata={"Software": None})
+        return buf.getvalue()
+
+    from PIL import Image        # a matplotlib dependency, only needed here
+
+    # raw RGBA skips matplotlib's own PNG encode; Agg sizes its canvas as
+    # int(inches * dpi)
+    fig.savefig(buf, format="rgba", dpi=dpi)
+    size = (int(fig.get_figwidth() * dpi), int(fig.get_figheight() * dpi))
+    img = Image.frombuffer("RGBA", size, buf.getbuffer(), "raw", "RGBA", 0, 1)
+    out = io.BytesIO()
+    if fmt == "png8":
+        img.quantize(256, method=Image.Quantize.FASTOCTREE).save(out, "PNG", optimize=True)
+    else:
+        img.save(out, "WEBP", lossless=True, method=4)
+    return out.getvalue()
+
+
+def _same_bytes(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def write_figure(fig, path, options=None):
+    """
+    Encode *fig* with *options* (default: the configured ones) and write it
+    to *path*. Returns False if the file already held exactly these bytes.
+    """
+    options = options or _options
+    if options.format not in FORMATS:
+        raise ValueError(f"unknown image format {options.format!r}, "
+                         f"expected one of {', '.join(FORMATS)}")
+    dpi = output_dpi(fig, options)
+    data = _encode(fig, options.format, dpi)
+    while options.max_bytes and len(data) > options.max_bytes and dpi > MIN_DPI:
+        # the encoded size grows roughly with the pixel count, i.e. dpi²
+        dpi = max(MIN_DPI, dpi * 0.95 * (options.max_bytes / len(data)) ** 0.5)
+        data = _encode(fig, options.format, dpi)
+
+    if _same_bytes(path, data):
+        return False
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,150 @@
+# instrumentation.py
+"""
+Stage timings for readme_machine runs.
+
+Every stage records wall time, CPU time of the running thread and the
+process's peak RSS (high-water mark) at the end of the stage; in
+``--low-memory`` runs the high-water mark restarts with every session
+(unless sessions overlap, as with ``--prefetch``). A
+plot call is split into three stages without the plot functions knowing
+about it:
+
+- prep:   from the call until the plot enters its figure style
+- render: building the figure (``visualization._figure_style`` calls ``mark``)
+- save:   encoding and writing the image (``visualization._save`` calls ``mark``)
+
+Records are plain dicts so they can travel back from worker processes; a
+run's records are written as one JSON report and summarised as a table.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:       # Windows
+    resource = None
+
+_current = threading.local()
+
+
+def _vm_hwm_kb():
+    """Linux's peak RSS of this process in KiB (None elsewhere)."""
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """
+    Restart the peak RSS from the current RSS, so the next stages report the
+    peak of what runs after this call. Linux only; returns False elsewhere.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    # VmHWM follows reset_peak_rss, ru_maxrss always holds the lifetime peak
+    hwm = _vm_hwm_kb()
+    if hwm is not None:
+        return round(hwm / 1024, 1)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux but in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _sample():
+    return time.perf_counter(), time.thread_time(), peak_rss_mb()
+
+
+def _span(start, end):
+    return {"wall": round(end[0] - start[0], 4),
+            "cpu": round(end[1] - start[1], 4),
+            "peak_rss_mb": end[2]}
+
+
+@contextmanager
+def stage(record, name):
+    """Time the block as stage ``name`` of ``record``."""
+    start = _sample()
+    try:
+        yield
+    finally:
+        record[name] = _span(start, _sample())
+
+
+@contextmanager
+def plot_clock(record):
+    """Time a plot call, split into prep / render / save stages of ``record``."""
+    marks = [("prep", _sample())]
+    _current.marks = marks
+    try:
+        yield
+    finally:
+        _current.marks = None
+        marks.append((None, _sample()))
+        for (name, start), (_, end) in zip(marks, marks[1:]):
+            record[name] = _span(start, end)
+
+
+def mark(name):
+    """Start stage ``name`` of the plot being timed on this thread, if any."""
+    marks = getattr(_current, "marks", None)
+    if marks is not None and all(seen != name for seen, _ in marks):
+        marks.append((name, _sample()))
+
+
+def write_report(path, sessions, wall):
+    """Write a run's session records as JSON."""
+    report = {
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "wall": round(wall, 3),
+        # sessions may have restarted the high-water mark (reset_peak_rss)
+        "peak_rss_mb": max([peak_rss_mb() or 0]
+                           + [sess.get("peak_rss_mb") or 0 for sess in sessions]) or None,
+        "sessions": sessions,
+    }
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def _wall(rec, name):
+    span = rec.get(name)
+    return f"{span['wall']:7.2f}" if span else f"{'-':>7}"
+
+
+def print_summary(sessions, wall):
+    """Short table of a run's session records: seconds per stage, image size."""
+    print(f"\n{'session':<18} {'plot':<23} {'load':>7} {'prep':>7} {'render':>7} "
+          f"{'save':>7} {'size':>7}  status")
+    for sess in sessions:
+        rss = sess.get("peak_rss_mb")
+        memo = sess.get("lap_memo")
+        print(f"{sess['session']:<18} {'':<23} {_wall(sess, 'load')} {'':>31}  "
+              f"{sess.get('status', '')}" + (f", peak RSS {rss} MB" if rss else "")
+              + (f", lap memo {memo['hits']} hits / {memo['misses']} misses"
+                 if memo and memo["hits"] + memo["misses"] else ""))
+        for plot in sess.get("plots", []):
+            size = f"{plot['bytes'] / 1024:5.0f}KB" if plot.get("bytes") else f"{'-':>7}"
+            print(f"{'':<18} {plot['plot']:<23} {'':>7} {_wall(plot, 'prep')} "
+                  f"{_wall(plot, 'render')} {_wall(plot, 'save')} {size}  {plot['status']}")
+    print(f"total {wall:.1f} s")
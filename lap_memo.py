@@ -0,0 +1,89 @@
+# lap_memo.py
+"""
+Byte-bounded memo of fastest-lap lookups and lap telemetry.
+
+Several plots of a session look up the same drivers' fastest laps and pull
+the same laps' telemetry: ``telemetry_comparison`` and ``track_domination``
+both compare the top two on their fastest laps, and ``top_speed_comparison``
+picks every driver's fastest lap. ``visualization`` keeps one ``LapMemo``
+per session (``visualization.lap_memo``) so each of those is computed once.
+
+Entries are keyed by what they hold, e.g. ``("fastest", driver)`` or
+``("telemetry", driver, lap number)``, and the least recently used
+ones are evicted once the memo holds more than ``max_bytes``. Cached values
+are shared between plots and must be treated as read-only. They must not
+refer to the session either (``Laps``, ``Lap`` and ``Telemetry`` do): the
+memo lives exactly as long as its session, and such a value would keep the
+session alive for good. Fastest laps are therefore kept as index labels and
+telemetry as plain DataFrames.
+
+The default limit is process-wide; ``readme_machine --memo-mb`` sets it
+through ``configure``.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_max_bytes = DEFAULT_MAX_BYTES
+
+
+def configure(max_bytes=None):
+    """Bound every memo created from now on to *max_bytes* (None: the default)."""
+    global _max_bytes
+    _max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+
+
+def nbytes(value):
+    """Approximate memory held by a cached value."""
+    if hasattr(value, "memory_usage"):     # DataFrame (per column) or Series
+        total = value.memory_usage(index=True, deep=True)
+        return int(total.sum()) if hasattr(total, "sum") else int(total)
+    return sys.getsizeof(value)
+
+
+class LapMemo:
+    """Least-recently-used memo bounded by the bytes of what it holds."""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = _max_bytes if max_bytes is None else max_bytes
+        self._entries = OrderedDict()      # key -> (value, bytes), oldest first
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, build):
+        """The value cached under *key*, or ``build()``'s, cached if it fits."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # built outside the lock so plots on other threads are not held up;
+        # two threads missing on the same key both build it, the first stays
+        value = build()
+        size = nbytes(value)
+        with self._lock:
+            if key in self._entries or size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, old) = self._entries.popitem(last=False)
+                self.bytes -= old
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.bytes}
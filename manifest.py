@@ -0,0 +1,118 @@
+# manifest.py
+"""
+Render manifest for incremental rebuilds.
+
+Each ``visualization/<year_gp>/<session>/`` folder gets a ``manifest.json``
+that maps every image file to the fingerprint it was rendered from: a hash
+of the session's input data, the plot's version and its extra parameters.
+A plot whose fingerprint is unchanged and whose image still exists does not
+need to be rendered again.
+
+``readme_machine --watch`` also keeps, under ``FAILURE_KEY``, how often a
+session's plots have failed to render and when they last did, so it backs
+off from a broken session and eventually gives up on it.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = "manifest.json"
+FAILURE_KEY = "_failure"
+
+
+def _frame_digest(h, name, frame):
+    h.update(name.encode())
+    if frame is None or len(frame) == 0:
+        return
+    import pandas as pd        # only needed once a session is loaded
+
+    h.update(",".join(map(str, frame.columns)).encode())
+    h.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+
+
+def session_fingerprint(sess):
+    """Hash of the loaded laps, results and telemetry of a session."""
+    h = hashlib.sha256()
+    h.update(str(sess).encode())
+    for attr in ("laps", "results"):
+        try:
+            frame = getattr(sess, attr)
+        except Exception:
+            frame = None
+        _frame_digest(h, attr, frame)
+    for attr in ("car_data", "pos_data"):
+        try:
+            channels = getattr(sess, attr)
+        except Exception:
+            continue
+        for drv in sorted(channels):
+            _frame_digest(h, f"{attr}:{drv}", channels[drv])
+    return h.hexdigest()
+
+
+def plot_fingerprint(session_fp, name, version, params=()):
+    """Fingerprint of one plot: session inputs + plot version + parameters."""
+    payload = json.dumps([session_fp, name, version, [str(p) for p in params]])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_manifest(folder):
+    path = os.path.join(folder, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(folder, manifest):
+    path = os.path.join(folder, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def is_up_to_date(manifest, out, fingerprint):
+    """True if *out* exists and was rendered from *fingerprint*."""
+    entry = manifest.get(os.path.basename(out))
+    return (entry is not None
+            and entry.get("fingerprint") == fingerprint
+            and os.path.exists(out))
+
+
+def record(manifest, out, name, version, fingerprint):
+    """
+    Enter *out* as the image of plot *name*. Returns the file names of the
+    plot's older images it replaces (e.g. after a change of image format).
+    """
+    stale = [key for key, entry in images(manifest).items()
+             if entry.get("plot") == name and key != os.path.basename(out)]
+    for key in stale:
+        del manifest[key]
+    manifest[os.path.basename(out)] = {
+        "plot": name,
+        "version": version,
+        "fingerprint": fingerprint,
+    }
+    return stale
+
+
+def images(manifest):
+    """The image entries of *manifest*, without the failure record."""
+    return {name: entry for name, entry in manifest.items() if name != FAILURE_KEY}
+
+
+def failure(manifest):
+    """``{"attempts": n, "at": epoch seconds}`` of the failed renders, or None."""
+    return manifest.get(FAILURE_KEY)
+
+
+def record_failure(manifest, at):
+    """Count one more failed render of the session, at *at* (epoch seconds)."""
+    attempts = (failure(manifest) or {}).get("attempts", 0) + 1
+    manifest[FAILURE_KEY] = {"attempts": attempts, "at": at}
+    return manifest[FAILURE_KEY]
+
+
+def clear_failure(manifest):
+    manifest.pop(FAILURE_KEY, None)
@@ -0,0 +1,70 @@
+# memory_budget.py
+"""
+Low-memory handling of loaded sessions (``readme_machine --low-memory``).
+
+A weekend with telemetry keeps every driver's car and position data in
+float64 frames for as long as the session object lives. In low-memory mode
+``readme_machine``:
+
+- compacts each session once it is loaded and stored, before it is added
+  to the season database, so the tables derived from it are compact too:
+  ``Driver``, ``Team`` and ``Compound`` of the laps become categoricals,
+  and the ``Speed``, ``RPM`` and ``Distance`` channels float32 (telemetry
+  read lazily from the session store is compacted as each driver is
+  opened);
+- renders the plots that need telemetry first and drops the session's
+  telemetry as soon as the last of them has finished
+  (``release_telemetry``);
+- reports each session's own peak RSS (see ``instrumentation.reset_peak_rss``),
+  except with ``--prefetch``, where sessions overlap and only the run's
+  peak is reported.
+
+F1 timing sends speed and RPM as whole numbers, which float32 holds
+exactly: lap-based images come out the same, and telemetry traces, whose
+interpolated samples and distances lose the last bits, differ by a few
+anti-aliased pixels. Fingerprints hash the compacted data, so switching the
+mode on or off re-renders a weekend once.
+"""
+LAP_CATEGORIES = ("Driver", "Team", "Compound")
+TELEMETRY_FLOAT32 = ("Speed", "RPM", "Distance")
+
+_CHANNELS = ("_car_data", "_pos_data")
+
+
+def compact_laps(laps):
+    """*laps* with the repeated string columns as categoricals."""
+    return laps.astype({col: "category" for col in LAP_CATEGORIES if col in laps.columns})
+
+
+def compact_telemetry(frame):
+    """*frame* with its float channels in float32."""
+    return frame.astype({col: "float32" for col in TELEMETRY_FLOAT32 if col in frame.columns})
+
+
+def compact_session(sess):
+    """Downcast the loaded laps and telemetry of *sess* in place."""
+    laps = getattr(sess, "_laps", None)
+    if laps is not None:
+        sess._laps = compact_laps(laps)
+    for attr in _CHANNELS:
+        channels = getattr(sess, attr, None)
+        if channels is None:
+            continue
+        if hasattr(channels, "transform"):
+            # session_store's lazy mapping: compact each driver when opened
+            channels.transform = compact_telemetry
+        else:
+            setattr(sess, attr, {drv: compact_telemetry(tel) for drv, tel in channels.items()})
+
+
+def release_telemetry(sess):
+    """Forget the car and position data of *sess*, and everything the plots
+    derived from it: the lap memo and the per-lap telemetry summary. Laps,
+    results and the lap-based tables stay."""
+    from visualization import drop_session_tables, lap_memo
+
+    for attr in _CHANNELS:
+        if hasattr(sess, attr):
+            delattr(sess, attr)
+    lap_memo(sess).clear()
+    drop_session_tables(sess, "lap_telemetry")
@@ -0,0 +1,71 @@
+# plot_registry.py
+"""
+What readme_machine needs to know about each plot in visualization.py,
+kept free of heavy imports so it can be read without loading matplotlib.
+
+``version`` is part of every plot's render fingerprint: bump it whenever a
+plot's image changes for the same input data, so the next run re-renders it
+instead of trusting the manifest.
+
+``needs`` lists the parts of a session the plot reads, named after the
+``Session.load`` flags (results are always loaded by FastF1). A session is
+loaded with the union of the needs of the plots that will be drawn from it,
+so a race that only gets lap-based plots never downloads telemetry.
+``messages`` is needed wherever deleted laps matter: race control messages
+are what mark them, and ``pick_fastest`` and the quali results fallback
+skip them.
+
+``image`` is the plot's file name without extension (default: the plot's
+name), and plots with ``drivers`` set compare the session's top two and
+are called as ``fn(session, d1, d2, save_path)``.
+"""
+from typing import NamedTuple
+
+LOAD_FLAGS = ("laps", "telemetry", "weather", "messages")
+
+
+class PlotSpec(NamedTuple):
+    version: int = 1
+    needs: tuple = LOAD_FLAGS
+    image: str = ""
+    drivers: bool = False
+
+
+PLOTS = {
+    "tyre_strategy":          PlotSpec(version=2, needs=("laps",)),
+    "sector_gap":             PlotSpec(version=2, needs=("laps",)),
+    "top_speed_comparison":   PlotSpec(version=3, needs=("laps", "telemetry", "messages")),
+    "telemetry_comparison":   PlotSpec(version=4, needs=("laps", "telemetry", "messages"),
+                                       image="telemetry", drivers=True),
+    "track_domination":       PlotSpec(version=3, needs=("laps", "telemetry", "messages"),
+                                       drivers=True),
+    "aero_performance":       PlotSpec(version=3, needs=("laps", "telemetry")),
+    "quali_result":           PlotSpec(version=1, needs=("laps", "messages")),
+    "pos_change":             PlotSpec(version=2, needs=("laps",)),
+    "team_pace":              PlotSpec(version=1, needs=("laps",)),
+    "tyre_deg":               PlotSpec(version=2, needs=("laps",)),
+    "plot_top_speed_heatmap": PlotSpec(version=2, needs=("laps", "telemetry")),
+}
+
+
+def plot_version(name):
+    return PLOTS.get(name, PlotSpec()).version
+
+
+def image_stem(name):
+    return PLOTS.get(name, PlotSpec()).image or name
+
+
+def compares_drivers(name):
+    return PLOTS.get(name, PlotSpec()).drivers
+
+
+def load_flags(names):
+    """``Session.load`` keyword arguments covering every plot in ``names``.
+
+    Unknown plots are assumed to need everything.
+    """
+    needed = set()
+    for name in names:
+        needed.update(PLOTS.get(name, PlotSpec()).needs)
+    return {flag: flag in needed for flag in LOAD_FLAGS}
@@ -1,18 +1,114 @@
 # readme_machine.py
+"""
+Render the plots of the latest weekend and update README.md.
+
+    python readme_machine.py --workers 5      # what the weekly workflow runs
+    python readme_machine.py --plan           # what a run would do, in well under a second
+    python readme_machine.py --watch          # keep running, render sessions as they land
+    python readme_machine.py --low-memory     # compact sessions, free telemetry early
+
+Importing this module has no side effects and stays cheap: pandas, FastF1
+and the plots in visualization.py are imported when a run first needs
+them, and a run sets up logging and FastF1's cache with ``configure``.
+"""
+import argparse
+import logging
 import os
+import queue
 import re
-import pandas as pd
-import fastf1
-from fastf1 import get_session
-from visualization import (
-    tyre_strategy, sector_gap, top_speed_comparison,
-    quali_result, pos_change, team_pace, tyre_deg,
-    telemetry_comparison, track_domination,
-    plot_top_speed_heatmap, aero_performance
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from manifest import (
+    session_fingerprint, plot_fingerprint,
+    load_manifest, save_manifest, is_up_to_date, record,
+    images, failure, record_failure, clear_failure
 )
+from image_output import FORMATS, ImageOptions, configure as configure_images
+from lap_memo import configure as configure_lap_memo
+from availability import (
+    cached_availability, completed_from_schedule, load_index, load_schedule, probe_session,
+    save_index, save_schedule, session_available
+)
+from instrumentation import (
+    peak_rss_mb, plot_clock, print_summary, reset_peak_rss, stage, write_report
+)
+from plot_registry import compares_drivers, image_stem, load_flags, plot_version
+
+# FastF1's HTTP cache; the session store, indexes and reports live here too
+CACHE_DIR = "cache"
+
+# stage timings of the last run (see instrumentation.py)
+REPORT_PATH = os.path.join(CACHE_DIR, "run_report.json")
+
+
+def configure(cache_dir=CACHE_DIR, memo_bytes=None):
+    """Process-wide setup for a run: quiet FastF1 and library warnings,
+    FastF1's cache in ``cache_dir`` and the byte limit of each session's
+    lap memo (see lap_memo.py)."""
+    import fastf1
+
+    configure_lap_memo(memo_bytes)
+    logging.getLogger("fastf1").setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    warnings.filterwarnings("ignore", category=UserWarning)
+    os.makedirs(cache_dir, exist_ok=True)
+    fastf1.Cache.enable_cache(cache_dir)
+
+
+def get_session(year, event_name, code):
+    import fastf1
+    return fastf1.get_session(year, event_name, code)
+
+
+class FastF1Source:
+    """
+    Where ``watch`` gets its data: FastF1's schedule, the live timing
+    status stream and FastF1 sessions. Any object with the same methods can
+    stand in for it (see benchmarks/stub_source.py).
+    """
+
+    def now(self):
+        import pandas as pd
+        return pd.Timestamp.now(tz="UTC")
+
+    def current_event(self, year):
+        """The newest event of ``year`` whose first session has started, or None."""
+        import fastf1
+        import pandas as pd
+
+        sched = fastf1.get_event_schedule(year, include_testing=False)
+        started = sched[pd.to_datetime(sched["Session1DateUtc"], utc=True) <= self.now()]
+        return started.iloc[-1] if len(started) else None
+
+    def probe(self, year, event_name, code):
+        """True once the session is over and its data is published."""
+        import pandas as pd
 
-# Use a local cache folder
-fastf1.Cache.enable_cache("cache")
+        sess = self.get_session(year, event_name, code)
+        if pd.notna(sess.date) and pd.Timestamp(sess.date, tz="UTC") > self.now():
+            return False        # not started, nothing to ask the API
+        return probe_session(sess)
+
+    def get_session(self, year, event_name, code):
+        return get_session(year, event_name, code)
+
+
+def plot_function(name):
+    """The plot ``name`` from visualization.py, imported on first use."""
+    import visualization
+    return getattr(visualization, name)
+
+
+def event_dir(year, event_name):
+    """Name of an event's folder under visualization/, e.g. 2025_Austrian_Grand_Prix."""
+    return f"{year}_{event_name.replace(' ', '_')}"
+
+
+def image_path(folder, stem, output):
+    """Path of a plot image, with the extension of the output format."""
+    return os.path.join(folder, stem + output.extension)
 
 
 def create_folder(year_gp, session):
@@ -21,29 +117,58 @@ def create_folder(year_gp, session):
     return folder
 
 
-def update_readme_section(tag, image_paths):
-    with open("README.md", "r", encoding="utf-8") as f:
+# every README section: <!-- TAG_START --> ... <!-- TAG_END -->
+_SECTION_RE = re.compile(r"<!-- (\w+)_START -->.*?<!-- \1_END -->", re.DOTALL)
+
+
+def render_readme(txt, sections):
+    """*txt* with the sections in ``sections`` ({tag: image_paths}) replaced."""
+    def replace(m):
+        tag = m.group(1)
+        if tag not in sections:
+            return m.group(0)
+        md = "\n".join(f"![{os.path.basename(p)}]({p})" for p in sections[tag])
+        return f"<!-- {tag}_START -->\n{md}\n<!-- {tag}_END -->"
+    return _SECTION_RE.sub(replace, txt)
+
+
+def update_readme_sections(sections, path="README.md"):
+    """
+    Replace several README sections ({tag: image_paths}) in one pass and
+    one atomic write; returns False (and leaves the file alone) if nothing
+    changed.
+    """
+    with open(path, "r", encoding="utf-8") as f:
         txt = f.read()
-    md = "\n".join(f"![{os.path.basename(p)}]({p})" for p in image_paths)
-    section = f"<!-- {tag}_START -->\n{md}\n<!-- {tag}_END -->"
-    new = re.sub(
-        rf"<!-- {tag}_START -->.*?<!-- {tag}_END -->",
-        section,
-        txt,
-        flags=re.DOTALL
-    )
-    with open("README.md", "w", encoding="utf-8") as f:
+    new = render_readme(txt, sections)
+    if new == txt:
+        return False
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         f.write(new)
+    os.replace(tmp, path)
+    return True
+
+
+def update_readme_section(tag, image_paths):
+    return update_readme_sections({tag: image_paths})
 
 
 def get_latest_event():
+    import fastf1
+    import pandas as pd
+
     # auto‐pick current year
     year = pd.Timestamp.utcnow().year
     sched = fastf1.get_event_schedule(year, include_testing=False)
     done  = sched[sched["Session1Date"] < pd.Timestamp.utcnow()]
     return year, done.iloc[-1]
 
-def get_latest_event_with_fastf1_data(year):
+def completed_events(year):
+    """Events of ``year`` whose last session is over, newest first."""
+    import fastf1
+    import pandas as pd
+
     now = pd.Timestamp.now(tz="UTC")
     sched = fastf1.get_event_schedule(year, include_testing=False).copy()
 
@@ -52,25 +177,40 @@ def get_latest_event_with_fastf1_data(year):
         sched[c] = pd.to_datetime(sched[c], errors="coerce", utc=True)
 
     sched["__last_session_dt"] = sched[session_cols].max(axis=1)
+    # for --plan, which never goes to FastF1 (see availability.py)
+    save_schedule(year, [
+        {"EventName": ev["EventName"], "EventFormat": ev["EventFormat"],
+         "LastSessionUtc": None if pd.isna(ev["__last_session_dt"])
+         else ev["__last_session_dt"].strftime("%Y-%m-%dT%H:%M:%S+00:00")}
+        for _, ev in sched.iterrows()])
 
     done = (
         sched[sched["__last_session_dt"].notna() & (sched["__last_session_dt"] < now)]
         .sort_values("__last_session_dt", ascending=False)
     )
+    return done.drop(columns="__last_session_dt")
 
+
+def get_latest_event_with_fastf1_data(year):
+    done = completed_events(year)
+
+    # probing the race's status stream is much cheaper than loading its laps;
+    # answers are remembered in the availability index between runs
+    index = load_index()
+    latest = None
     for _, ev in done.iterrows():
         try:
-            test_sess = get_session(year, ev["EventName"], "R")
-            test_sess.load(laps=True, telemetry=False, weather=False, messages=False)
-
-            if has_lap_data(test_sess):
-                return ev
+            if session_available(index, year, ev["EventName"], "R",
+                                 lambda: probe_session(get_session(year, ev["EventName"], "R"))):
+                latest = ev
+                break
 
             print(f"Skipping {ev['EventName']}: no usable race lap data yet.")
         except Exception as e:
             print(f"Skipping {ev['EventName']}: {e}")
+    save_index(index)
 
-    return None
+    return latest
 
 def get_top_two_drivers(sess):
     try:
@@ -114,127 +254,605 @@ def has_result_data(sess):
     except Exception:
         return False
 
-def main():
-    year = pd.Timestamp.now(tz="UTC").year
+# which plots (functions in visualization.py) apply to each non-quali session
+_PRACTICE_PLOTS = ["sector_gap", "top_speed_comparison", "plot_top_speed_heatmap", "aero_performance"]
+_RACE_PLOTS = ["pos_change", "tyre_strategy", "team_pace", "tyre_deg"]
+SESSION_PLOTS = {
+    "FP1":       _PRACTICE_PLOTS,
+    "FP2":       _PRACTICE_PLOTS,
+    "FP3":       _PRACTICE_PLOTS,
+    "SPRINT":    _RACE_PLOTS,
+    "RACE":      _RACE_PLOTS,
+}
 
-    ev = get_latest_event_with_fastf1_data(year)
-    if ev is None:
-        print(f"No completed events yet for {year}. Leaving README unchanged.")
-        return
+# every plot a qualifying session may get (the driver comparisons need a top two)
+QUALI_PLOTS = ["quali_result", "telemetry_comparison", "track_domination",
+               "sector_gap", "top_speed_comparison", "aero_performance"]
 
-    fmt   = str(ev.get("EventFormat", "")).strip().lower()
-    is_sprint = "sprint" in fmt
-    print(f"\n=== {year} {ev['EventName']} (format={ev['EventFormat']}) ===")
-    print(f"Detected sprint weekend? {is_sprint}\n")
-
-    gp      = ev["EventName"].replace(" ", "_")
-    year_gp = f"{year}_{gp}"
 
+def planned_plots(tag):
+    """Names of the plots render_session may draw for a session, in README
+    order; decides what gets loaded."""
+    if tag in ("QUALIFYING", "SPRINT_QUALIFYING"):
+        return QUALI_PLOTS
+    return SESSION_PLOTS.get(tag, [])
 
-    # which plots apply to each non-quali session
-    session_plots = {
-        "FP1":       [sector_gap, top_speed_comparison, plot_top_speed_heatmap, aero_performance],
-        "FP2":       [sector_gap, top_speed_comparison, plot_top_speed_heatmap, aero_performance],
-        "FP3":       [sector_gap, top_speed_comparison, plot_top_speed_heatmap, aero_performance],
-        "SPRINT":    [pos_change, tyre_strategy, team_pace, tyre_deg],
-        "RACE":      [pos_change, tyre_strategy, team_pace, tyre_deg],
-    }
 
-    # pick the list of sessions based on sprint flag
+def weekend_sessions(is_sprint):
+    """(README tag, FastF1 session code) pairs for a weekend format."""
     if is_sprint:
-        sessions = [
+        return [
             ("FP1",                "FP1"),
             ("SPRINT_QUALIFYING",  "SQ"),
             ("SPRINT",             "S"),
             ("QUALIFYING",         "Q"),
             ("RACE",               "R"),
         ]
-    else:
-        sessions = [
-            ("FP1",       "FP1"),
-            ("FP2",       "FP2"),
-            ("FP3",       "FP3"),
-            ("QUALIFYING","Q"),
-            ("RACE",      "R"),
-        ]
+    return [
+        ("FP1",       "FP1"),
+        ("FP2",       "FP2"),
+        ("FP3",       "FP3"),
+        ("QUALIFYING","Q"),
+        ("RACE",      "R"),
+    ]
+
+
+def run_plot(tag, fn, args):
+    """Render one plot; returns its output path (None if it failed) and its timings."""
+    stats = {"plot": fn.__name__}
+    try:
+        with plot_clock(stats):
+            fn(*args)
+        stats.update(status="success", bytes=os.path.getsize(args[-1]))
+        print(f"  ▶️ {fn.__name__} for {tag} … success")
+        return args[-1], stats
+    except Exception as e:
+        stats.update(status="failed", error=str(e))
+        print(f"  ▶️ {fn.__name__} for {tag} … failed: {e}")
+        return None, stats
+
+
+def render_session(year, event_name, year_gp, tag, code, threads=1, force=False, only=None,
+                   output=None, source=None, low_memory=False):
+    """
+    Load one session and render its plots.
+
+    Returns ``(tag, image_paths, stats)``; the list is empty when the session
+    could not be loaded or has no usable data, and ``stats`` holds the stage
+    timings of the load and of every plot (see instrumentation.py). Runs in a worker process in
+    ``--workers`` mode, so it only takes and returns picklable values. With
+    ``threads > 1`` the session's plots render concurrently in a thread pool.
+
+    Only the parts of the session that the planned plots need are loaded
+    (see ``plot_registry.PlotSpec.needs``). A loaded session is written to
+    the columnar session store, and later runs reopen it from there instead
+    of going through FastF1 again (see session_store.py). Its laps and
+    stints are added to the season database (see season_db.py).
+
+    Plots whose fingerprint (session data + plot version + parameters)
+    matches the folder's manifest and whose image exists are not rendered
+    again, unless ``force`` is set.
+
+    ``only`` restricts rendering (and loading) to the named plots.
+
+    ``output`` (an ``image_output.ImageOptions``) sets the image format,
+    DPI and size budget; the defaults write matplotlib PNGs. ``source``
+    replaces FastF1 as the place sessions come from (see ``watch``).
+
+    ``low_memory`` compacts the loaded session and drops its telemetry once
+    no plot needs it any more (see memory_budget.py).
+    """
+    stats, names = _start_session(tag, only)
+    sess = load_session(year, event_name, tag, code, names, stats, force, source, low_memory)
+    if sess is None:
+        return tag, [], stats
+    return render_plots(sess, year_gp, tag, names, stats, threads, force, output, low_memory)
+
+
+def _start_session(tag, only):
+    """Empty stats record and the plot names of one session."""
+    stats = {"session": tag, "pid": os.getpid(), "plots": []}
+    return stats, [name for name in planned_plots(tag) if only is None or name in only]
+
+
+def _job_args(year, event_name, year_gp, tag, code, threads=1, force=False, only=None,
+              output=None, source=None, low_memory=False):
+    """All ``render_session`` arguments of a job, defaults filled in."""
+    return (year, event_name, year_gp, tag, code, threads, force, only, output, source,
+            low_memory)
+
+
+def render_pipelined(jobs, max_loaded=2):
+    """
+    ``render_session(*job)`` for every job, in this process, with loading
+    and rendering overlapped: a background thread loads the next sessions
+    while the current one renders, so the network and parsing are busy
+    while matplotlib is. At most ``max_loaded`` sessions are loaded at a
+    time, the one rendering included. Results come back in job order.
+    """
+    jobs = [_job_args(*job) for job in jobs]
+    slots = threading.BoundedSemaphore(max_loaded)
+    loaded = queue.Queue()
+
+    def loader():
+        for year, event_name, _, tag, code, _, force, only, _, source, low_memory in jobs:
+            slots.acquire()
+            stats, names = _start_session(tag, only)
+            try:
+                # sessions overlap here, so none of them has a peak RSS of its own
+                sess = load_session(year, event_name, tag, code, names, stats, force, source,
+                                    low_memory, own_peak=False)
+            except Exception as e:
+                print(f"Could not load {tag}: {e}")
+                sess, stats["status"] = None, "not loaded"
+            loaded.put((sess, names, stats))
+
+    threading.Thread(target=loader, name="prefetch", daemon=True).start()
+    results = []
+    for _, _, year_gp, tag, _, threads, force, _, output, _, low_memory in jobs:
+        sess, names, stats = loaded.get()
+        if sess is None:
+            results.append((tag, [], stats))
+        else:
+            results.append(render_plots(sess, year_gp, tag, names, stats, threads, force,
+                                        output, low_memory))
+            stats.pop("peak_rss_mb", None)
+        # let the loader have this session's slot once nothing refers to it
+        del sess
+        slots.release()
+    return results
+
+
+def load_session(year, event_name, tag, code, names, stats, force=False, source=None,
+                 low_memory=False, own_peak=True):
+    """
+    The loaded session behind ``tag`` with the data the plots ``names``
+    need, or None (with ``stats["status"]`` saying why) if it has none;
+    first half of ``render_session``. With ``low_memory`` the session comes
+    back compacted and, if ``own_peak`` (no other session is loaded or
+    rendering meanwhile), its stats hold its own peak RSS.
+    """
+    from memory_budget import compact_session
+    from season_db import ingest_session
+    from session_store import open_session, session_dir, store_session, stored_parts
+
+    print(f"── Attempting session: {tag}  (code={code})  ──")
+    if low_memory and own_peak:
+        reset_peak_rss()
+    flags = load_flags(names)
+    parts = {part for part, needed in flags.items() if needed}
+    store = session_dir(year, event_name, code)
+    stored = None if force else stored_parts(store)
+    from_store = stored is not None and parts <= stored
+    # try to load the session, from the session store if it has what we need
+    try:
+        with stage(stats, "load"):
+            if from_store:
+                sess = open_session(store)
+            else:
+                sess = (source or FastF1Source()).get_session(year, event_name, code)
+                sess.load(**flags)
+        print(f"Loaded {tag}" + (" from the session store" if from_store else ""))
+    except Exception as e:
+        print(f"Could not load {tag}: {e}")
+        stats["status"] = "not loaded"
+        return None
 
-    for tag, code in sessions:
-        print(f"── Attempting session: {tag}  (code={code})  ──")
-        # try to load the session
+    if not from_store and has_lap_data(sess):
         try:
-            sess = get_session(year, ev["EventName"], code)
-            sess.load(laps=True, telemetry=True, weather=True, messages=True)
-            print(f"Loaded {tag}")
+            with stage(stats, "store"):
+                store_session(sess, store, parts)
         except Exception as e:
-            print(f"Could not load {tag}: {e}")
-            update_readme_section(tag, [])
-            continue
-        
-        if not has_lap_data(sess) and not has_result_data(sess):
-            print(f"Skipping {tag}: FastF1 loaded metadata, but no usable laps/results are available.")
-            update_readme_section(tag, [])
-            continue
+            print(f"Could not store {tag} for later runs: {e}")
 
-        # create the folder & images list
-        folder = create_folder(year_gp, tag)
-        imgs = []
-
-        # QUALI and SPRINT QUALIFYING both follow the same “top-2 + custom order” logic
-        if tag in ("QUALIFYING", "SPRINT_QUALIFYING"):
-            d1, d2 = get_top_two_drivers(sess)
-        
-            bespoke = [
-                (quali_result,         (sess, os.path.join(folder, "quali_result.png"))),
-                (sector_gap,           (sess, os.path.join(folder, "sector_gap.png"))),
-                (top_speed_comparison, (sess, os.path.join(folder, "top_speed_comparison.png"))),
-                (aero_performance,     (sess, os.path.join(folder, "aero_performance.png"))),
-            ]
-        
-            if d1 is not None and d2 is not None:
-                bespoke.insert(1, (telemetry_comparison, (sess, d1, d2, os.path.join(folder, "telemetry.png"))))
-                bespoke.insert(2, (track_domination,     (sess, d1, d2, os.path.join(folder, "track_domination.png"))))
-            else:
-                print(f"Skipping driver comparison plots for {tag}: fewer than 2 drivers available.")
-        
-            for fn, args in bespoke:
-                print(f"  ▶️ {fn.__name__} for {tag} …")
-                try:
-                    fn(*args)
-                    imgs.append(args[-1])
-                    print("success")
-                except Exception as e:
-                    print(f"failed: {e}")
-                    
+    if not has_lap_data(sess) and not has_result_data(sess):
+        print(f"Skipping {tag}: FastF1 loaded metadata, but no usable laps/results are available.")
+        stats["status"] = "no data"
+        return None
+
+    # stored at full precision, compacted before anything derives tables
+    # from it (the season database ingest caches the stint table)
+    if low_memory:
+        compact_session(sess)
+
+    # season-wide lap summaries, for queries across events (see season_db.py)
+    if has_lap_data(sess):
+        try:
+            with stage(stats, "ingest"):
+                ingest_session(sess, year, event_name, code)
+        except Exception as e:
+            print(f"Could not add {tag} to the season database: {e}")
+    return sess
+
+
+def render_plots(sess, year_gp, tag, names, stats, threads=1, force=False, output=None,
+                 low_memory=False):
+    """Render the plots ``names`` of a loaded session; second half of
+    ``render_session``, with the same return value."""
+    from memory_budget import release_telemetry
+    from visualization import lap_memo
+
+    output = output or ImageOptions()
+    configure_images(output)
+
+    # create the folder & plot list
+    folder = create_folder(year_gp, tag)
+
+    # QUALI and SPRINT QUALIFYING compare their top two drivers
+    drivers = ()
+    if any(compares_drivers(name) for name in names):
+        d1, d2 = get_top_two_drivers(sess)
+        if d1 is not None and d2 is not None:
+            drivers = (d1, d2)
         else:
-            # all other sessions from session_plots
-            for fn in session_plots.get(tag, []):
-                out = os.path.join(folder, f"{fn.__name__}.png")
-                print(f"  ▶️ {fn.__name__} for {tag} …")
-                try:
-                    fn(sess, out)
-                    imgs.append(out)
-                    print("success")
-                except Exception as e:
-                    print(f"failed: {e}")
+            print(f"Skipping driver comparison plots for {tag}: fewer than 2 drivers available.")
 
-        # finally, always update the README section
-        update_readme_section(tag, imgs)
-        print(f"★ README section {tag} updated with {len(imgs)} images\n")
+    plots = []
+    for name in names:
+        if compares_drivers(name) and not drivers:
+            continue
+        out = image_path(folder, image_stem(name), output)
+        args = (sess, *drivers, out) if compares_drivers(name) else (sess, out)
+        plots.append((plot_function(name), args))
+
+    # skip plots that were already rendered from identical inputs
+    with stage(stats, "fingerprint"):
+        session_fp = session_fingerprint(sess)
+    manifest = {} if force else load_manifest(folder)
+    fingerprints, todo = {}, []
+    for fn, args in plots:
+        out = args[-1]
+        fingerprints[out] = plot_fingerprint(session_fp, fn.__name__, plot_version(fn.__name__),
+                                             args[1:-1] + output.fingerprint_params())
+        if is_up_to_date(manifest, out, fingerprints[out]):
+            print(f"  ✔ {fn.__name__} for {tag} … up to date")
+        else:
+            todo.append((fn, args))
+
+    def needs_telemetry(job):
+        return load_flags([job[0].__name__])["telemetry"]
+
+    # the session's telemetry goes once the last plot that reads it is done;
+    # in low-memory mode those plots run first
+    if low_memory:
+        todo.sort(key=lambda job: not needs_telemetry(job))
+    telemetry_left = sum(map(needs_telemetry, todo))
+    telemetry_lock = threading.Lock()
+    if low_memory and not telemetry_left:
+        release_telemetry(sess)
+
+    def run(job):
+        nonlocal telemetry_left
+        result = run_plot(tag, *job)
+        if low_memory and needs_telemetry(job):
+            with telemetry_lock:
+                telemetry_left -= 1
+                if not telemetry_left:
+                    release_telemetry(sess)
+        return result
+
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outs = list(pool.map(run, todo))
+    else:
+        outs = [run(job) for job in todo]
+
+    plot_stats = {fn.__name__: {"plot": fn.__name__, "status": "up to date"} for fn, _ in plots}
+    for (fn, args), (out, st) in zip(todo, outs):
+        plot_stats[fn.__name__] = st
+        if out is None:
+            manifest.pop(os.path.basename(args[-1]), None)
+        else:
+            replaced = record(manifest, out, fn.__name__, plot_version(fn.__name__),
+                              fingerprints[out])
+            # an image of the same plot in the previous format
+            for name in replaced:
+                if os.path.exists(os.path.join(folder, name)):
+                    os.remove(os.path.join(folder, name))
+    save_manifest(folder, manifest)
+    stats.update(status="done", plots=list(plot_stats.values()), peak_rss_mb=peak_rss_mb(),
+                 lap_memo=lap_memo(sess).stats())
+
+    return tag, [args[-1] for _, args in plots
+                 if is_up_to_date(manifest, args[-1], fingerprints[args[-1]])], stats
+
+
+def session_images(folder, tag):
+    """Images the folder's manifest lists for a session, in README order."""
+    by_plot = {entry["plot"]: os.path.join(folder, name)
+               for name, entry in images(load_manifest(folder)).items()}
+    return [by_plot[name] for name in planned_plots(tag)
+            if name in by_plot and os.path.exists(by_plot[name])]
+
+
+def readme_sections(results, is_sprint):
+    """README sections for a weekend's ``(tag, image_paths)`` results."""
+    sections = dict(results)
+    for tag, imgs in results:
+        print(f"★ README section {tag} updated with {len(imgs)} images")
 
     # cleanup empty sprint blocks on a normal weekend
     if not is_sprint:
         print("Clearing Sprint Quali section for sprint weekend")
-        update_readme_section("SPRINT_QUALIFYING", [])
+        sections["SPRINT_QUALIFYING"] = []
         print("Clearing Sprint section for sprint weekend")
-        update_readme_section("SPRINT", [])
+        sections["SPRINT"] = []
 
     # Clear out FP2 & FP3 on sprint weekends
     if is_sprint:
         print("Clearing FP2 section for sprint weekend")
-        update_readme_section("FP2", [])
+        sections["FP2"] = []
         print("Clearing FP3 section for sprint weekend")
-        update_readme_section("FP3", [])
-        
+        sections["FP3"] = []
+
+    return sections
+
+
+def main(workers=1, threads=1, force=False, report=REPORT_PATH, output=None, prefetch=0,
+         low_memory=False, memo_bytes=None):
+    started = time.perf_counter()
+    configure(memo_bytes=memo_bytes)
+    year = time.gmtime().tm_year
+
+    ev = get_latest_event_with_fastf1_data(year)
+    if ev is None:
+        print(f"No completed events yet for {year}. Leaving README unchanged.")
+        return
+
+    fmt   = str(ev.get("EventFormat", "")).strip().lower()
+    is_sprint = "sprint" in fmt
+    print(f"\n=== {year} {ev['EventName']} (format={ev['EventFormat']}) ===")
+    print(f"Detected sprint weekend? {is_sprint}\n")
+
+    year_gp = event_dir(year, ev["EventName"])
+
+    # pick the list of sessions based on sprint flag
+    sessions = weekend_sessions(is_sprint)
+    jobs = [(year, ev["EventName"], year_gp, tag, code, threads, force, None, output, None,
+             low_memory)
+            for tag, code in sessions]
+
+    if workers > 1:
+        # one session per worker process; loading is mostly I/O and parsing
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 initializer=configure,
+                                 initargs=(CACHE_DIR, memo_bytes)) as pool:
+            futures = [pool.submit(render_session, *job) for job in jobs]
+            results = [f.result() for f in futures]
+    elif prefetch > 1:
+        results = render_pipelined(jobs, max_loaded=prefetch)
+    else:
+        results = [render_session(*job) for job in jobs]
+
+    update_readme_sections(readme_sections([(tag, imgs) for tag, imgs, _ in results], is_sprint))
+
+    stats = [st for _, _, st in results]
+    wall = time.perf_counter() - started
+    write_report(report, stats, wall)
+    print_summary(stats, wall)
+
+
+def watch(interval=300, max_interval=3600, backoff=2.0, threads=1, output=None,
+          source=None, sleep=time.sleep, polls=None, low_memory=False, max_attempts=5):
+    """
+    Keep polling for the current weekend's sessions and render each one as
+    soon as its data is published, updating only that session's README
+    section.
+
+    Every poll probes the sessions of the current event that are not
+    rendered yet. Polls start ``interval`` seconds apart and every idle
+    poll makes the next wait ``backoff`` times longer, up to
+    ``max_interval``; a rendered session resets the wait to ``interval``.
+    When a new weekend starts, the README sections its format does not have
+    are cleared. ``polls`` stops after that many polls (None: run until
+    interrupted).
+
+    A session whose data is out but yields no images is tried again no
+    sooner than ``interval`` seconds later, growing by ``backoff`` with each
+    failed attempt up to ``max_interval``, and left alone after
+    ``max_attempts`` of them. The attempts are kept in the session's
+    manifest, so a restarted watch carries on counting.
+    """
+    configure()
+    source = source or FastF1Source()
+    index = load_index()
+    event, done, delay, n = None, set(), interval, 0
+    while polls is None or n < polls:
+        n += 1
+        year = source.now().year
+        ev = source.current_event(year)
+        rendered = False
+        if ev is not None:
+            is_sprint = "sprint" in str(ev.get("EventFormat", "")).strip().lower()
+            if (year, ev["EventName"]) != event:
+                event, done = (year, ev["EventName"]), set()
+                print(f"\n=== watching {year} {ev['EventName']} (format={ev['EventFormat']}) ===")
+                update_readme_sections(readme_sections([], is_sprint))
+            year_gp = event_dir(year, ev["EventName"])
+            for tag, code in weekend_sessions(is_sprint):
+                if tag in done:
+                    continue
+                folder = os.path.join("visualization", year_gp, tag)
+                failed = failure(load_manifest(folder))
+                if failed is not None:
+                    if failed["attempts"] >= max_attempts:
+                        print(f"Giving up on {tag} after {failed['attempts']} failed attempts")
+                        done.add(tag)
+                        continue
+                    wait = min(interval * backoff ** (failed["attempts"] - 1), max_interval)
+                    if source.now().timestamp() < failed["at"] + wait:
+                        continue
+                # ttl=0: a watch polls more often than the index would re-probe
+                if not session_available(index, year, ev["EventName"], code,
+                                         lambda: source.probe(year, ev["EventName"], code),
+                                         ttl=0):
+                    continue
+                try:
+                    _, imgs, _ = render_session(year, ev["EventName"], year_gp, tag, code,
+                                                threads, output=output, source=source,
+                                                low_memory=low_memory)
+                except Exception as e:
+                    print(f"Could not render {tag}: {e}")
+                    imgs = []
+                if not imgs or failed is not None:
+                    manifest = load_manifest(folder)
+                    if imgs:
+                        clear_failure(manifest)
+                    else:
+                        failed = record_failure(manifest, source.now().timestamp())
+                        print(f"No images for {tag} (attempt {failed['attempts']} "
+                              f"of {max_attempts})")
+                    os.makedirs(folder, exist_ok=True)
+                    save_manifest(folder, manifest)
+                if imgs:
+                    update_readme_sections({tag: imgs})
+                    print(f"★ README section {tag} updated with {len(imgs)} images")
+                    done.add(tag)
+                    rendered = True
+            save_index(index)
+
+        if rendered:
+            delay = interval
+        if polls is None or n < polls:
+            print(f"next poll in {delay:.0f} s")
+            sleep(delay)
+            delay = min(delay * backoff, max_interval)
+
+
+def plan(output=None):
+    """
+    Print what a run would do without loading or probing anything: the
+    event, the sessions with the data each would load (and from where), and
+    every plot with whether it would be rendered.
+
+    Only local files are read: the schedule the last run kept (see
+    ``availability.save_schedule``), the availability index, the session
+    store and the manifests; FastF1 and the network are never touched.
+    Whatever cannot be told from them is reported as unknown. A plot counts
+    as up to date when its image exists and the manifest has it from the
+    current plot version; a run can still re-render it if the session's
+    data changed, which only loading the session can tell.
+    """
+    output = output or ImageOptions()
+    year = time.gmtime().tm_year
+    try:
+        ev, known = _planned_event(year)
+    except Exception as e:
+        print(f"Event: unknown ({e})")
+        return
+    if ev is None:
+        print(f"Event: unknown (no schedule kept for {year} yet; a run fetches it)")
+        return
+
+    is_sprint = "sprint" in str(ev.get("EventFormat", "")).strip().lower()
+    year_gp = event_dir(year, ev["EventName"])
+    print(f"=== {year} {ev['EventName']} (format={ev.get('EventFormat')}) ===")
+    if known is None:
+        print("Race data not confirmed yet; a run probes it first and may pick an older event.")
+
+    for tag, code in weekend_sessions(is_sprint):
+        try:
+            _plan_session(year, ev["EventName"], year_gp, tag, code, output)
+        except Exception as e:
+            print(f"\n{tag} ({code}): unknown ({e})")
+
+
+def _planned_event(year):
+    """
+    The event a run would pick, as far as local files tell, and whether its
+    race is known to have data (None: not probed yet); ``(None, None)`` if
+    no schedule is kept.
+    """
+    events = load_schedule(year)
+    if events is None:
+        return None, None
+    index = load_index()
+    for ev in completed_from_schedule(events):
+        known = cached_availability(index, year, ev["EventName"], "R")
+        if known is not False:
+            return ev, known
+    return None, None
+
+
+def _plan_session(year, event_name, year_gp, tag, code, output):
+    from session_store import session_dir, stored_parts
+
+    folder = os.path.join("visualization", year_gp, tag)
+    manifest = load_manifest(folder)
+    names = planned_plots(tag)
+    parts = {part for part, needed in load_flags(names).items() if needed}
+    stored = stored_parts(session_dir(year, event_name, code))
+    source = "session store" if stored is not None and parts <= stored else "FastF1"
+    print(f"\n{tag} ({code}): loads {', '.join(sorted(parts))} from {source}")
+    for name in names:
+        out = image_path(folder, image_stem(name), output)
+        entry = manifest.get(os.path.basename(out))
+        if entry is None or not os.path.exists(out):
+            state = "render"
+        elif entry.get("version") != plot_version(name):
+            state = f"render (version {entry.get('version')} -> {plot_version(name)})"
+        else:
+            state = "up to date"
+        print(f"  {name:<23} {state}")
+
+
+def add_image_arguments(parser):
+    parser.add_argument("--format", choices=sorted(FORMATS), default="png",
+                        help="image format: matplotlib PNG, 256-colour PNG or lossless WebP "
+                             "(default: png)")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="image resolution (default: each figure's own, 100)")
+    parser.add_argument("--max-kb", type=int, default=None,
+                        help="lower the DPI of images larger than this many KiB")
+
+
+def image_options(args):
+    return ImageOptions(args.format, args.dpi, args.max_kb * 1024 if args.max_kb else None)
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Render the latest weekend and update README.md")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="load and render sessions in this many worker processes (default: 1)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="render each session's plots in this many threads (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every plot, ignoring the render manifests")
+    parser.add_argument("--report", default=REPORT_PATH,
+                        help=f"write the run's stage timings here (default: {REPORT_PATH})")
+    parser.add_argument("--prefetch", type=int, default=0,
+                        help="load the next sessions on a background thread while one renders, "
+                             "with at most this many sessions loaded at once (2 or more; "
+                             "default: off)")
+    parser.add_argument("--plan", action="store_true",
+                        help="only list the event, sessions and plots a run would render")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and render every session as soon as its data lands")
+    parser.add_argument("--interval", type=float, default=300,
+                        help="--watch: seconds between polls (default: 300)")
+    parser.add_argument("--max-interval", type=float, default=3600,
+                        help="--watch: longest wait while nothing new lands (default: 3600)")
+    parser.add_argument("--backoff", type=float, default=2.0,
+                        help="--watch: factor the wait grows by after an idle poll (default: 2)")
+    parser.add_argument("--max-attempts", type=int, default=5,
+                        help="--watch: failed renders of a session before it is given up "
+                             "(default: 5)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="compact each session's laps and telemetry and drop the telemetry "
+                             "once no plot needs it")
+    parser.add_argument("--memo-mb", type=float, default=None,
+                        help="memory for each session's memo of fastest laps and lap telemetry "
+                             "(default: 256)")
+    add_image_arguments(parser)
+    args = parser.parse_args()
+    if args.plan:
+        plan(output=image_options(args))
+    elif args.watch:
+        watch(args.interval, args.max_interval, args.backoff, threads=args.threads,
+              output=image_options(args), low_memory=args.low_memory,
+              max_attempts=args.max_attempts)
+    else:
+        memo_bytes = int(args.memo_mb * 1024 * 1024) if args.memo_mb is not None else None
+        main(workers=args.workers, threads=args.threads, force=args.force, report=args.report,
+             output=image_options(args), prefetch=args.prefetch, low_memory=args.low_memory,
+             memo_bytes=memo_bytes)
@@ -0,0 +1,272 @@
+# season_db.py
+"""
+Season-wide lap and stint summaries in one SQLite file.
+
+    python season_db.py 2025                       # sessions in the database
+    python season_db.py 2025 --team-pace           # race pace per team and event
+    python season_db.py 2025 --top-speed --session Q
+
+Every session ``readme_machine`` (or ``backfill``) loads is added with
+``ingest_session``: one row per lap (lap and sector times, speed traps,
+compound, tyre age, track status, quick-lap flag) and one row per stint,
+keyed by year, event and session. Ingest is idempotent: a session whose
+laps hash to what the database already holds is skipped, and a changed one
+replaces its old rows in a single transaction. A database written by an
+older ``SCHEMA_VERSION`` is emptied when opened and filled again as the
+sessions are ingested.
+
+The query functions read only this file, so season plots and cross-event
+comparisons never load a FastF1 session.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+DB_PATH = os.path.join("cache", "season.sqlite")
+
+# bumped when a table changes; older databases are rebuilt by re-ingesting
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    year        INTEGER NOT NULL,
+    event       TEXT    NOT NULL,
+    session     TEXT    NOT NULL,
+    round       INTEGER,
+    date        TEXT,
+    fingerprint TEXT    NOT NULL,
+    ingested_at REAL    NOT NULL,
+    PRIMARY KEY (year, event, session)
+);
+CREATE TABLE IF NOT EXISTS laps (
+    year           INTEGER NOT NULL,
+    event          TEXT    NOT NULL,
+    session        TEXT    NOT NULL,
+    driver         TEXT    NOT NULL,
+    team           TEXT,
+    lap            INTEGER NOT NULL,
+    lap_time       REAL,
+    sector1        REAL,
+    sector2        REAL,
+    sector3        REAL,
+    speed_i1       REAL,
+    speed_i2       REAL,
+    speed_fl       REAL,
+    speed_st       REAL,
+    speed_trap_max REAL,
+    stint          INTEGER,
+    compound       TEXT,
+    tyre_age       INTEGER,
+    track_status   TEXT,
+    quick          INTEGER NOT NULL,
+    PRIMARY KEY (year, event, session, driver, lap)
+);
+CREATE TABLE IF NOT EXISTS stints (
+    year      INTEGER NOT NULL,
+    event     TEXT    NOT NULL,
+    session   TEXT    NOT NULL,
+    driver    TEXT    NOT NULL,
+    stint     INTEGER NOT NULL,
+    compound  TEXT,
+    fresh     INTEGER,
+    start_lap INTEGER,
+    end_lap   INTEGER,
+    laps      INTEGER,
+    PRIMARY KEY (year, event, session, driver, stint, compound, fresh)
+);
+"""
+
+_LAP_COLUMNS = ("driver", "team", "lap", "lap_time", "sector1", "sector2", "sector3",
+                "speed_i1", "speed_i2", "speed_fl", "speed_st", "speed_trap_max",
+                "stint", "compound", "tyre_age", "track_status", "quick")
+_STINT_COLUMNS = ("driver", "stint", "compound", "fresh", "start_lap", "end_lap", "laps")
+
+
+def connect(path=DB_PATH):
+    """Open (and if needed create) the season database."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # worker processes ingest their sessions concurrently; wait for the
+    # write lock instead of failing
+    conn = sqlite3.connect(path, timeout=60)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        _rebuild(conn)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _rebuild(conn):
+    """
+    Drop the tables of an older schema. Everything in them is derived from
+    sessions, and with ``sessions`` gone the next run ingests each again.
+    """
+    conn.execute("BEGIN IMMEDIATE")    # another worker may be doing the same
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for table in ("laps", "stints", "sessions"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def laps_fingerprint(laps):
+    """Hash of a session's lap table; a session is re-ingested when it changes."""
+    import pandas as pd
+
+    h = hashlib.sha256(",".join(map(str, laps.columns)).encode())
+    h.update(pd.util.hash_pandas_object(laps, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _rows(frame, columns):
+    """Plain Python rows for sqlite3: NaN/NaT become NULL, numpy scalars unwrap."""
+    frame = frame[list(columns)].astype(object)
+    frame = frame.where(frame.notna(), None)
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row)
+            for row in frame.itertuples(index=False, name=None)]
+
+
+def session_rows(sess):
+    """The lap and stint rows of a loaded session."""
+    from visualization import stint_table    # the race plots' stint structure
+
+    laps = sess.laps
+    table = stint_table(sess)
+    seconds = {name: laps[col].dt.total_seconds() for name, col in
+               (("lap_time", "LapTime"), ("sector1", "Sector1Time"),
+                ("sector2", "Sector2Time"), ("sector3", "Sector3Time"))}
+    traps = laps[["SpeedI1", "SpeedI2", "SpeedFL", "SpeedST"]]
+    per_lap = table.laps.assign(
+        **seconds,
+        speed_i1=traps["SpeedI1"], speed_i2=traps["SpeedI2"],
+        speed_fl=traps["SpeedFL"], speed_st=traps["SpeedST"],
+        # fastest speed-trap reading of the lap: there for every session
+        # with laps, telemetry or not
+        speed_trap_max=traps.max(axis=1),
+        track_status=laps["TrackStatus"],
+        quick=table.laps["Quick"].astype(int),
+    ).rename(columns={"Driver": "driver", "Team": "team", "LapNumber": "lap",
+                      "Stint": "stint", "Compound": "compound", "TyreAge": "tyre_age"})
+    stints = table.stints.rename(columns={
+        "Driver": "driver", "Stint": "stint", "Compound": "compound", "FreshTyre": "fresh",
+        "StartLap": "start_lap", "EndLap": "end_lap", "StintLength": "laps"})
+    stints = stints.assign(fresh=stints["fresh"].astype(bool).astype(int))
+    return (_rows(per_lap[per_lap["lap"].notna()], _LAP_COLUMNS),
+            _rows(stints, _STINT_COLUMNS))
+
+
+def ingest_session(sess, year, event_name, code, path=DB_PATH):
+    """
+    Add a loaded session's laps and stints to the database, replacing what
+    it held for (year, event, session). Returns False if the database
+    already had this exact lap table.
+    """
+    fingerprint = laps_fingerprint(sess.laps)
+    key = (year, event_name, code)
+    conn = connect(path)
+    try:
+        found = conn.execute("SELECT fingerprint FROM sessions "
+                             "WHERE year = ? AND event = ? AND session = ?", key).fetchone()
+        if found is not None and found[0] == fingerprint:
+            return False
+
+        laps, stints = session_rows(sess)
+        event = getattr(sess, "event", None)
+        round_no = event.get("RoundNumber") if event is not None else None
+        date = getattr(sess, "date", None)
+        with conn:    # one transaction: readers never see half a session
+            for table in ("laps", "stints", "sessions"):
+                conn.execute(f"DELETE FROM {table} "
+                             "WHERE year = ? AND event = ? AND session = ?", key)
+            conn.execute("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         key + (None if round_no is None else int(round_no),
+                                None if date is None else str(date),
+                                fingerprint, time.time()))
+            for table, columns, rows in (("laps", _LAP_COLUMNS, laps),
+                                         ("stints", _STINT_COLUMNS, stints)):
+                marks = ", ".join("?" * (len(key) + len(columns)))
+                conn.executemany(f"INSERT INTO {table} VALUES ({marks})",
+                                 [key + row for row in rows])
+        return True
+    finally:
+        conn.close()
+
+
+# ── season queries ──────────────────────────────────────────────────────────
+
+def query(sql, params=(), path=DB_PATH):
+    """Run *sql* against the database and return the result as a DataFrame."""
+    import pandas as pd
+
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def sessions(year, path=DB_PATH):
+    """Sessions of *year* in the database, in calendar order, with lap counts."""
+    return query("""
+        SELECT s.round, s.event, s.session, s.date, COUNT(l.lap) AS laps
+        FROM sessions s LEFT JOIN laps l USING (year, event, session)
+        WHERE s.year = ?
+        GROUP BY s.year, s.event, s.session
+        ORDER BY s.round, s.date
+    """, (year,), path)
+
+
+def top_speeds(year, session="Q", path=DB_PATH):
+    """Highest speed-trap reading per team at every event of *year*."""
+    return query("""
+        SELECT s.round, l.event, l.team, MAX(l.speed_trap_max) AS speed_trap_max
+        FROM laps l JOIN sessions s USING (year, event, session)
+        WHERE l.year = ? AND l.session = ?
+        GROUP BY l.event, l.team
+        ORDER BY s.round, speed_trap_max DESC
+    """, (year, session), path)
+
+
+def team_pace(year, session="R", path=DB_PATH):
+    """
+    Median quick-lap time per team at every event of *year*, and its gap to
+    the event's fastest team (lap times in seconds).
+    """
+    laps = query("""
+        SELECT s.round, l.event, l.team, l.lap_time
+        FROM laps l JOIN sessions s USING (year, event, session)
+        WHERE l.year = ? AND l.session = ? AND l.quick = 1
+    """, (year, session), path)
+    pace = (laps.groupby(["round", "event", "team"], dropna=False)["lap_time"]
+                .median().rename("median_lap").reset_index())
+    pace["gap"] = pace["median_lap"] - pace.groupby("event")["median_lap"].transform("min")
+    return pace.sort_values(["round", "gap"], ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the season lap database")
+    parser.add_argument("year", type=int)
+    parser.add_argument("--session", default=None,
+                        help="session code for the queries (default: Q for --top-speed, "
+                             "R for --team-pace)")
+    parser.add_argument("--top-speed", action="store_true",
+                        help="highest speed-trap reading (any of the four traps) "
+                             "per team and event")
+    parser.add_argument("--team-pace", action="store_true",
+                        help="median quick-lap time per team and event")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    args = parser.parse_args()
+
+    if args.top_speed:
+        result = top_speeds(args.year, args.session or "Q", args.db)
+    elif args.team_pace:
+        result = team_pace(args.year, args.session or "R", args.db)
+    else:
+        result = sessions(args.year, args.db)
+    print(result.to_string(index=False))
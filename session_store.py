@@ -0,0 +1,266 @@
+# session_store.py
+"""
+Columnar copies of loaded FastF1 sessions.
+
+A warm ``Session.load`` still unpickles FastF1's API cache and rebuilds
+every DataFrame. ``store_session`` writes what the plots use (laps,
+results, track/session status, race control messages and per-driver
+car/position telemetry) as one ``.npy`` file per column under
+``cache/sessions/<year>/<event>/<session>/``, and ``open_session`` turns
+that back into a regular ``fastf1.core.Session`` in milliseconds:
+
+- the small tables (laps, results, status, messages) are read in full,
+  every column, when the session is opened;
+- telemetry of all drivers is stored end to end with per-driver offsets,
+  and a driver's ``Telemetry`` is only built when a plot first asks for it.
+  Its columns are opened with ``mmap_mode="r"`` and sliced to the driver's
+  rows before they are decoded, so only those rows are read from disk.
+
+Frames are ordinary in-memory DataFrames: building one copies its columns
+out of the mapped files, all of them, whether a plot uses them or not.
+
+Column encodings: numbers and bools are stored as they are, timestamps and
+timedeltas as int64 nanoseconds, and everything else (strings, mixed
+objects) as int32 codes into a category list kept in the table's
+``columns.json``.
+
+A stored session is reused for as long as it exists, exactly like FastF1's
+own cache, if its session status said it was finished when it was stored.
+One stored earlier (by a ``--watch`` poll, or right after the chequered
+flag) may hold partial data, so it is loaded from FastF1 and stored again
+until it is. ``readme_machine --force`` always reloads and rewrites it.
+"""
+import json
+import os
+import shutil
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, Session, SessionResults, Telemetry
+from fastf1.events import Event
+
+from availability import finished
+
+STORE_DIR = os.path.join("cache", "sessions")
+FORMAT = 2
+
+_TABLES = {"laps": "_laps", "results": "_results", "track_status": "_track_status",
+           "session_status": "_session_status", "messages": "_race_control_messages"}
+_CHANNELS = {"car": "_car_data", "pos": "_pos_data"}
+
+
+def session_dir(year, event_name, code, root=STORE_DIR):
+    return os.path.join(root, str(year), event_name.replace(" ", "_"), code)
+
+
+# ── column encoding ──────────────────────────────────────────────────────────
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    return value
+
+
+def _write_column(folder, i, series):
+    col = {"name": series.name}
+    dtype = series.dtype
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        col["kind"] = "timedelta"
+        values = series.to_numpy("timedelta64[ns]").view("int64")
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        col["kind"] = "datetime"
+        col["tz"] = str(dtype.tz) if getattr(dtype, "tz", None) else None
+        values = series.dt.tz_convert("UTC").dt.tz_localize(None) if col["tz"] else series
+        values = values.to_numpy("datetime64[ns]").view("int64")
+    elif isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        col["kind"] = "numpy"
+        values = series.to_numpy()
+    else:
+        col["kind"] = "category"
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        col["categories"] = [_jsonable(u) for u in uniques]
+        values = codes.astype("int32")
+    np.save(os.path.join(folder, f"{i}.npy"), values)
+    return col
+
+
+def _read_column(folder, i, col, start=None, stop=None):
+    # only rows start:stop are read; decoding (and pandas) copies them
+    values = np.load(os.path.join(folder, f"{i}.npy"), mmap_mode="r")[start:stop]
+    kind = col["kind"]
+    if kind == "timedelta":
+        return pd.to_timedelta(values.view("timedelta64[ns]"))
+    if kind == "datetime":
+        ts = pd.DatetimeIndex(values.view("datetime64[ns]"))
+        return ts.tz_localize("UTC").tz_convert(col["tz"]) if col["tz"] else ts
+    if kind == "category":
+        # code -1 marks a missing value, which picks the trailing NaN
+        lookup = np.array(col["categories"] + [np.nan], dtype=object)
+        return lookup[np.asarray(values)]
+    return np.asarray(values)
+
+
+def _write_table(folder, df, offsets=None):
+    os.makedirs(folder)
+    df = df.reset_index(names="__index__") if offsets is None else df
+    columns = [_write_column(folder, i, df[name]) for i, name in enumerate(df.columns)]
+    with open(os.path.join(folder, "columns.json"), "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "offsets": offsets}, f)
+
+
+def _read_schema(folder):
+    with open(os.path.join(folder, "columns.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_table(folder, start=None, stop=None):
+    schema = _read_schema(folder)
+    data = {col["name"]: _read_column(folder, i, col, start, stop)
+            for i, col in enumerate(schema["columns"])}
+    df = pd.DataFrame(data)
+    if "__index__" in df.columns:
+        df = df.set_index("__index__")
+        df.index.name = None
+    return df
+
+
+# ── lazy telemetry ───────────────────────────────────────────────────────────
+
+class _StoredTelemetry(Mapping):
+    """``{driver number: Telemetry}`` built from the store on first access.
+
+    ``transform``, if set, is applied to each driver's frame as it is built
+    (see memory_budget.py).
+    """
+
+    def __init__(self, folder, session):
+        self._folder = folder
+        self._session = session
+        self._offsets = _read_schema(folder)["offsets"]
+        self._frames = {}
+        self.transform = None
+
+    def __getitem__(self, drv):
+        if drv not in self._frames:
+            start, stop = self._offsets[drv]
+            frame = _read_table(self._folder, start, stop)
+            if self.transform is not None:
+                frame = self.transform(frame)
+            self._frames[drv] = Telemetry(frame, session=self._session, driver=drv)
+        return self._frames[drv]
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+# ── store / open ─────────────────────────────────────────────────────────────
+
+def _event_record(event):
+    return {key: _jsonable(value) if not pd.isna(value) else None
+            for key, value in event.items()}
+
+
+def _event_from_record(record, year):
+    data = {key: pd.Timestamp(value) if value is not None and key.endswith(("Date", "DateUtc"))
+            else value for key, value in record.items()}
+    return Event(pd.Series(data), year=year)
+
+
+def store_session(sess, folder, parts):
+    """Write the loaded parts of *sess* to *folder*, replacing what was there."""
+    tmp = f"{folder}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    for name, attr in _TABLES.items():
+        frame = getattr(sess, attr, None)
+        if isinstance(frame, pd.DataFrame):
+            _write_table(os.path.join(tmp, name), pd.DataFrame(frame))
+    if "telemetry" in parts:
+        for name, attr in _CHANNELS.items():
+            channels = getattr(sess, attr, None) or {}
+            drivers = [drv for drv in channels if len(channels[drv])]
+            if not drivers:
+                continue
+            frames = [pd.DataFrame(channels[drv]) for drv in drivers]
+            ends = np.cumsum([len(f) for f in frames]).tolist()
+            offsets = {drv: (start, stop)
+                       for drv, start, stop in zip(drivers, [0] + ends[:-1], ends)}
+            _write_table(os.path.join(tmp, name),
+                         pd.concat(frames, ignore_index=True), offsets)
+
+    circuit = sess.session_info.get("Meeting", {}).get("Circuit", {}) \
+        if hasattr(sess, "_session_info") else {}
+    status = getattr(sess, "_session_status", None)
+    meta = {
+        "format": FORMAT,
+        "parts": sorted(parts),
+        # SessionStatus said the session was over: nothing more will come
+        "finished": isinstance(status, pd.DataFrame) and "Status" in status
+                    and finished(status["Status"]),
+        "year": int(sess.event.year),
+        "name": sess.name,
+        "api_path": sess.api_path,
+        "event": _event_record(sess.event),
+        "session_info": {"Meeting": {"Circuit": {"Key": circuit.get("Key"),
+                                                  "ShortName": circuit.get("ShortName")}}},
+        "t0_date": str(getattr(sess, "_t0_date", None) or "") or None,
+        "session_start_time": str(getattr(sess, "_session_start_time", None) or "") or None,
+        "total_laps": getattr(sess, "_total_laps", None),
+    }
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(tmp, folder)
+
+
+def stored_parts(folder):
+    """
+    The load parts kept in *folder*, or None if nothing usable is stored:
+    no session, one in an older format, or one that was not finished yet.
+    """
+    try:
+        with open(os.path.join(folder, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("format") != FORMAT or not meta.get("finished"):
+        return None
+    return set(meta["parts"])
+
+
+def open_session(folder):
+    """Rebuild a ``Session`` from *folder*; telemetry loads lazily per driver."""
+    with open(os.path.join(folder, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    event = _event_from_record(meta["event"], meta["year"])
+    sess = Session(event, meta["name"], f1_api_support=True)
+    sess.api_path = meta["api_path"]
+    sess._session_info = meta["session_info"]
+    if meta["t0_date"]:
+        sess._t0_date = pd.Timestamp(meta["t0_date"])
+    if meta["session_start_time"]:
+        sess._session_start_time = pd.Timedelta(meta["session_start_time"])
+    sess._total_laps = meta["total_laps"]
+
+    for name, attr in _TABLES.items():
+        path = os.path.join(folder, name)
+        if os.path.isdir(path):
+            setattr(sess, attr, _read_table(path))
+    if hasattr(sess, "_results"):
+        sess._results = SessionResults(sess._results)
+    if hasattr(sess, "_laps"):
+        sess._laps = Laps(sess._laps, session=sess)
+    for name, attr in _CHANNELS.items():
+        path = os.path.join(folder, name)
+        if os.path.isdir(path):
+            setattr(sess, attr, _StoredTelemetry(path, sess))
+    return sess
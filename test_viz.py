@@ -6,8 +6,11 @@ Created on Tue Jul  1 16:33:09 2025
 """
 
 from fastf1 import get_session
+from readme_machine import configure
 from visualization import top_speed_comparison, sector_gap
 
+configure()
+
 # Load the FP1 session for Austria 2025
 sess = get_session(2025, "Austria", "FP1")
 sess.load()
@@ -0,0 +1,24 @@
+# tests/conftest.py
+"""
+The tests run offline on synthetic sessions (benchmarks/synthetic_session.py).
+"""
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A scratch folder to run in: the pipeline writes visualization/, cache/ and README.md."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,63 @@
+# tests/test_backfill.py
+"""
+The backfill checkpoint: a plot done once is skipped by later backfills
+until its version or the image options change.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import backfill
+import plot_registry
+from image_output import ImageOptions
+from manifest import record, save_manifest
+
+EVENT = pd.Series({"EventName": "Synthetic Grand Prix", "EventFormat": "conventional"})
+
+
+@pytest.fixture
+def rendered(workdir, monkeypatch):
+    """Backfill 2020 offline; returns the plots each run asked to render."""
+    calls = []
+
+    def render_session(year, event_name, year_gp, tag, code, threads, force, plots,
+                       output, source, low_memory):
+        folder = os.path.join("visualization", year_gp, tag)
+        os.makedirs(folder, exist_ok=True)
+        manifest, images = {}, []
+        for plot in plots:
+            out = os.path.join(folder, f"{plot}.png")
+            record(manifest, out, plot, plot_registry.plot_version(plot), "fp")
+            images.append(out)
+        save_manifest(folder, manifest)
+        calls.extend(plots)
+        return tag, images, {"session": tag, "plots": []}
+
+    monkeypatch.setattr(backfill, "configure", lambda: None)
+    monkeypatch.setattr(backfill, "select_events", lambda year, names=None: [EVENT])
+    monkeypatch.setattr(backfill, "render_session", render_session)
+
+    def run(output=None):
+        calls.clear()
+        backfill.backfill([2020], output=output)
+        return list(calls)
+
+    return run
+
+
+def test_version_bump_renders_only_that_plot(rendered, monkeypatch):
+    first = rendered()
+    assert "tyre_strategy" in first and "sector_gap" in first
+    assert rendered() == []
+
+    spec = plot_registry.PLOTS["sector_gap"]
+    monkeypatch.setitem(plot_registry.PLOTS, "sector_gap", spec._replace(version=spec.version + 1))
+    assert set(rendered()) == {"sector_gap"}
+    assert rendered() == []
+
+
+def test_image_options_render_again(rendered):
+    first = rendered()
+    assert sorted(rendered(ImageOptions(dpi=72))) == sorted(first)
+    assert rendered(ImageOptions(dpi=72)) == []
@@ -0,0 +1,20 @@
+# tests/test_bench.py
+import json
+
+import bench
+
+
+def test_race_periods_follow_the_race_length():
+    assert bench.race_periods(bench.RACE_SC, bench.RACE_LAPS) == bench.RACE_SC
+    for n_laps in (1, 3, 10, 30, 80):
+        for first, last in bench.race_periods(bench.RACE_SC + bench.RACE_VSC, n_laps):
+            assert 1 <= first <= last <= n_laps
+
+
+def test_bench_runs_short_races(tmp_path):
+    out = tmp_path / "bench.json"
+    assert bench.main(["--laps", "3", "--repeat", "1", "--no-pipeline",
+                       "--out", str(out)]) == 0
+    results = json.loads(out.read_text())
+    assert set(results["sessions"]) == {tag for tag, _ in bench.SESSIONS}
+    assert any(key.startswith("RACE/") for key in results["plots"])
@@ -0,0 +1,38 @@
+# tests/test_decimation.py
+import numpy as np
+
+import visualization as viz
+
+
+def circle(n, radius=1000.0):
+    angle = np.linspace(0, 2 * np.pi, n)
+    return np.column_stack([radius * np.cos(angle), radius * np.sin(angle)])
+
+
+def test_dense_path_thinned_to_pixel_budget():
+    xy = circle(20000)
+    keep = viz.decimate_path(xy, px_per_unit=0.5, spacing=4.0)
+    # 6283 units of track at 0.5 px per unit: one point every 4 px
+    assert 700 < len(keep) < 900
+    assert keep[0] == 0 and keep[-1] == len(xy) - 1
+    # consecutive points lie in neighbouring 4 px buckets of path length
+    chords = np.hypot(*np.diff(xy[keep], axis=0).T) * 0.5
+    assert chords.max() < 8.0
+
+
+def test_point_count_does_not_grow_with_sample_rate():
+    counts = [len(viz.decimate_path(circle(n), px_per_unit=0.5)) for n in (5000, 50000)]
+    assert abs(counts[0] - counts[1]) <= 2
+
+
+def test_flagged_points_are_kept():
+    xy = circle(20000)
+    flagged = np.zeros(len(xy), bool)
+    flagged[[17, 4321, 9999]] = True
+    keep = viz.decimate_path(xy, px_per_unit=0.5, keep=flagged)
+    assert {17, 4321, 9999} <= set(keep)
+
+
+def test_sparse_path_kept_whole():
+    xy = circle(50)
+    assert list(viz.decimate_path(xy, px_per_unit=0.5)) == list(range(50))
@@ -0,0 +1,51 @@
+# tests/test_lap_memo.py
+import numpy as np
+import pandas as pd
+
+from synthetic_session import make_session
+
+import visualization as viz
+from lap_memo import LapMemo, nbytes
+
+
+def frame(n):
+    return pd.DataFrame({"x": np.zeros(n)})
+
+
+def test_evicts_least_recently_used_past_max_bytes():
+    size = nbytes(frame(100))
+    memo = LapMemo(max_bytes=2 * size)
+    for key in "abc":
+        memo.get(key, lambda: frame(100))
+    # a was evicted to make room for c
+    assert list(memo._entries) == ["b", "c"]
+    assert memo.stats() == {"hits": 0, "misses": 3, "evictions": 1,
+                            "entries": 2, "bytes": 2 * size}
+
+    memo.get("b", lambda: frame(100))      # b is now the most recent: c goes next
+    memo.get("d", lambda: frame(100))
+    assert list(memo._entries) == ["b", "d"]
+    assert memo.stats()["hits"] == 1 and memo.stats()["evictions"] == 2
+
+
+def test_value_larger_than_the_memo_is_not_kept():
+    memo = LapMemo(max_bytes=nbytes(frame(100)))
+    memo.get("small", lambda: frame(10))
+    assert len(memo.get("big", lambda: frame(1000))) == 1000
+    assert memo.stats()["entries"] == 1 and memo.stats()["evictions"] == 0
+
+
+def test_telemetry_plots_share_lap_telemetry(workdir, monkeypatch):
+    sess = make_session("Q", n_drivers=4, n_laps=3)
+    builds = []
+    get_telemetry = type(viz.fastest_lap(sess, "NOR")).get_telemetry
+
+    def counting(lap, *args, **kwargs):
+        builds.append(lap["Driver"])
+        return get_telemetry(lap, *args, **kwargs)
+
+    monkeypatch.setattr(type(viz.fastest_lap(sess, "NOR")), "get_telemetry", counting)
+    drivers = list(sess.laps["Driver"].unique()[:2])
+    viz.telemetry_comparison(sess, *drivers, "telemetry.png")
+    viz.track_domination(sess, *drivers, "track_domination.png")
+    assert sorted(builds) == sorted(drivers)
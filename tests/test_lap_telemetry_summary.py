@@ -0,0 +1,31 @@
+# tests/test_lap_telemetry_summary.py
+"""
+The vectorised lap telemetry summary gives what ``Lap.get_telemetry()``
+gives lap by lap.
+"""
+import pytest
+
+from synthetic_session import make_session
+
+import visualization as viz
+
+
+@pytest.mark.parametrize("code", ["R", "Q"])
+def test_summary_matches_get_telemetry(code):
+    sess = make_session(code, n_drivers=4, n_laps=8)
+    summary = viz.lap_telemetry_summary(sess)
+
+    compared = 0
+    for label, lap in sess.laps.iterlaps():
+        tel = lap.get_telemetry()
+        if tel.empty:
+            assert label not in summary.index
+            continue
+        row = summary.loc[label]
+        assert row["MaxSpeed"] == pytest.approx(tel["Speed"].max())
+        assert row["MeanSpeed"] == pytest.approx(tel["Speed"].mean())
+        assert row["DRSAtMax"] == tel.at[tel["Speed"].idxmax(), "DRS"]
+        assert row["Samples"] == len(tel)
+        assert row["Distance"] == pytest.approx(tel.add_distance()["Distance"].iloc[-1])
+        compared += 1
+    assert compared == len(summary) == 32
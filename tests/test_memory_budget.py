@@ -0,0 +1,69 @@
+# tests/test_memory_budget.py
+import gc
+import weakref
+
+from synthetic_session import make_session
+
+import readme_machine as rm
+import visualization as viz
+from memory_budget import release_telemetry
+
+
+def telemetry_refs(sess):
+    """Weak references to the session's telemetry and what the plots derive from it."""
+    lap = viz.fastest_lap(sess, "NOR")
+    return [weakref.ref(obj) for obj in (
+        sess.car_data["4"], sess.pos_data["4"],
+        viz.lap_telemetry(sess, lap),
+        viz.lap_telemetry_summary(sess))]
+
+
+def test_release_telemetry_frees_derived_objects():
+    sess = make_session("Q", n_drivers=4, n_laps=3)
+    refs = telemetry_refs(sess)
+    release_telemetry(sess)
+    gc.collect()
+    assert [ref() for ref in refs] == [None] * len(refs)
+    assert viz.lap_memo(sess).stats()["entries"] == 0
+    assert len(sess.laps)                      # laps stay
+
+
+def test_low_memory_render_frees_telemetry(workdir):
+    sess = make_session("Q", n_drivers=4, n_laps=3)
+    refs = telemetry_refs(sess)
+    tag = "QUALIFYING"
+    _, images, stats = rm.render_plots(sess, "2025_Synthetic_Grand_Prix", tag,
+                                       rm.planned_plots(tag), {"session": tag, "plots": []},
+                                       low_memory=True)
+    assert images
+    gc.collect()
+    assert [ref() for ref in refs] == [None] * len(refs)
+
+
+class Source:
+    def get_session(self, year, event_name, code):
+        sess = make_session(code, n_drivers=4, n_laps=4)
+        sess.load = lambda **kwargs: None
+        return sess
+
+
+def test_low_memory_load_compacts_before_ingest(workdir):
+    tag = "RACE"
+    stats, names = rm._start_session(tag, None)
+    sess = rm.load_session(2025, "Synthetic Grand Prix", tag, "R", names, stats,
+                           source=Source(), low_memory=True)
+    assert "ingest" in stats
+    table = viz.stint_table(sess)
+    assert table.laps["Driver"].dtype == "category"
+    assert table.stints["Compound"].dtype == "category"
+
+
+def test_prefetch_reports_no_per_session_peak(workdir, monkeypatch):
+    resets = []
+    monkeypatch.setattr(rm, "reset_peak_rss", lambda: resets.append(1))
+    jobs = [(2025, "Synthetic Grand Prix", "2025_Synthetic_Grand_Prix", tag, code, 1, False,
+             None, None, Source(), True) for tag, code in (("FP1", "FP1"), ("FP2", "FP2"))]
+    results = rm.render_pipelined(jobs, max_loaded=2)
+    assert all(images for _, images, _ in results)
+    assert resets == []
+    assert all("peak_rss_mb" not in stats for _, _, stats in results)
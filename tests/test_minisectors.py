@@ -0,0 +1,28 @@
+# tests/test_minisectors.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import visualization as viz
+
+
+def lap(distance, speed):
+    return pd.DataFrame({"Distance": np.asarray(distance, float),
+                         "Speed": np.asarray(speed, float)})
+
+
+def test_fastest_driver_wins_each_minisector():
+    dist = np.linspace(0, 1000, 101)
+    result = viz.minisectors({"AAA": lap(dist, np.where(dist < 500, 300, 200)),
+                              "BBB": lap(dist, np.full_like(dist, 250))}, 2)
+    assert list(result.winner) == [0, 1]
+    assert list(result.index([0, 499, 500, 1000])) == [0, 0, 1, 1]
+
+
+@pytest.mark.parametrize("telemetry", [
+    {"AAA": lap([0, 0, 0], [100, 120, 110]), "BBB": lap([0, 0], [90, 95])},
+    {"AAA": lap([], []), "BBB": lap([np.nan], [np.nan])},
+])
+def test_laps_without_distance_raise(telemetry):
+    with pytest.raises(ValueError, match="no distance"):
+        viz.minisectors(telemetry)
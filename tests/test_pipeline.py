@@ -0,0 +1,50 @@
+# tests/test_pipeline.py
+import gc
+import weakref
+
+from synthetic_session import make_session
+
+import readme_machine as rm
+
+JOBS = [(2025, "Synthetic Grand Prix", "2025_Synthetic_Grand_Prix", tag, code)
+        for tag, code in (("FP1", "FP1"), ("QUALIFYING", "Q"), ("RACE", "R"), ("FP2", "FP2"))]
+
+
+class CountingSource:
+    """Serves synthetic sessions and tracks how many of them are alive."""
+
+    def __init__(self):
+        self.live = weakref.WeakSet()
+        self.peak = 0
+
+    def count(self):
+        gc.collect()
+        self.peak = max(self.peak, len(self.live))
+
+    def get_session(self, year, event_name, code):
+        self.count()
+        sess = make_session(code, n_drivers=4, n_laps=4, sc_periods=[(2, 2)] if code == "R" else ())
+        sess.load = lambda **kwargs: None
+        self.live.add(sess)
+        return sess
+
+
+def test_render_pipelined_bounds_loaded_sessions(workdir, monkeypatch):
+    source = CountingSource()
+    render_plots = rm.render_plots
+
+    def counting_render_plots(*args, **kwargs):
+        source.count()
+        result = render_plots(*args, **kwargs)
+        source.count()
+        return result
+
+    monkeypatch.setattr(rm, "render_plots", counting_render_plots)
+    results = rm.render_pipelined([job + (1, False, None, None, source) for job in JOBS],
+                                  max_loaded=2)
+
+    assert [tag for tag, _, _ in results] == [job[3] for job in JOBS]
+    assert all(images for _, images, _ in results)
+    assert source.peak <= 2
+    source.count()
+    assert len(source.live) == 0
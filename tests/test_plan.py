@@ -0,0 +1,45 @@
+# tests/test_plan.py
+"""
+``readme_machine --plan`` works from local files alone: with the network
+blocked it still reports the event and every plot, and what it cannot tell
+it reports as unknown instead of failing.
+"""
+import socket
+import time
+
+import pytest
+
+import readme_machine as rm
+from availability import save_schedule
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise OSError("network access in an offline test")
+
+    monkeypatch.setattr(socket.socket, "connect", refuse)
+    monkeypatch.setattr(socket, "create_connection", refuse)
+
+
+def test_plan_from_cached_schedule(workdir, offline, capsys):
+    year = time.gmtime().tm_year
+    save_schedule(year, [
+        {"EventName": "Past Grand Prix", "EventFormat": "conventional",
+         "LastSessionUtc": f"{year - 1}-06-01T14:00:00+00:00"},
+        {"EventName": "Future Grand Prix", "EventFormat": "conventional",
+         "LastSessionUtc": f"{year + 1}-06-01T14:00:00+00:00"},
+    ])
+    rm.plan()
+    out = capsys.readouterr().out
+    assert f"=== {year} Past Grand Prix" in out
+    assert "Future" not in out
+    assert "unknown" not in out
+    for tag, _ in rm.weekend_sessions(False):
+        for name in rm.planned_plots(tag):
+            assert name in out
+
+
+def test_plan_without_schedule(workdir, offline, capsys):
+    rm.plan()
+    assert "Event: unknown" in capsys.readouterr().out
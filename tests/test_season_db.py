@@ -0,0 +1,59 @@
+# tests/test_season_db.py
+"""
+Ingesting sessions into the season database and querying it back.
+"""
+import sqlite3
+
+import pytest
+
+from synthetic_session import make_session
+
+import season_db
+import visualization as viz
+
+
+@pytest.fixture(scope="module")
+def race():
+    return make_session("R", n_drivers=4, n_laps=8)
+
+
+def test_ingest_and_query(race, tmp_path):
+    db = str(tmp_path / "season.sqlite")
+    assert season_db.ingest_session(race, 2025, "Synthetic Grand Prix", "R", db)
+    assert not season_db.ingest_session(race, 2025, "Synthetic Grand Prix", "R", db)
+
+    laps = season_db.query("SELECT * FROM laps", path=db)
+    assert len(laps) == race.laps["LapNumber"].notna().sum()
+    stints = season_db.query("SELECT * FROM stints", path=db)
+    assert len(stints) == len(viz.stint_table(race).stints)
+
+    speeds = season_db.top_speeds(2025, "R", db)
+    assert list(speeds.columns) == ["round", "event", "team", "speed_trap_max"]
+    traps = race.laps[["SpeedI1", "SpeedI2", "SpeedFL", "SpeedST"]].max(axis=1)
+    assert speeds["speed_trap_max"].max() == pytest.approx(traps.max())
+
+
+def test_stints_keep_fresh_and_used_sets(tmp_path):
+    # the same stint and compound on a fresh and on a used set are two rows
+    db = str(tmp_path / "season.sqlite")
+    conn = season_db.connect(db)
+    with conn:
+        for fresh in (1, 0):
+            conn.execute("INSERT INTO stints VALUES (2025, 'E', 'R', 'AAA', 1, 'SOFT', ?, 1, 5, 5)",
+                         (fresh,))
+    conn.close()
+    assert len(season_db.query("SELECT * FROM stints", path=db)) == 2
+
+
+def test_old_schema_is_rebuilt(race, tmp_path):
+    db = str(tmp_path / "season.sqlite")
+    conn = sqlite3.connect(db)
+    conn.executescript(season_db._SCHEMA.replace("speed_trap_max", "top_speed    "))
+    conn.execute("INSERT INTO sessions VALUES (2025, 'Synthetic Grand Prix', 'R', 1, NULL, "
+                 "'old', 0)")
+    conn.commit()
+    conn.close()
+
+    assert season_db.ingest_session(race, 2025, "Synthetic Grand Prix", "R", db)
+    columns = season_db.query("PRAGMA table_info(laps)", path=db)["name"]
+    assert "speed_trap_max" in set(columns) and "top_speed" not in set(columns)
@@ -0,0 +1,57 @@
+# tests/test_session_lifetime.py
+"""
+What visualization caches per session must not keep the session alive:
+the caches are keyed weakly by the session, so a cached value that refers
+back to it (a ``Laps``, ``Lap`` or ``Telemetry`` holds ``.session``) would
+pin it, and everything it loaded, for the rest of the process.
+"""
+import gc
+import weakref
+
+import pandas as pd
+
+from synthetic_session import make_session
+
+import visualization as viz
+
+
+def assert_collected(ref):
+    gc.collect()
+    assert ref() is None, "the session is still referenced"
+
+
+def test_lap_telemetry_summary_releases_session():
+    sess = make_session("Q", n_drivers=4, n_laps=3)
+    summary = viz.lap_telemetry_summary(sess)
+    assert len(summary)
+    ref = weakref.ref(sess)
+    del sess
+    assert_collected(ref)
+
+
+def test_stint_table_releases_session():
+    sess = make_session("R", n_drivers=4, n_laps=6)
+    table = viz.stint_table(sess)
+    assert type(table.stints) is pd.DataFrame and type(table.laps) is pd.DataFrame
+    ref = weakref.ref(sess)
+    del sess
+    assert_collected(ref)
+
+
+def render(sess, tag):
+    import readme_machine as rm
+
+    names = rm.planned_plots(tag)
+    _, images, stats = rm.render_plots(sess, "2025_Synthetic_Grand_Prix", tag, names,
+                                       {"session": tag, "plots": []})
+    assert images
+    return stats
+
+
+def test_render_releases_session(workdir):
+    sess = make_session("Q", n_drivers=4, n_laps=3)
+    stats = render(sess, "QUALIFYING")
+    assert stats["lap_memo"]["hits"]      # the memo was used, and holds entries
+    ref = weakref.ref(sess)
+    del sess
+    assert_collected(ref)
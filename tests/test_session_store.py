@@ -0,0 +1,38 @@
+# tests/test_session_store.py
+import pandas as pd
+import pytest
+
+from synthetic_session import make_session
+
+from session_store import open_session, store_session, stored_parts
+
+PARTS = {"laps", "telemetry", "messages"}
+
+
+@pytest.fixture(scope="module")
+def race():
+    return make_session("R", n_drivers=4, n_laps=5, sc_periods=[(2, 3)])
+
+
+def test_round_trip(race, tmp_path):
+    folder = str(tmp_path / "R")
+    store_session(race, folder, PARTS)
+    assert stored_parts(folder) == PARTS
+
+    sess = open_session(folder)
+    pd.testing.assert_frame_equal(pd.DataFrame(sess.laps), pd.DataFrame(race.laps))
+    pd.testing.assert_frame_equal(pd.DataFrame(sess.results), pd.DataFrame(race.results))
+    pd.testing.assert_frame_equal(sess.track_status, race.track_status)
+    assert sorted(sess.car_data) == sorted(race.car_data)
+    for drv in race.car_data:
+        pd.testing.assert_frame_equal(pd.DataFrame(sess.car_data[drv]),
+                                      pd.DataFrame(race.car_data[drv]))
+        pd.testing.assert_frame_equal(pd.DataFrame(sess.pos_data[drv]),
+                                      pd.DataFrame(race.pos_data[drv]))
+
+
+def test_unfinished_session_is_not_reused(race, tmp_path, monkeypatch):
+    folder = str(tmp_path / "R")
+    monkeypatch.setattr(race, "_session_status", race.session_status.iloc[:1])   # Started
+    store_session(race, folder, PARTS)
+    assert stored_parts(folder) is None
@@ -0,0 +1,55 @@
+# tests/test_styles.py
+"""
+Every plot draws in the rcParams it had in a weekend run before plots were
+styled per figure, when each one restyled matplotlib globally and the
+next inherited it (FP1, FP2, FP3, qualifying, race, in that order).
+"""
+import inspect
+
+import matplotlib as mpl
+import pytest
+from synthetic_session import make_session
+
+import readme_machine as rm
+import visualization as viz
+
+KEYS = ("axes.facecolor", "figure.facecolor", "text.color", "grid.color",
+        "axes.titlesize", "font.weight", "legend.fancybox")
+
+SEABORN_DARK = ("#EAEAF2", "#202020", ".15", "white", "large", "normal", True)
+DARK = ("#202020", "#202020", ".15", "#444444", "large", "normal", True)
+FASTF1 = ("#1e1c1b", "#292625", "#F1F1F3", "#444444", 19.0, "medium", False)
+DARK_FASTF1 = ("#202020", "#202020", ".15", "#444444", 19.0, "medium", False)
+SEABORN_DARK_FASTF1 = ("#EAEAF2", "#202020", ".15", "white", 19.0, "medium", False)
+
+EXPECTED = {
+    "FP1": {"sector_gap": SEABORN_DARK, "top_speed_comparison": DARK,
+            "plot_top_speed_heatmap": DARK, "aero_performance": DARK},
+    "QUALIFYING": {"quali_result": DARK, "telemetry_comparison": FASTF1,
+                   "track_domination": FASTF1, "sector_gap": SEABORN_DARK_FASTF1,
+                   "top_speed_comparison": DARK_FASTF1, "aero_performance": DARK_FASTF1},
+    "RACE": {"pos_change": DARK_FASTF1, "tyre_strategy": DARK_FASTF1,
+             "team_pace": DARK_FASTF1,
+             "tyre_deg": ("black", "black", "white", "white", 19.0, "medium", False)},
+}
+
+
+@pytest.mark.parametrize("tag,code", [("FP1", "FP1"), ("QUALIFYING", "Q"), ("RACE", "R")])
+def test_plot_styles_match_weekend_run(tag, code, tmp_path, monkeypatch):
+    seen = {}
+    subplots = viz._subplots
+
+    def recording_subplots(*args, **kwargs):
+        callers = {frame.function for frame in inspect.stack(0)}
+        plot = next(name for name in EXPECTED[tag] if name in callers)
+        seen[plot] = tuple(mpl.rcParams[key] for key in KEYS)
+        return subplots(*args, **kwargs)
+
+    monkeypatch.setattr(viz, "_subplots", recording_subplots)
+    sess = make_session(code, n_laps=3, sc_periods=[(2, 2)] if code == "R" else ())
+    d1, d2 = rm.get_top_two_drivers(sess)
+    for name in EXPECTED[tag]:
+        args = (d1, d2) if rm.compares_drivers(name) else ()
+        getattr(viz, name)(sess, *args, str(tmp_path / f"{name}.png"))
+
+    assert seen == EXPECTED[tag]
@@ -0,0 +1,61 @@
+# tests/test_watch.py
+"""
+``readme_machine.watch`` on a stub source: a session whose data is out but
+cannot be rendered is retried with a growing wait and given up after
+``max_attempts``.
+"""
+import os
+import shutil
+
+import pytest
+
+from stub_source import StubSource
+
+import readme_machine as rm
+from manifest import failure, load_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FOLDER = os.path.join("visualization", "2025_Synthetic_Grand_Prix", "FP1")
+
+
+class FailingSource(StubSource):
+    """Only FP1 is ever published, and its first ``failures`` loads fail."""
+
+    def __init__(self, failures):
+        super().__init__(gap=1e9, n_drivers=4, n_laps=3)
+        self.failures = failures
+        self.loads = []
+
+    def get_session(self, year, event_name, code):
+        self.loads.append(self.clock)
+        if len(self.loads) <= self.failures:
+            raise RuntimeError("broken session")
+        return super().get_session(year, event_name, code)
+
+
+@pytest.fixture
+def readme(workdir):
+    shutil.copy(os.path.join(ROOT, "README.md"), workdir)
+
+
+def watch(source, **kwargs):
+    rm.watch(600, 3 * 3600, 2.0, source=source, sleep=source.sleep, polls=30, **kwargs)
+
+
+def test_watch_gives_up_on_a_failing_session(readme):
+    source = FailingSource(failures=100)
+    watch(source, max_attempts=3)
+
+    assert len(source.loads) == 3
+    first, second, third = source.loads
+    assert second - first >= 600 and third - second >= 1200
+    assert failure(load_manifest(FOLDER))["attempts"] == 3
+
+
+def test_watch_retries_until_a_session_renders(readme):
+    source = FailingSource(failures=2)
+    watch(source, max_attempts=5)
+
+    assert len(source.loads) == 3
+    manifest = load_manifest(FOLDER)
+    assert failure(manifest) is None and manifest
@@ -7,37 +7,33 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib as mpl
-import matplotlib.pyplot as plt
 from matplotlib import colormaps
-from matplotlib.collections import LineCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.lines import Line2D
-import fastf1 as ff1
 import fastf1.plotting 
 from fastf1.plotting import get_compound_color
 from fastf1.core import Laps
 from timple.timedelta import strftimedelta
-import logging, warnings
 from matplotlib.patches import Patch
 import os
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import NamedTuple
+from instrumentation import mark as mark_stage
+from image_output import output_dpi, write_figure
+from lap_memo import LapMemo
 
 
 
 # In[2]:
 
 
-# ── silence FastF1 INFO/DEBUG messages ───────────────────────────────────
-logging.getLogger('fastf1').setLevel(logging.WARNING)   # or logging.ERROR
-
-# ── hide matplotlib / pandas FutureWarnings etc. ─────────────────────────
-warnings.filterwarnings("ignore", category=FutureWarning)
-warnings.filterwarnings("ignore", category=UserWarning)   # optional
-
-
-# In[3]:
-
-
-# Use the cache folder in the repo root
-ff1.Cache.enable_cache("cache")
+# Logging, warnings and FastF1's cache are process-wide settings; the
+# program that draws the plots sets them up (see readme_machine.configure),
+# importing this module changes nothing.
 
 # In[5]:
 
@@ -67,125 +63,484 @@ helmet_colors = {
 }
 
 
-# In[6]:
+# In[5b]:
+
+
+# ── figure construction ───────────────────────────────────────────────────
+# Plots build plain ``Figure`` objects on their own Agg canvas; pyplot and its
+# global figure manager are never involved, so several plots can render in
+# a thread pool.
+#
+# Artists pick up rcParams when they are created, so every plot draws inside
+# ``_figure_style`` which starts from matplotlib's defaults, applies the
+# plot's own style and restores everything afterwards. The lock keeps two
+# threads from swapping styles under each other; data prep and savefig
+# (the expensive draw + PNG encode) run outside it.
+_STYLE_LOCK = threading.RLock()
+
+# rcParams of fastf1.plotting.setup_mpl(color_scheme='fastf1'), which the
+# plots used to apply globally; pinned so the look does not move with FastF1
+_FASTF1_SCHEME = {
+    'axes.axisbelow':   True,
+    'axes.edgecolor':   '#2d2928',
+    'axes.facecolor':   '#1e1c1b',
+    'axes.labelcolor':  '#F1f2f3',
+    'axes.prop_cycle':  mpl.cycler(color=['#FF79C6', '#50FA7B', '#8BE9FD', '#BD93F9',
+                                          '#FFB86C', '#FF5555', '#F1FA8C']),
+    'axes.titlepad':    12.0,
+    'axes.titlesize':   19.0,
+    'axes.titleweight': 'light',
+    'figure.facecolor': '#292625',
+    'font.weight':      'medium',
+    'legend.edgecolor': (0.1, 0.1, 0.1, 0.9),
+    'legend.facecolor': (0.1, 0.1, 0.1, 0.7),
+    'legend.fancybox':  False,
+    'text.color':       '#F1F1F3',
+    'xtick.color':      '#f1f2f3',
+    'ytick.color':      '#f1f2f3',
+}
+
+# The looks each plot had in a normal weekend run, back when every plot
+# restyled matplotlib globally and inherited whatever ran before it.
+_DARK = sns.axes_style("dark", {'axes.facecolor': '#202020',
+                                'figure.facecolor': '#202020',
+                                'grid.color': '#444444',
+                                'grid.linestyle': '--'})
+_STYLE_SECTOR_GAP = (sns.axes_style("dark"), {'figure.facecolor': '#202020'})
+_STYLE_DARK       = (_DARK,)
+_STYLE_QUALI_MAP  = (_DARK, _FASTF1_SCHEME)
+_STYLE_RACE       = (_FASTF1_SCHEME, _DARK)
+_STYLE_TYRE_DEG   = _STYLE_RACE + ("dark_background",)
+
+def _session_style(session, styles):
+    """
+    *styles* as they looked for *session*: in qualifying, the lap plots ran
+    after telemetry_comparison and kept the title, font and legend settings
+    of its FastF1 scheme.
+
+    This is not a design choice. It reproduces the order-dependent rcParams
+    leak on purpose, so that the images stay pixel-identical to what a
+    weekend run produced before plots scoped their styles. Restyling these
+    plots means giving each one a single explicit style and bumping its
+    version in plot_registry.
+    """
+    if "Qualifying" in str(getattr(session, "name", "")):
+        return (_FASTF1_SCHEME, *styles)
+    return styles
+
+@contextmanager
+def _figure_style(*styles):
+    """Scope rcParams for building one figure: defaults + *styles*."""
+    mark_stage("render")
+    with _STYLE_LOCK, mpl.rc_context():
+        mpl.style.use(["default", *styles])
+        yield
+
+def _save(fig, save_path):
+    # encoding, DPI and size budget are set in image_output.py
+    mark_stage("save")
+    write_figure(fig, save_path)
+
+def _subplots(nrows=1, ncols=1, *, sharex=False, sharey=False,
+              subplot_kw=None, gridspec_kw=None, **fig_kw):
+    """``plt.subplots`` without pyplot: a Figure on its own Agg canvas."""
+    fig = Figure(**fig_kw)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, sharex=sharex, sharey=sharey,
+                        subplot_kw=subplot_kw, gridspec_kw=gridspec_kw)
+    return fig, axes
 
 
-# helpers
-def _lap_filter_sc(row: pd.Series) -> bool:
-    return "4" in row["TrackStatus"]          # SC
+# In[6]:
 
-def _lap_filter_vsc(row: pd.Series) -> bool:
-    st = row["TrackStatus"]
-    return (("6" in st) or ("7" in st)) and ("4" not in st)   # VSC but not SC
 
+# helpers
 def find_sc_laps(df_laps: pd.DataFrame):
-    sc = df_laps[df_laps.apply(_lap_filter_sc, axis=1)]["LapNumber"].unique()
-    vsc = df_laps[df_laps.apply(_lap_filter_vsc, axis=1)]["LapNumber"].unique()
-    return np.sort(sc), np.sort(vsc)
-
-def shade_periods(ax, sc_laps, vsc_laps,
+    """Sorted lap numbers run (partly) under SC, and under VSC but not SC."""
+    # a race has thousands of laps but only a handful of distinct status
+    # strings, so test each distinct string once and broadcast the answer
+    codes, statuses = pd.factorize(df_laps["TrackStatus"].astype(str))
+    sc_status = np.array(["4" in st for st in statuses], dtype=bool)
+    vsc_status = np.array([("6" in st or "7" in st) and "4" not in st
+                           for st in statuses], dtype=bool)
+    lap_numbers = df_laps["LapNumber"].to_numpy()
+    sc = np.unique(lap_numbers[sc_status[codes]])
+    vsc = np.unique(lap_numbers[vsc_status[codes]])
+    return sc, vsc
+
+def _lap_runs(laps) -> np.ndarray:
+    """Merge sorted lap numbers into ``(n, 2)`` [first, last] runs of consecutive laps."""
+    laps = np.asarray(laps, dtype=int)
+    if len(laps) == 0:
+        return np.empty((0, 2), dtype=int)
+    breaks = np.flatnonzero(np.diff(laps) > 1)
+    return np.column_stack([np.r_[laps[0], laps[breaks + 1]],
+                            np.r_[laps[breaks], laps[-1]]])
+
+def shade_periods(ax, sc_intervals, vsc_intervals,
                   color="orange", alpha=0.45, hatch_vsc='-'):
-    """Shade SC (solid) and VSC (hatched) lap ranges on *ax*."""
-    def _shade(ax_, laps, label, hatch=None):
-        if len(laps) == 0:
-            return
-        laps = np.asarray(laps, int)
-        starts = np.insert(laps[np.diff(np.insert(laps, 0, laps[0]-2)) > 1],
-                           0, laps[0])
-        ends   = np.append(starts[1:]-1, laps[-1])
-        for i, (s, e) in enumerate(zip(starts, ends)):
+    """Shade SC (solid) and VSC (hatched) [first, last] lap runs on *ax*."""
+    def _shade(ax_, runs, label, hatch=None):
+        for i, (s, e) in enumerate(runs):
             ax_.axvspan(s-1, e, color=color, alpha=alpha,
                         hatch=hatch, label=label if i == 0 else "_")
-    _shade(ax, sc_laps,  "SC")                      # solid
-    _shade(ax, vsc_laps, "VSC", hatch=hatch_vsc)    # hatched
+    _shade(ax, sc_intervals,  "SC")                      # solid
+    _shade(ax, vsc_intervals, "VSC", hatch=hatch_vsc)    # hatched
+
+
+# ── per-session tables ─────────────────────────────────────────────────────
+# Several plots derive the same data from one session; keep it around for as
+# long as the session object itself is alive.
+_SESSION_TABLES = weakref.WeakKeyDictionary()
+_SESSION_TABLES_LOCK = threading.Lock()
+
+def _session_table(session, name, build):
+    """Return ``build(session)``, built once per session even across threads."""
+    with _SESSION_TABLES_LOCK:
+        tables = _SESSION_TABLES.setdefault(session, {})
+        lock = tables.setdefault(("lock", name), threading.Lock())
+    with lock:
+        if name not in tables:
+            tables[name] = build(session)
+        return tables[name]
+
+def drop_session_tables(session, *names):
+    """Forget the tables *names* built for *session*; they are rebuilt when next asked for."""
+    with _SESSION_TABLES_LOCK:
+        tables = _SESSION_TABLES.get(session, {})
+        for name in names:
+            tables.pop(name, None)
+
+def _status_runs(times, on, end) -> np.ndarray:
+    """``(n, 2)`` [start, end) times of runs of status changes flagged *on*.
+
+    Every status change holds until the next one; the last holds until *end*.
+    """
+    edges = np.diff(np.r_[0, on.astype(np.int8), 0])
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    until = np.r_[times[1:], np.array([end], dtype=times.dtype)]
+    return np.column_stack([times[starts], until[stops - 1]])
+
+class TrackStatusIndex(NamedTuple):
+    """SC / VSC periods of a session, by lap and by session time."""
+    sc_laps: np.ndarray        # lap numbers run (partly) under SC
+    vsc_laps: np.ndarray       # lap numbers under VSC but not SC
+    sc_intervals: np.ndarray   # (n, 2) merged [first, last] SC lap runs
+    vsc_intervals: np.ndarray
+    sc_times: np.ndarray       # (n, 2) [start, end) session times, timedelta64[ns]
+    vsc_times: np.ndarray
+
+def _build_track_status_index(session) -> TrackStatusIndex:
+    laps = session.laps
+    sc_laps, vsc_laps = find_sc_laps(laps)
+
+    no_times = np.empty((0, 2), dtype="timedelta64[ns]")
+    sc_times = vsc_times = no_times
+    try:
+        status = session.track_status
+    except Exception:
+        status = None
+    if status is not None and len(status):
+        times = status["Time"].to_numpy("timedelta64[ns]")
+        codes = status["Status"].astype(str).to_numpy()
+        end = max(times[-1], laps["Time"].max().to_timedelta64()) \
+            if laps["Time"].notna().any() else times[-1]
+        sc_times = _status_runs(times, codes == "4", end)
+        vsc_times = _status_runs(times, np.isin(codes, ["6", "7"]), end)
+
+    return TrackStatusIndex(sc_laps, vsc_laps, _lap_runs(sc_laps), _lap_runs(vsc_laps),
+                            sc_times, vsc_times)
+
+def track_status_index(session) -> TrackStatusIndex:
+    """The session's SC / VSC periods, built once and shared between plots."""
+    return _session_table(session, "track_status", _build_track_status_index)
+
+_LAP_SUMMARY_COLUMNS = ["Driver", "Team", "LapNumber", "LapTime",
+                        "MaxSpeed", "MeanSpeed", "DRSAtMax",
+                        "Distance", "Samples"]
+
+def _build_lap_telemetry_summary(session) -> pd.DataFrame:
+    """
+    Vectorised engine behind :func:`lap_telemetry_summary`.
+
+    Takes each driver's car data once and assigns every sample to its lap with
+    a sorted-interval lookup on the lap start/end times, instead of calling
+    ``get_telemetry()`` (a pos/car merge) per lap. Like ``get_telemetry()``,
+    speed is also interpolated at the exact lap start/end and at the
+    position-data timestamps, so the numbers match the merged telemetry.
+    """
+    laps = session.laps
+    timed = laps[laps['LapStartTime'].notna() & laps['Time'].notna()]
+    try:
+        pos_data = session.pos_data
+    except Exception:
+        pos_data = {}
+
+    parts = []
+    for drv_no, drv_laps in timed.groupby('DriverNumber', sort=False):
+        car = session.car_data.get(drv_no)
+        if car is None or car.empty:
+            continue
+        drv_laps = drv_laps.sort_values('LapStartTime')
+        labels = drv_laps.index.to_numpy()
+        starts = drv_laps['LapStartTime'].to_numpy('timedelta64[ns]').astype(np.int64)
+        ends   = drv_laps['Time'].to_numpy('timedelta64[ns]').astype(np.int64)
+
+        t     = car['SessionTime'].to_numpy('timedelta64[ns]').astype(np.int64)
+        speed = car['Speed'].to_numpy(dtype=float)
+        drs   = car['DRS'].to_numpy()
+
+        # lap that started last before each sample; keep it if the lap
+        # hadn't ended yet
+        pos = np.searchsorted(starts, t, side='right') - 1
+        inside = (pos >= 0) & (t <= ends[pos.clip(0)])
+
+        # extra timestamps get_telemetry() would hold: the exact lap
+        # boundaries plus the position-data samples inside each lap
+        extra_t = np.concatenate([starts, ends])
+        extra_lap = np.concatenate([labels, labels])
+        pos_tel = pos_data.get(drv_no)
+        if pos_tel is not None and not pos_tel.empty:
+            pt = pos_tel['SessionTime'].to_numpy('timedelta64[ns]').astype(np.int64)
+            ppos = np.searchsorted(starts, pt, side='right') - 1
+            pin = (ppos >= 0) & (pt <= ends[ppos.clip(0)])
+            extra_t = np.concatenate([extra_t, pt[pin]])
+            extra_lap = np.concatenate([extra_lap, labels[ppos[pin]]])
+
+        # interpolate speed there; DRS is a discrete channel -> ffill
+        prev = np.searchsorted(t, extra_t, side='right') - 1
+        parts.append(pd.DataFrame({
+            'Lap':   np.concatenate([labels[pos[inside]], extra_lap]),
+            'T':     np.concatenate([t[inside], extra_t]),
+            'Speed': np.concatenate([speed[inside], np.interp(extra_t, t, speed)]),
+            'DRS':   np.concatenate([drs[inside], drs[prev.clip(0)]]),
+            'Car':   np.r_[np.ones(inside.sum(), bool), np.zeros(len(extra_t), bool)],
+        }))
+
+    cols = _LAP_SUMMARY_COLUMNS
+    if not parts:
+        return pd.DataFrame(columns=cols)
+
+    # a boundary or position sample at the time of a car sample is not added
+    # again by get_telemetry(): the car sample (first in each part) stays
+    samples = (pd.concat(parts, ignore_index=True)
+                 .sort_values(['Lap', 'T'], kind='stable')
+                 .drop_duplicates(['Lap', 'T'], ignore_index=True))
+    # distance travelled since the previous sample of the same lap
+    same_lap = np.r_[False, samples['Lap'].to_numpy()[1:] == samples['Lap'].to_numpy()[:-1]]
+    step = np.r_[0.0, np.diff(samples['T'].to_numpy())] / 1e9 * samples['Speed'].to_numpy() / 3.6
+    samples['Step'] = np.where(same_lap, step, 0.0)
+
+    g = samples.groupby('Lap', sort=False)
+    agg = pd.DataFrame({
+        'MaxSpeed':  g['Speed'].max(),
+        'MeanSpeed': g['Speed'].mean(),
+        'Distance':  g['Step'].sum(),
+        'Samples':   g['Car'].size(),
+    })
+    agg['DRSAtMax'] = samples['DRS'].to_numpy()[g['Speed'].idxmax().reindex(agg.index).to_numpy()]
+    agg = agg[g['Car'].any()]
+
+    # a plain frame: a Laps would hold on to the session it is cached for
+    summary = pd.DataFrame(laps[['Driver', 'Team', 'LapNumber', 'LapTime']]).join(agg, how='inner')
+    return summary[cols]
+
+def lap_telemetry_summary(session, laps=None) -> pd.DataFrame:
+    """
+    Per-lap telemetry summary (max/mean speed, DRS at max speed, distance,
+    sample count), indexed like ``session.laps``.
+
+    Built once per session from the raw car data and cached, so the speed
+    plots share it. Laps without telemetry are left out of the result.
+    """
+    summary = _session_table(session, "lap_telemetry", _build_lap_telemetry_summary)
+    if laps is None:
+        return summary
+    return summary.loc[laps.index[laps.index.isin(summary.index)]]
+
+class StintTable(NamedTuple):
+    """Stints of a session and the per-lap columns the race plots share."""
+    stints: pd.DataFrame   # one row per Driver/Stint/Compound/FreshTyre:
+                           # StintLength, StartLap, EndLap
+    laps: pd.DataFrame     # indexed like session.laps: Driver, Team, Stint,
+                           # Compound, LapNumber, LapTime_s, TyreAge, Quick
+
+def _build_stint_table(session) -> StintTable:
+    # plain frames: anything derived from a Laps holds on to its session
+    laps = pd.DataFrame(session.laps)
+    keys = ["Driver", "Stint", "Compound", "FreshTyre"]
+
+    stints = (laps.groupby(keys, observed=True)["LapNumber"]
+                  .agg(StintLength="count", StartLap="min", EndLap="max")
+                  .reset_index())
+
+    per_lap = laps[["Driver", "Team", "Stint", "Compound", "LapNumber"]].copy()
+    per_lap["LapTime_s"] = laps["LapTime"].dt.total_seconds()
+    # laps run on this set of tyres in the stint so far, counting the
+    # current one (NaN for laps without a stint)
+    per_lap["TyreAge"] = laps.groupby(["Driver", "Stint"], observed=True).cumcount() + 1
+    # same cut as Laps.pick_quicklaps(): under 107 % of the fastest lap
+    per_lap["Quick"] = laps["LapTime"] < laps["LapTime"].min() * Laps.QUICKLAP_THRESHOLD
+    return StintTable(stints, per_lap)
+
+def stint_table(session) -> StintTable:
+    """The session's stints, tyre ages and quick-lap mask, built once."""
+    return _session_table(session, "stints", _build_stint_table)
+
+def lap_memo(session) -> LapMemo:
+    """The session's memo of fastest laps and lap telemetry (see lap_memo.py)."""
+    return _session_table(session, "lap_memo", lambda _: LapMemo())
+
+def fastest_lap(session, driver):
+    """``session.laps.pick_drivers(driver).pick_fastest()``, looked up once."""
+    # the memo holds the lap's index label: a Lap would keep the session alive
+    def find():
+        lap = session.laps.pick_drivers(driver).pick_fastest()
+        return None if lap is None else lap.name
+    label = lap_memo(session).get(("fastest", driver), find)
+    return None if label is None else session.laps.loc[label]
+
+def lap_telemetry(session, lap):
+    """
+    Car and position data of *lap* merged (``get_telemetry``), with
+    ``Distance``, built once per lap: ``telemetry_comparison`` and
+    ``track_domination`` read the same laps of the same drivers. A plain
+    DataFrame, as a Telemetry would keep the session alive; shared between
+    plots, so read-only.
+    """
+    key = ("telemetry", lap["Driver"], int(lap["LapNumber"]))
+    return lap_memo(session).get(
+        key, lambda: pd.DataFrame(lap.get_telemetry().add_distance()))
+
+
+# ── telemetry decimation ───────────────────────────────────────────────────
+# A trace cannot show more detail than the saved image has pixels, so
+# track_domination thins its track line to that budget before drawing:
+# render time and file size stay flat however many samples come in.
+# telemetry_comparison needs no thinning: align_on_distance resamples its
+# traces onto a 10 m grid, a few hundred points per lap, well under the
+# figure's width in pixels whatever the sample rate.
+
+def pixel_size(fig, ax=None):
+    """Width and height in pixels of *fig* (or of its axes *ax*) as saved."""
+    dpi = output_dpi(fig)
+    width, height = fig.get_figwidth() * dpi, fig.get_figheight() * dpi
+    if ax is not None:
+        box = ax.get_position()
+        width, height = width * box.width, height * box.height
+    return width, height
+
+def decimate_path(xy, px_per_unit, keep=None, spacing=4.0) -> np.ndarray:
+    """
+    Indices of the points of the polyline *xy* ``(n, 2)`` worth drawing at
+    *px_per_unit* pixels per data unit: the first point in every *spacing*
+    pixels of path length, the last point, and the points flagged in *keep*.
+
+    Chords of a few pixels stay well within a pixel of any curve a thick
+    line can show, and fewer, longer segments leave fewer seams.
+    """
+    n = len(xy)
+    if n < 3:
+        return np.arange(n)
+    step = np.hypot(*np.diff(xy, axis=0).T)
+    pixel = np.floor(np.r_[0.0, np.nancumsum(step)] * px_per_unit / spacing)
+    mask = np.r_[True, pixel[1:] != pixel[:-1]]
+    mask[-1] = True
+    if keep is not None:
+        mask |= keep
+    return np.flatnonzero(mask)
 
 
 # In[7]:
 
 
 def tyre_strategy(session, save_path):
-    # gather stint table (incl. FreshTyre) 
-    laps = session.laps
-    stints = (
-        laps[["Driver", "Stint", "Compound", "FreshTyre", "LapNumber"]]
-        .groupby(["Driver", "Stint", "Compound", "FreshTyre"])
-        .count()
-        .reset_index()
-        .rename(columns={"LapNumber": "StintLength"})
-    )
+    stints = stint_table(session).stints
 
     # drop any stints with missing or 'NONE' compound
     stints = stints[stints["Compound"].notna() & (stints["Compound"] != "NONE")]
 
-    # driver order
+    # driver order: one row per driver with stints, top to bottom
     drivers = [session.get_driver(d)["Abbreviation"] for d in session.drivers]
+    with_stints = set(stints["Driver"])
+    rows = {drv: i for i, drv in enumerate(d for d in drivers if d in with_stints)}
+
+    # each stint starts where the driver's previous one ended
+    stints = stints.assign(
+        Left=stints.groupby("Driver", observed=True)["StintLength"].cumsum() - stints["StintLength"],
+        Row=stints["Driver"].map(rows).astype(float),
+        Fresh=stints["FreshTyre"].astype(bool),
+    )
+    stints = stints[stints["Row"].notna()].sort_values("Row", kind="stable")
 
     # find SC / VSC laps
-    sc_laps, vsc_laps = find_sc_laps(laps)
-
-    fig, ax = plt.subplots(figsize=(14, 8), constrained_layout=True)
-    ax.set_title(f"{session.event['EventName']} {session.event.year}  –  Tyre Strategy",
-                 color='white')
-    ax.set_facecolor("#202020")
-    fig.patch.set_facecolor("#202020")
-    ax.invert_yaxis()
-    ax.grid(False)
-
-    shade_periods(ax, sc_laps, vsc_laps)
-
-    for drv in drivers:
-        drv_stints = stints[stints["Driver"] == drv]
-        x0 = 0
-        for _, s in drv_stints.iterrows():
-            comp = s["Compound"]
+    status = track_status_index(session)
+
+    with _figure_style(*_STYLE_RACE):
+        fig, ax = _subplots(figsize=(14, 8), layout="constrained")
+        ax.set_title(f"{session.event['EventName']} {session.event.year}  –  Tyre Strategy",
+                     color='white')
+        ax.set_facecolor("#202020")
+        fig.patch.set_facecolor("#202020")
+        ax.invert_yaxis()
+        ax.grid(False)
+
+        shade_periods(ax, status.sc_intervals, status.vsc_intervals)
+
+        # one collection of stint bars per compound + fresh/used, in the order
+        # they first show up from the top row down
+        groups = {}
+        for (comp, fresh), grp in stints.groupby(["Compound", "Fresh"], sort=False, observed=True):
             try:
                 color = get_compound_color(comp, session=session)
             except Exception:
                 color = "#FFFFFF"
-            ax.barh(
-                drv,
-                s["StintLength"],
-                left=x0,
-                color=color,
-                edgecolor="black",
-                hatch="" if s["FreshTyre"] else "//",
-                label=f"{comp} {'Fresh' if s['FreshTyre'] else 'Used'}"
+            x0 = grp["Left"].to_numpy(float)
+            x1 = x0 + grp["StintLength"].to_numpy(float)
+            y = grp["Row"].to_numpy(float)
+            bars = PolyCollection(
+                np.stack([np.column_stack([x0, y - 0.4]), np.column_stack([x0, y + 0.4]),
+                          np.column_stack([x1, y + 0.4]), np.column_stack([x1, y - 0.4])],
+                         axis=1),
+                facecolors=color, edgecolors="black", hatch="" if fresh else "//",
             )
-            x0 += s["StintLength"]
-            
-    handles, labels = ax.get_legend_handles_labels()
-    uniq = {}
-    for h, l in zip(handles, labels):
-        if l not in uniq and l != "_":
-            uniq[l] = h
-    uniq["SC"]  = Patch(facecolor="orange", alpha=0.45)
-    uniq["VSC"] = Patch(facecolor="orange", alpha=0.45, hatch='-')
-    leg = ax.legend(uniq.values(), uniq.keys(), ncol=5, frameon=False, fontsize=8)
-    for txt in leg.get_texts():
-        txt.set_color("white")
-
-    ax.tick_params(axis='both', colors='white')
-
-    fig.savefig(save_path)
-    plt.close(fig)
+            bars.sticky_edges.x.append(0)
+            ax.add_collection(bars)
+            groups[f"{comp} {'Fresh' if fresh else 'Used'}"] = bars
+        ax.set_yticks(range(len(rows)), labels=list(rows))
+
+        # SC / VSC entries lead when the race had them, as their shading was drawn first
+        legend = {label: None for label, runs in (("SC", status.sc_intervals),
+                                                  ("VSC", status.vsc_intervals)) if len(runs)}
+        legend.update(groups)
+        legend["SC"]  = Patch(facecolor="orange", alpha=0.45)
+        legend["VSC"] = Patch(facecolor="orange", alpha=0.45, hatch='-')
+        leg = ax.legend(legend.values(), legend.keys(), ncol=5, frameon=False, fontsize=8)
+        for txt in leg.get_texts():
+            txt.set_color("white")
+
+        ax.tick_params(axis='both', colors='white')
+
+    _save(fig, save_path)
 
 # In[8]:
 
 
 def sector_gap(session, save_path):
-    laps = session.laps.copy()
+    laps = session.laps
     mask_valid = laps[['Sector1Time', 'Sector2Time', 'Sector3Time']].notna().all(axis=1)
-    laps = laps[mask_valid]
-
-    for sec in (1, 2, 3):
-        laps[f"S{sec}_s"] = laps[f"Sector{sec}Time"].dt.total_seconds()
+    # only the columns used below, not a copy of the whole lap table
+    laps = laps.loc[mask_valid, ['Driver', 'Team']].assign(
+        **{f"S{sec}_s": laps.loc[mask_valid, f"Sector{sec}Time"].dt.total_seconds()
+           for sec in (1, 2, 3)})
 
     best_s1, best_s2, best_s3 = laps['S1_s'].min(), laps['S2_s'].min(), laps['S3_s'].min()
 
     rows = []
     for sec, best in zip((1, 2, 3), (best_s1, best_s2, best_s3)):
         col = f"S{sec}_s"
-        idx = laps.groupby('Driver')[col].idxmin()
+        idx = laps.groupby('Driver', observed=True)[col].idxmin()
         sec_df = laps.loc[idx, ['Driver', col, 'Team']].copy()
         sec_df.rename(columns={col: 'Time'}, inplace=True)
         sec_df['Gap'] = sec_df['Time'] - best
@@ -200,52 +555,51 @@ def sector_gap(session, save_path):
         for abbr, team in session.results.set_index('Abbreviation')['TeamName'].items()
     }
 
-    sns.set_style("dark")
-    plt.rcParams['figure.facecolor'] = '#202020'
-    fig, axes = plt.subplots(3, 1, figsize=(11, 11), sharex=False)
+    with _figure_style(*_session_style(session, _STYLE_SECTOR_GAP)):
+        fig, axes = _subplots(3, 1, figsize=(11, 11), sharex=False)
 
-    global_max = gap_df['Gap'].max()
-    step = 0.2
-    yticks = np.arange(0, np.ceil(global_max/step)*step + step, step)
-    title_txt = {1: "Sector 1 (s)", 2: "Sector 2 (s)", 3: "Sector 3 (s)"}
+        global_max = gap_df['Gap'].max()
+        step = 0.2
+        yticks = np.arange(0, np.ceil(global_max/step)*step + step, step)
+        title_txt = {1: "Sector 1 (s)", 2: "Sector 2 (s)", 3: "Sector 3 (s)"}
 
-    for ax, sec in zip(axes, [1, 2, 3]):
-        ax.set_facecolor('#303030')
-        for s in ax.spines.values(): s.set_visible(False)
+        for ax, sec in zip(axes, [1, 2, 3]):
+            ax.set_facecolor('#303030')
+            for s in ax.spines.values(): s.set_visible(False)
 
-        data = gap_df[gap_df['Sector'] == sec].sort_values('Gap')
-        sns.barplot(
-            data=data, x='Driver', y='Gap',
-            palette=[driver_palette[d] for d in data['Driver']],
-            ax=ax, edgecolor='black', linewidth=0.6)
+            data = gap_df[gap_df['Sector'] == sec].sort_values('Gap')
+            sns.barplot(
+                data=data, x='Driver', y='Gap', order=list(data['Driver']),
+                palette=[driver_palette[d] for d in data['Driver']],
+                ax=ax, edgecolor='black', linewidth=0.6)
 
-        # dotted grid on every y‑tick
-        ax.set_yticks(yticks); ax.set_ylim(0, yticks[-1])
-        ax.set_axisbelow(True)
-        ax.yaxis.grid(True, linestyle='--', color='black', alpha=0.7)
-
-        # annotate each bar
-        for bar, g in zip(ax.patches, data['Gap']):
-            ax.text(bar.get_x()+bar.get_width()/2, g+0.01,
-                    f"+{g:.3f}", ha='center', va='bottom',
-                    fontsize=9, color='white')
-
-        # ------ vertical sector label (no overlap) --------------------------
-        ax.text(-0.05, 0.50, title_txt[sec],
-                transform=ax.transAxes,
-                rotation=90, ha='center', va='center',
-                color='white', fontsize=12, fontweight='bold',
-                clip_on=False)
-
-        ax.set_xlabel(None); ax.set_ylabel(None)
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
+            # dotted grid on every y‑tick
+            ax.set_yticks(yticks); ax.set_ylim(0, yticks[-1])
+            ax.set_axisbelow(True)
+            ax.yaxis.grid(True, linestyle='--', color='black', alpha=0.7)
+
+            # annotate each bar
+            for bar, g in zip(ax.patches, data['Gap']):
+                ax.text(bar.get_x()+bar.get_width()/2, g+0.01,
+                        f"+{g:.3f}", ha='center', va='bottom',
+                        fontsize=9, color='white')
+
+            # ------ vertical sector label (no overlap) --------------------------
+            ax.text(-0.05, 0.50, title_txt[sec],
+                    transform=ax.transAxes,
+                    rotation=90, ha='center', va='center',
+                    color='white', fontsize=12, fontweight='bold',
+                    clip_on=False)
+
+            ax.set_xlabel(None); ax.set_ylabel(None)
+            ax.tick_params(axis='x', colors='white')
+            ax.tick_params(axis='y', colors='white')
 
-    fig.suptitle(f"Best Sector Gap ({session})",
-                 fontsize=16, fontweight='bold', color='white', y=0.98)
-    fig.subplots_adjust(left=0.10, right=0.9, top=0.92, bottom=0.04)
-    fig.savefig(save_path)
-    plt.close(fig)
+        fig.suptitle(f"Best Sector Gap ({session})",
+                     fontsize=16, fontweight='bold', color='white', y=0.98)
+        fig.subplots_adjust(left=0.10, right=0.9, top=0.92, bottom=0.04)
+
+    _save(fig, save_path)
 
 # In[9]:
 
@@ -254,32 +608,23 @@ def top_speed_comparison(session, save_path):
     """Draw a top‑speed bar chart, cropping the first *cut* km/h."""
     cut = 280
     # -------- gather fastest‑lap top speeds --------------------------------
-    rows = []
+    best_idx = []
     for drv in session.laps['Driver'].unique():
-        # 1) pick only that driver’s laps
-        drv_laps = session.laps.pick_drivers(drv)
-        if drv_laps.empty:
-            continue
-
-        # 2) find their fastest lap (could be None)
+        # 1) find their fastest lap (None if they have no laps)
         try:
-            best = drv_laps.pick_fastest()
+            best = fastest_lap(session, drv)
         except Exception:
             continue
         if best is None:
             continue
+        best_idx.append(best.name)
 
-        # 3) get high-rate telemetry for that lap
-        tel = best.get_telemetry()
-        if tel is None or tel.empty:
-            continue
-
-        # 4) record top speed
-        rows.append({
-            'Driver':   drv,
-            'Team':     best['Team'],
-            'TopSpeed': tel['Speed'].max()
-        })
+    # 2) top speed from the shared per-lap telemetry summary
+    summary = lap_telemetry_summary(session, session.laps.loc[best_idx])
+    rows = [{'Driver':   r['Driver'],
+             'Team':     r['Team'],
+             'TopSpeed': float(r['MaxSpeed'])}
+            for _, r in summary.iterrows()]
 
     if not rows:
         raise RuntimeError("No valid fastest laps found in this session!")
@@ -296,336 +641,370 @@ def top_speed_comparison(session, save_path):
     # -------- plotting -----------------------------------------------------
     dark_bg  = "#202020"
     grid_col = "#444444"
-    sns.set_style("dark", {'axes.facecolor': dark_bg,
-                           'figure.facecolor': dark_bg,
-                           'grid.color': grid_col,
-                           'grid.linestyle':'--'})
-
-    fig, ax = plt.subplots(figsize=(12, 6), facecolor=dark_bg)
-    ax.set_facecolor(dark_bg)
-
-    sns.barplot(data=df, x='Driver', y='TopSpeed',
-                palette=colours, edgecolor='black', linewidth=0.6, ax=ax)
-
-    # annotate values above bars
-    for bar, spd in zip(ax.patches, df['TopSpeed']):
-        ax.text(bar.get_x()+bar.get_width()/2, spd+0.2,
-                f"{spd:.0f}", ha='center', va='bottom', fontsize=9, color = 'white')
-
-    # -------- crop the first *cut_at* km/h ---------------------------------
-    ymax = df['TopSpeed'].max() + 3
-    ax.set_ylim(cut, ymax)
-
-    #draw a thin baseline at the cut
-    ax.axhline(cut, color='black', lw=1)
-
-    ax.set_ylabel("Top Speed (km/h)")
-    ax.set_xlabel(None)
-    ax.set_title(f"{session}  •  TOP SPEED (km/h)", fontsize=14, weight='bold', color = 'white')
-    ax.tick_params(axis='x', colors='white')
-    ax.tick_params(axis='y', colors='white', color=grid_col)
-    ax.yaxis.grid(True, which='major', linestyle='--', color='gray', zorder=-1000)
-    
-    sns.despine(ax=ax, top=True, right=True)
-    plt.tight_layout()
-    fig.savefig(save_path)
-    plt.close(fig)
 
-# In[10]:
+    with _figure_style(*_session_style(session, _STYLE_DARK)):
+        fig, ax = _subplots(figsize=(12, 6), facecolor=dark_bg)
+        ax.set_facecolor(dark_bg)
 
+        sns.barplot(data=df, x='Driver', y='TopSpeed',
+                    palette=colours, edgecolor='black', linewidth=0.6, ax=ax)
 
-def telemetry_comparison(session, d1, d2, save_path):
-    # ---------- fastest laps ------------------------------------------------
-    d1_lap = session.laps.pick_drivers(d1).pick_fastest()
-    d2_lap = session.laps.pick_drivers(d2).pick_fastest()
+        # annotate values above bars
+        for bar, spd in zip(ax.patches, df['TopSpeed']):
+            ax.text(bar.get_x()+bar.get_width()/2, spd+0.2,
+                    f"{spd:.0f}", ha='center', va='bottom', fontsize=9, color = 'white')
 
-    d1_tel = d1_lap.get_car_data().add_distance()   # add Distance column
-    d2_tel = d2_lap.get_car_data().add_distance()
+        # -------- crop the first *cut_at* km/h ---------------------------------
+        ymax = df['TopSpeed'].max() + 3
+        ax.set_ylim(cut, ymax)
 
-    d1_color = fastf1.plotting.get_team_color(d1_lap['Team'], session=session)
-    d2_color = fastf1.plotting.get_team_color(d2_lap['Team'], session=session)
-    # Check if drivers are on the same team.
-    same_team = (d1_color == d2_color)
-    if same_team:
-        # Override the team color with the helmet color from our dictionary.
-        d1_color = helmet_colors.get(d1, d1_color)
-        d2_color = helmet_colors.get(d2, d2_color)
+        #draw a thin baseline at the cut
+        ax.axhline(cut, color='black', lw=1)
 
-    # ---------- circuit‑corner information ---------------------------------
-    ci = session.get_circuit_info()           # FastF1 CircuitInfo object
-    corner_dist = ci.corners['Distance'].to_numpy()
-    # map corner distances to times using the reference lap (d1)
-    def dist_to_time(dist):
-        idx = (d1_tel['Distance'] - dist).abs().idxmin()
-        return d1_tel.loc[idx, 'Time']
-    corner_times = [dist_to_time(d) for d in corner_dist]
-    corner_labels = ci.corners['Number'].astype(str).tolist()
+        ax.set_ylabel("Top Speed (km/h)")
+        ax.set_xlabel(None)
+        ax.set_title(f"{session}  •  TOP SPEED (km/h)", fontsize=14, weight='bold', color = 'white')
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white', color=grid_col)
+        ax.yaxis.grid(True, which='major', linestyle='--', color='gray', zorder=-1000)
 
-    # ---------- plotting setup ---------------------------------------------
-    fastf1.plotting.setup_mpl(mpl_timedelta_support=True,
-                              misc_mpl_mods=False, color_scheme='fastf1')
+        sns.despine(ax=ax, top=True, right=True)
+        fig.tight_layout()
 
-    fig, ax = plt.subplots(5, figsize=(25, 20), sharex=True)
+    _save(fig, save_path)
 
-    ax[0].plot(d1_tel['Time'], d1_tel['Speed'],    color=d1_color)
-    ax[0].plot(d2_tel['Time'], d2_tel['Speed'],    color=d2_color)
+# In[10]:
 
-    ax[1].plot(d1_tel['Time'], d1_tel['RPM'],      color=d1_color)
-    ax[1].plot(d2_tel['Time'], d2_tel['RPM'],      color=d2_color)
 
-    ax[2].plot(d1_tel['Time'], d1_tel['nGear'],    color=d1_color)
-    ax[2].plot(d2_tel['Time'], d2_tel['nGear'],    color=d2_color)
+def driver_colors(session, laps, drivers):
+    """
+    Team colour of every driver; team-mates get their helmet colours, and a
+    colour that is still (nearly) the same as an earlier driver's is
+    replaced by the first free tab10 colour.
+    """
+    team_colors = [fastf1.plotting.get_team_color(laps[drv]['Team'], session=session)
+                   for drv in drivers]
+    colors = [helmet_colors.get(drv, color) if team_colors.count(color) > 1 else color
+              for drv, color in zip(drivers, team_colors)]
+
+    def clashes(color, others):
+        rgb = np.array(mpl.colors.to_rgb(color))
+        return any(np.abs(rgb - mpl.colors.to_rgb(o)).max() < 0.1 for o in others)
+
+    for i, color in enumerate(colors):
+        if clashes(color, colors[:i]):
+            colors[i] = next(c for c in mpl.colormaps['tab10'].colors
+                             if not clashes(c, colors))
+    return colors
+
+# channels interpolated linearly along the lap; the others hold their last value
+_SMOOTH_CHANNELS = ("Speed", "RPM", "Throttle")
+_STEP_CHANNELS = ("nGear", "Brake")
+
+def align_on_distance(telemetry, step=10.0):
+    """
+    Resample every driver's lap telemetry onto one distance grid.
 
-    ax[3].plot(d1_tel['Time'], d1_tel['Throttle'], color=d1_color)
-    ax[3].plot(d2_tel['Time'], d2_tel['Throttle'], color=d2_color)
+    *telemetry* maps each driver to car data with ``Distance``. Returns the
+    grid [m] and ``{driver: {channel: array}}``, where ``Delta`` is the time
+    [s] each driver is behind the first one at that distance.
+    """
+    drivers = list(telemetry)
+    dist = {d: np.maximum.accumulate(telemetry[d]["Distance"].to_numpy(float))
+            for d in drivers}
+    grid = np.arange(0.0, min(v[-1] for v in dist.values()), step)
+
+    aligned = {}
+    for d in drivers:
+        tel, x = telemetry[d], dist[d]
+        # last sample at or before each grid point, for the stepped channels
+        prev = np.clip(np.searchsorted(x, grid, side="right") - 1, 0, len(x) - 1)
+        ch = {"Time": np.interp(grid, x, tel["Time"].dt.total_seconds().to_numpy())}
+        ch.update({c: np.interp(grid, x, tel[c].to_numpy(float)) for c in _SMOOTH_CHANNELS})
+        ch.update({c: tel[c].to_numpy(float)[prev] for c in _STEP_CHANNELS})
+        aligned[d] = ch
+    for d in drivers:
+        aligned[d]["Delta"] = aligned[d]["Time"] - aligned[drivers[0]]["Time"]
+    return grid, aligned
+
+def telemetry_comparison(session, *args):
+    """
+    Fastest laps of several drivers channel by channel along the lap.
 
-    ax[4].plot(d1_tel['Time'], d1_tel['Brake'],    color=d1_color)
-    ax[4].plot(d2_tel['Time'], d2_tel['Brake'],    color=d2_color)
+    Called as ``telemetry_comparison(session, d1, d2, ..., save_path)``. The
+    speed panel also carries, dashed on its right-hand axis, the time each
+    driver loses to (or gains on) ``d1``.
+    """
+    *drivers, save_path = args
+    laps = {drv: fastest_lap(session, drv) for drv in drivers}
+    grid, aligned = align_on_distance(
+        {drv: lap_telemetry(session, lap) for drv, lap in laps.items()})
+    colors = driver_colors(session, laps, drivers)
 
-    # ---------- vertical corner lines on every subplot ---------------------
-    for a in ax:
-        for t in corner_times:
-            a.axvline(t, color='white', linestyle=':', linewidth=0.8, alpha=0.7)
-    
-    # ------- draw corner numbers on every subplot ----------------------------
-    for a in ax:                                     # loop over all 5 axes
-        for t, lbl in zip(corner_times, corner_labels):
-            a.text(t, -0.08, lbl,                  # y = −0.08 axes‑fraction
-                   ha='center', va='top',
-                   transform=a.get_xaxis_transform(),
-                   fontsize=8, color='white')
-            
-    # put corner number text below the last axis ( brake plot )
-    for t, lbl in zip(corner_times, corner_labels):
-        ax[-1].text(t, -0.08, lbl, ha='center', va='top',
-                    transform=ax[-1].get_xaxis_transform(),
-                    fontsize=8, color='white')
-
-    # ---------- labels & styling -------------------------------------------
-    ax[0].set_ylabel("Speed [km/h]")
-    ax[1].set_ylabel("RPM")
-    ax[2].set_ylabel("Gear")
-    ax[3].set_ylabel("Throttle [%]")
-    ax[4].set_ylabel("Brake [%]")
-
-    for a in ax[:-1]:
-        a.set_xticklabels([])
-
-    fig.align_ylabels()
-    fig.legend([d1, d2], loc='upper right')
-
-    plt.subplots_adjust(left=0.06, right=0.99, top=0.9, bottom=0.07)
-    plt.suptitle(f"Fastest Lap Comparison\n"
-                 f"{session.event['EventName']} {session.event.year} Qualifying")
-    fig.savefig(save_path)
-    plt.close(fig)
+    # ---------- circuit‑corner information ---------------------------------
+    corners = session.get_circuit_info().corners
+    idx = np.searchsorted(grid, corners['Distance'].to_numpy(float))
+    inside = idx < len(grid)
+    corner_dist = grid[idx[inside]]
+    corner_labels = corners['Number'].astype(str).to_numpy()[inside]
+
+    panels = [("Speed", "Speed [km/h]"), ("RPM", "RPM"), ("nGear", "Gear"),
+              ("Throttle", "Throttle [%]"), ("Brake", "Brake [%]")]
+
+    with _figure_style(*_STYLE_QUALI_MAP):
+        fig, ax = _subplots(len(panels), figsize=(25, 20), sharex=True)
+
+        for a, (channel, label) in zip(ax, panels):
+            for drv, color in zip(drivers, colors):
+                a.plot(grid, aligned[drv][channel], color=color)
+            a.set_ylabel(label)
+            # one collection of corner lines per panel
+            a.vlines(corner_dist, 0, 1, transform=a.get_xaxis_transform(),
+                     colors='white', linestyles=':', linewidth=0.8, alpha=0.7)
+
+        # delta to the first driver on the speed panel's right-hand axis
+        delta = ax[0].twinx()
+        delta.axhline(0, color=colors[0], linestyle='--', linewidth=0.8)
+        for drv, color in zip(drivers[1:], colors[1:]):
+            delta.plot(grid, aligned[drv]["Delta"], color=color, linestyle='--')
+        delta.set_ylabel(f"Delta to {drivers[0]} [s]")
+        delta.grid(False)
+
+        # corner numbers once, above the first panel
+        for d, lbl in zip(corner_dist, corner_labels):
+            ax[0].text(d, 1.01, lbl, ha='center', va='bottom',
+                       transform=ax[0].get_xaxis_transform(),
+                       fontsize=8, color='white')
+
+        ax[-1].set_xlabel("Distance [m]")
+        ax[-1].set_xlim(grid[0], grid[-1])
+        fig.align_ylabels()
+        fig.legend(ax[0].get_lines()[:len(drivers)], drivers, loc='upper right')
+
+        fig.subplots_adjust(left=0.06, right=0.96, top=0.9, bottom=0.07)
+        fig.suptitle(f"Fastest Lap Comparison\n"
+                     f"{session.event['EventName']} {session.event.year} Qualifying")
+
+    _save(fig, save_path)
 
 # In[11]:
 
 
-def track_domination(session, d1, d2, save_path):
-    # Get fastest lap for each driver from the qualifying session.
-    d1_lap = session.laps.pick_drivers(d1).pick_fastest()
-    d2_lap = session.laps.pick_drivers(d2).pick_fastest()
-    
-    # Get telemetry data with added distance.
-    telemetry_driver01 = d1_lap.get_telemetry().add_distance()
-    telemetry_driver02 = d2_lap.get_telemetry().add_distance()
-    
-    telemetry_driver01['Driver'] = d1
-    telemetry_driver02['Driver'] = d2
-    telemetry_drivers = pd.concat(
-    [telemetry_driver01, telemetry_driver02],
-    ignore_index=True)
-    
-    # Define the number of mini-sectors 
-    num_minisectors = 7 * 3
-    total_distance = max(telemetry_drivers['Distance'])
-    minisector_length = total_distance / num_minisectors
-    
-    telemetry_drivers['Minisector'] = telemetry_drivers['Distance'].apply(
-        lambda dist: int((dist // minisector_length) + 1)
-    )
-    
-    average_speed = telemetry_drivers.groupby(['Minisector', 'Driver'])['Speed'].mean().reset_index()
-    fastest_driver = average_speed.loc[average_speed.groupby('Minisector')['Speed'].idxmax()]
-    fastest_driver = fastest_driver[['Minisector', 'Driver']].rename(columns={'Driver': 'Fastest_driver'})
-    telemetry_drivers = telemetry_drivers.merge(fastest_driver, on=['Minisector'])
-    telemetry_drivers = telemetry_drivers.sort_values(by=['Distance'])
-    
-    # Assign integer codes: 1 for d1 and 2 for d2 based on fastest driver per minisector.
-    telemetry_drivers.loc[telemetry_drivers['Fastest_driver'] == d1, 'Fastest_driver_int'] = 1
-    telemetry_drivers.loc[telemetry_drivers['Fastest_driver'] == d2, 'Fastest_driver_int'] = 2
-    
-    # Extract (X, Y) coordinates and form segments.
-    x = np.array(telemetry_drivers['X'].values)
-    y = np.array(telemetry_drivers['Y'].values)
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
-    fastest_driver_array = telemetry_drivers['Fastest_driver_int'].to_numpy().astype(float)
-    
-    # Get team colors using FastF1's plotting function.
-    d1_color = fastf1.plotting.get_team_color(d1_lap['Team'], session=session)
-    d2_color = fastf1.plotting.get_team_color(d2_lap['Team'], session=session)
-    
-    # Check if drivers are on the same team.
-    same_team = (d1_color == d2_color)
-    if same_team:
-        # Override the team color with the helmet color from our dictionary.
-        d1_color = helmet_colors.get(d1, d1_color)
-        d2_color = helmet_colors.get(d2, d2_color)
-        # You might also decide to use a dash pattern for one driver if needed.
-        d2_linestyle = 'solid'
+class Minisectors(NamedTuple):
+    """Mini-sector comparison of several drivers' laps."""
+    drivers: list            # column order of mean_speed
+    edges: np.ndarray        # (n + 1,) mini-sector boundaries [m]
+    mean_speed: np.ndarray   # (n, k) mean speed [km/h], NaN where a driver has no samples
+    winner: np.ndarray       # (n,) index into drivers of the fastest, -1 if nobody has samples
+    margin: np.ndarray       # (n,) km/h between the fastest and the runner-up, NaN if unopposed
+
+    def index(self, distance) -> np.ndarray:
+        """Mini-sector of every distance, 0 based; the finish line folds into the last one."""
+        n = len(self.edges) - 1
+        if not self.edges[-1] > 0:
+            raise ValueError("the laps cover no distance, so there are no mini-sectors")
+        length = self.edges[-1] / n
+        return np.clip(np.floor_divide(np.asarray(distance, float), length),
+                       0, n - 1).astype(int)
+
+def minisectors(telemetry, n_minisectors=21) -> Minisectors:
+    """
+    Split the lap into *n_minisectors* equal-distance mini-sectors and find
+    the fastest driver (highest mean speed) through each.
+
+    *telemetry* maps each driver to lap telemetry with ``Distance`` and
+    ``Speed``; any number of drivers works. Raises ValueError if none of the
+    laps covers any distance.
+    """
+    drivers = list(telemetry)
+    k = len(drivers)
+    dist = [telemetry[d]["Distance"].to_numpy(float) for d in drivers]
+    speed = [telemetry[d]["Speed"].to_numpy(float) for d in drivers]
+    total = max((np.nanmax(d) for d in dist if len(d)), default=0.0)
+    result = Minisectors(drivers, np.linspace(0.0, total, n_minisectors + 1),
+                         None, None, None)
+
+    dist, speed = np.concatenate(dist), np.concatenate(speed)
+    col = np.repeat(np.arange(k), [len(telemetry[d]) for d in drivers])
+    ok = np.isfinite(dist) & np.isfinite(speed)
+    # one flat bin per (mini-sector, driver) pair, summed in a single pass
+    flat = result.index(dist[ok]) * k + col[ok]
+    counts = np.bincount(flat, minlength=n_minisectors * k).reshape(n_minisectors, k)
+    sums = np.bincount(flat, weights=speed[ok],
+                       minlength=n_minisectors * k).reshape(n_minisectors, k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+
+    ranked = np.where(counts > 0, mean, -np.inf)
+    winner = np.where(counts.any(axis=1), np.argmax(ranked, axis=1), -1)
+    if k > 1:
+        top = np.sort(ranked, axis=1)
+        margin = top[:, -1] - top[:, -2]
+        margin[~np.isfinite(margin)] = np.nan
     else:
-        d2_linestyle = 'solid'
-    
-    # Create masks for segments belonging to each driver.
-    fastest_driver_array_seg = fastest_driver_array[:-1]
-    mask_d1 = fastest_driver_array_seg == 1
-    mask_d2 = fastest_driver_array_seg == 2
-    
-    segments_d1 = segments[mask_d1]
-    segments_d2 = segments[mask_d2]
-    
-    # Create LineCollections for each driver's segments.
-    lc_d1 = LineCollection(segments_d1, colors=d1_color, linewidths=5)
-    lc_d2 = LineCollection(segments_d2, colors=d2_color, linewidths=5, linestyles=d2_linestyle)
-
-    # Plot the track domination.
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.add_collection(lc_d1)
-    ax.add_collection(lc_d2)
-    ax.axis('equal')
-    ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
-
-    # Create a custom legend.
-    legend_elements = [
-        Line2D([0], [0], color=d1_color, lw=5, label=d1),
-        Line2D([0], [0], color=d2_color, lw=5, label=d2)
-    ]
-    ax.legend(handles=legend_elements, title='Driver')
-
-    plt.title(f"{session.event['EventName']} {session.event.year} Qualifying {d1} vs {d2}", color='silver', fontsize=16)
-    fig.savefig(save_path)
-    plt.close(fig)
+        margin = np.full(n_minisectors, np.nan)
+    return result._replace(mean_speed=mean, winner=winner, margin=margin)
+
+def track_domination(session, *args, n_minisectors=21):
+    """
+    Track map coloured by the driver who was fastest through each mini-sector.
+
+    Called as ``track_domination(session, d1, d2, ..., save_path)`` with any
+    number of drivers, compared on their fastest laps.
+    """
+    *drivers, save_path = args
+    laps = {drv: fastest_lap(session, drv) for drv in drivers}
+    telemetry = {drv: lap_telemetry(session, lap) for drv, lap in laps.items()}
+    result = minisectors(telemetry, n_minisectors)
+
+    colors = driver_colors(session, laps, drivers)
+
+    ref = telemetry[drivers[0]]
+    xy = ref[['X', 'Y']].to_numpy(float)
+    winner = result.winner[result.index(ref['Distance'])]
+    palette = np.array([mpl.colors.to_rgba(c) for c in colors])
+
+    with _figure_style(*_STYLE_QUALI_MAP):
+        fig, ax = _subplots(figsize=(12, 6))
+
+        # Draw the first driver's line, each segment in the colour of whoever
+        # won the mini-sector it starts in; a point every few pixels of
+        # track, keeping every point where the colour changes.
+        width, height = pixel_size(fig, ax)
+        extent = np.nanmax(xy, axis=0) - np.nanmin(xy, axis=0)
+        keep = decimate_path(xy, min(width / extent[0], height / extent[1]),
+                             keep=np.r_[False, winner[1:] != winner[:-1]])
+        points = xy[keep].reshape(-1, 1, 2)
+        segments = np.concatenate([points[:-1], points[1:]], axis=1)
+        track = LineCollection(segments, colors=palette[winner[keep][:-1]], linewidths=5)
+
+        # Plot the track domination.
+        ax.add_collection(track)
+        ax.axis('equal')
+        ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
+
+        # Create a custom legend.
+        legend_elements = [Line2D([0], [0], color=color, lw=5, label=drv)
+                           for drv, color in zip(drivers, colors)]
+        ax.legend(handles=legend_elements, title='Driver')
+
+        ax.set_title(f"{session.event['EventName']} {session.event.year} Qualifying "
+                     f"{' vs '.join(drivers)}", color='silver', fontsize=16)
+
+    _save(fig, save_path)
 
 # In[12]:
 
 
 def aero_performance(session, save_path):
-    best_laps = (session.laps.loc[session.laps.groupby("Team")["LapTime"].idxmin()].copy())
+    best_laps = session.laps.loc[session.laps.groupby("Team", observed=True)["LapTime"].idxmin()]
 
-    rows = []
-    for _, lap in best_laps.iterrows():
-        tel = lap.get_telemetry()          
-        mean_speed = tel['Speed'].mean()   
-        top_speed  = tel['Speed'].max()    
-        rows.append({"Team": lap["Team"],
-                     "MeanSpeed": mean_speed,
-                     "TopSpeed":  top_speed})
-
-    df = pd.DataFrame(rows)
+    summary = lap_telemetry_summary(session, best_laps)
+    df = pd.DataFrame({"Team":      summary["Team"].values,
+                       "MeanSpeed": summary["MeanSpeed"].astype(float).values,
+                       "TopSpeed":  summary["MaxSpeed"].astype(float).values})
     df["Color"] = df["Team"].apply(
         lambda t: fastf1.plotting.get_team_color(t, session=session)
     )
 
-    fig, ax = plt.subplots(figsize=(10, 10), constrained_layout=True, facecolor="white")
-    ax.set_facecolor("white")
+    with _figure_style(*_session_style(session, _STYLE_DARK)):
+        fig, ax = _subplots(figsize=(10, 10), layout="constrained", facecolor="white")
+        ax.set_facecolor("white")
+
+        team_rename = {
+            "Aston Martin": "Aston",
+            "Haas F1 Team": "Haas",
+            "Kick Sauber": "Sauber",
+            "Red Bull Racing": "RB",
+            "Racing Bulls": "VCARB"
+        }
+        df['Team'] = df['Team'].replace(team_rename)
+
+        for _, r in df.iterrows():
+            ax.scatter(r["MeanSpeed"], r["TopSpeed"],
+                       s=220, color=r["Color"], edgecolor="black", zorder=3)
+            ax.text(r["MeanSpeed"], r["TopSpeed"] + 0.2, r["Team"],
+                    ha="center", va="bottom", fontsize=9, color="black")
+
+        x_min, x_max = df["MeanSpeed"].min() - 1, df["MeanSpeed"].max() + 1
+        y_min, y_max = df["TopSpeed"].min()  - 1, df["TopSpeed"].max()  + 1
+
+        mid_x = (x_min + x_max) / 2           # exact centre of the plot
+        mid_y = (y_min + y_max) / 2
+
+        ax.set_xlim(x_min, x_max)
+        ax.set_ylim(y_min, y_max)
+
+        # axes
+        ax.plot([x_min, x_max],[y_min,  y_max], 
+                color="black", ls="--", lw=1)
+        ax.plot([x_min, x_max],[y_max,  y_min], 
+                color="black", ls="--", lw=1)
+        ax.plot([mid_x, mid_x],[y_min, y_max], 
+                color="black", ls="--", lw=1)
+        ax.plot([x_min, x_max],[mid_y,  mid_y], 
+                color="black", ls="--", lw=1)
+
+        # axes labels
+        dx = 0.5 * (df["MeanSpeed"].max() - df["MeanSpeed"].min())
+        dy = 0.5 * (df["TopSpeed"].max()  - df["TopSpeed"].min())
+
+        ax.text(mid_x + dx*0.6, mid_y + dy*0.6, "Quick &\nLow Drag",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(mid_x - dx*0.6, mid_y + dy*0.6,"Fast Straights\nSlow Corners",  
+                ha='center', va='center', fontsize=11, color='black')
+        ax.text(mid_x - dx*0.6, mid_y - dy*0.6, "Underperforming",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(mid_x + dx*0.6, mid_y - dy*0.6, "High Downforce",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(x_min+0.6, mid_y + 0.1, "Low Speed",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(x_max-0.6, mid_y + 0.1, "High Speed",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(mid_x, y_min+0.2, "High Drag",
+                ha="center", va="center", fontsize=11, color="black")
+        ax.text(mid_x, y_max-0.2, "Low Drag",
+                ha="center", va="center", fontsize=11, color="black")
+
+
+        ax.set_xlabel("Mean Speed (km/h)", fontsize=12, color="black")
+        ax.set_ylabel("Top Speed (km/h)",  fontsize=12, color="black")
+        ax.set_title(f"{session} \nAreo Performance (Best Lap of Each Team)",
+                     fontsize=14, pad=15, color="black")
+
+        ax.set_xlim(df["MeanSpeed"].min()-1, df["MeanSpeed"].max()+1)
+        ax.set_ylim(df["TopSpeed"].min()-1,  df["TopSpeed"].max()+1)
+        ax.grid(ls=":", alpha=0.4)
+        ax.tick_params(axis='x', colors='black', color='grey')
+        ax.tick_params(axis='y', colors='black', color='grey')
+
+        for side in ['top','bottom','left','right']:
+            ax.spines[side].set_visible(True)
+            ax.spines[side].set_color('black')
+            ax.spines[side].set_linewidth(1)
 
-    team_rename = {
-        "Aston Martin": "Aston",
-        "Haas F1 Team": "Haas",
-        "Kick Sauber": "Sauber",
-        "Red Bull Racing": "RB",
-        "Racing Bulls": "VCARB"
-    }
-    df['Team'] = df['Team'].replace(team_rename)
-
-    for _, r in df.iterrows():
-        ax.scatter(r["MeanSpeed"], r["TopSpeed"],
-                   s=220, color=r["Color"], edgecolor="black", zorder=3)
-        ax.text(r["MeanSpeed"], r["TopSpeed"] + 0.2, r["Team"],
-                ha="center", va="bottom", fontsize=9, color="black")
-
-    x_min, x_max = df["MeanSpeed"].min() - 1, df["MeanSpeed"].max() + 1
-    y_min, y_max = df["TopSpeed"].min()  - 1, df["TopSpeed"].max()  + 1
-
-    mid_x = (x_min + x_max) / 2           # exact centre of the plot
-    mid_y = (y_min + y_max) / 2
-
-    ax.set_xlim(x_min, x_max)
-    ax.set_ylim(y_min, y_max)
-
-    # axes
-    ax.plot([x_min, x_max],[y_min,  y_max], 
-            color="black", ls="--", lw=1)
-    ax.plot([x_min, x_max],[y_max,  y_min], 
-            color="black", ls="--", lw=1)
-    ax.plot([mid_x, mid_x],[y_min, y_max], 
-            color="black", ls="--", lw=1)
-    ax.plot([x_min, x_max],[mid_y,  mid_y], 
-            color="black", ls="--", lw=1)
-
-    # axes labels
-    dx = 0.5 * (df["MeanSpeed"].max() - df["MeanSpeed"].min())
-    dy = 0.5 * (df["TopSpeed"].max()  - df["TopSpeed"].min())
-
-    ax.text(mid_x + dx*0.6, mid_y + dy*0.6, "Quick &\nLow Drag",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(mid_x - dx*0.6, mid_y + dy*0.6,"Fast Straights\nSlow Corners",  
-            ha='center', va='center', fontsize=11, color='black')
-    ax.text(mid_x - dx*0.6, mid_y - dy*0.6, "Underperforming",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(mid_x + dx*0.6, mid_y - dy*0.6, "High Downforce",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(x_min+0.6, mid_y + 0.1, "Low Speed",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(x_max-0.6, mid_y + 0.1, "High Speed",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(mid_x, y_min+0.2, "High Drag",
-            ha="center", va="center", fontsize=11, color="black")
-    ax.text(mid_x, y_max-0.2, "Low Drag",
-            ha="center", va="center", fontsize=11, color="black")
-
-
-    ax.set_xlabel("Mean Speed (km/h)", fontsize=12, color="black")
-    ax.set_ylabel("Top Speed (km/h)",  fontsize=12, color="black")
-    ax.set_title(f"{session} \nAreo Performance (Best Lap of Each Team)",
-                 fontsize=14, pad=15, color="black")
-
-    ax.set_xlim(df["MeanSpeed"].min()-1, df["MeanSpeed"].max()+1)
-    ax.set_ylim(df["TopSpeed"].min()-1,  df["TopSpeed"].max()+1)
-    ax.grid(ls=":", alpha=0.4)
-    ax.tick_params(axis='x', colors='black', color='grey')
-    ax.tick_params(axis='y', colors='black', color='grey')
-
-    for side in ['top','bottom','left','right']:
-        ax.spines[side].set_visible(True)
-        ax.spines[side].set_color('black')
-        ax.spines[side].set_linewidth(1)
-
-    ax.set_axisbelow(True)
-    ax.grid(True,
-            which='major',
-            axis='both',
-            color='grey',
-            linestyle=':',
-            linewidth=0.8,
-            alpha=0.7)
-
-    plt.tight_layout()
-    
-    plt.tight_layout()
-    
-    fig.savefig(save_path)
-    plt.close(fig)
+        ax.set_axisbelow(True)
+        ax.grid(True,
+                which='major',
+                axis='both',
+                color='grey',
+                linestyle=':',
+                linewidth=0.8,
+                alpha=0.7)
+
+        # tight_layout replaces the constrained engine; the second pass
+        # settles the result
+        fig.tight_layout()
+        fig.tight_layout()
+
+    _save(fig, save_path)
 
 # In[13]:
 
 
 def quali_result(session, save_path):
     # create fastest lap col
-    df = session.results
+    df = session.results.copy()
     q1 = df["Q1"].iloc[-5:].tolist()
     q2 = df["Q2"].iloc[10:15].tolist()
     q3 = df["Q3"].iloc[:10].tolist()
@@ -636,101 +1015,100 @@ def quali_result(session, save_path):
     df["Delta_s"] = (df["fastest_lap"] - pole_time).dt.total_seconds()
     
     # Build bar chart
-    fig, ax = plt.subplots()
-    bars = ax.barh(
-        df["Abbreviation"],
-        df["Delta_s"],
-        color=[fastf1.plotting.get_team_color(t, session=session) for t in df["TeamName"]],
-        edgecolor="grey")
-    ax.invert_yaxis()
-    ax.set_xlabel("Gap to Pole (s)", color="white")
-    # Format the plot title using the pole lap's time.
-    lap_time_string = strftimedelta(df['fastest_lap'].iloc[0], '%m:%s.%ms')
-    plt.suptitle(f"{session}\n"
-                 f"Fastest Lap: {lap_time_string} ({df['Abbreviation'].iloc[0]})", color='white')
-    # Draw vertical grid lines behind the bars.
-    ax.set_axisbelow(True)
-    ax.xaxis.grid(True, which='major', linestyle='--', color='grey', zorder=-1000)
-    ax.yaxis.grid(False)
-    ax.tick_params(axis='x', colors='white')
-    ax.tick_params(axis='y', colors='white')
-    # Annotate each bar
-    offset = 0.02
-    for bar, d in zip(bars, df["Delta_s"]):
-        ax.text(d + offset, bar.get_y() + bar.get_height()/2,
-                f"+{d:.3f}", va="center", ha='left', color="white", fontsize=10)
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-    # Style for dark background
-    fig.patch.set_facecolor("#202020")
-    ax.set_facecolor("#202020")
-    ax.tick_params(colors="white")
-    plt.tight_layout()
-    fig.savefig(save_path)
-    plt.close(fig)
+    with _figure_style(*_STYLE_DARK):
+        fig, ax = _subplots()
+        bars = ax.barh(
+            df["Abbreviation"],
+            df["Delta_s"],
+            color=[fastf1.plotting.get_team_color(t, session=session) for t in df["TeamName"]],
+            edgecolor="grey")
+        ax.invert_yaxis()
+        ax.set_xlabel("Gap to Pole (s)", color="white")
+        # Format the plot title using the pole lap's time.
+        lap_time_string = strftimedelta(df['fastest_lap'].iloc[0], '%m:%s.%ms')
+        fig.suptitle(f"{session}\n"
+                     f"Fastest Lap: {lap_time_string} ({df['Abbreviation'].iloc[0]})", color='white')
+        # Draw vertical grid lines behind the bars.
+        ax.set_axisbelow(True)
+        ax.xaxis.grid(True, which='major', linestyle='--', color='grey', zorder=-1000)
+        ax.yaxis.grid(False)
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+        # Annotate each bar
+        offset = 0.02
+        for bar, d in zip(bars, df["Delta_s"]):
+            ax.text(d + offset, bar.get_y() + bar.get_height()/2,
+                    f"+{d:.3f}", va="center", ha='left', color="white", fontsize=10)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        # Style for dark background
+        fig.patch.set_facecolor("#202020")
+        ax.set_facecolor("#202020")
+        ax.tick_params(colors="white")
+        fig.tight_layout()
+
+    _save(fig, save_path)
 
 # In[14]:
 
 
 def pos_change(session, save_path):
     # --- find SC / VSC laps BEFORE plotting ------------------------------
-    sc_laps, vsc_laps = find_sc_laps(session.laps)
-
-    fig, ax = plt.subplots(figsize=(9, 5.2), constrained_layout=True)
-    ax.set_facecolor("#202020")                       # dark bg (optional)
-    fig.patch.set_facecolor("#202020")
-
-    # Shade SC / VSC periods first so lines sit on top
-    shade_periods(ax, sc_laps, vsc_laps, color="orange")
-
-    # --- driver position traces -----------------------------------------
-    for drv in session.drivers:
-        laps = session.laps.pick_drivers(drv)
-        abb  = laps["Driver"].iloc[0]
-        style = fastf1.plotting.get_driver_style(
-            identifier=abb, style=["color", "linestyle"], session=session
-        )
-        ax.plot(laps["LapNumber"], laps["Position"], label=abb, **style, lw=1.5)
-
-    # --- cosmetics -------------------------------------------------------
-    ax.set_ylim(20.5, 0.5)
-    ax.set_yticks([1, 5, 10, 15, 20])
-    ax.set_xlabel("Lap", color="white")
-    ax.set_ylabel("Position", color="white")
-    ax.tick_params(axis='both', colors='white')
-    # ← new, clean title:
-    race = session.event["EventName"]
-    year = session.event.year
-    ax.set_title(f"{year} {race} — Race • Position Changes",
-             color="white", pad=8)
-    ax.legend(bbox_to_anchor=(1.0, 1.02))
-    leg = ax.legend(bbox_to_anchor=(1.0, 1.02))
-    # make all legend texts white
-    for txt in leg.get_texts():
-        txt.set_color("white")
-    # also ensure the axis ticks & labels are white
-    ax.tick_params(axis='both', colors='white')
-    ax.xaxis.label.set_color('white')
-    ax.yaxis.label.set_color('white')
-
-    
-    fig.savefig(save_path)
-    plt.close(fig)
+    status = track_status_index(session)
+
+    with _figure_style(*_STYLE_RACE):
+        fig, ax = _subplots(figsize=(9, 5.2), layout="constrained")
+        ax.set_facecolor("#202020")                       # dark bg (optional)
+        fig.patch.set_facecolor("#202020")
+
+        # Shade SC / VSC periods first so lines sit on top
+        shade_periods(ax, status.sc_intervals, status.vsc_intervals, color="orange")
+
+        # --- driver position traces -----------------------------------------
+        for drv in session.drivers:
+            laps = session.laps.pick_drivers(drv)
+            abb  = laps["Driver"].iloc[0]
+            style = fastf1.plotting.get_driver_style(
+                identifier=abb, style=["color", "linestyle"], session=session
+            )
+            ax.plot(laps["LapNumber"], laps["Position"], label=abb, **style, lw=1.5)
+
+        # --- cosmetics -------------------------------------------------------
+        ax.set_ylim(20.5, 0.5)
+        ax.set_yticks([1, 5, 10, 15, 20])
+        ax.set_xlabel("Lap", color="white")
+        ax.set_ylabel("Position", color="white")
+        ax.tick_params(axis='both', colors='white')
+        # ← new, clean title:
+        race = session.event["EventName"]
+        year = session.event.year
+        ax.set_title(f"{year} {race} — Race • Position Changes",
+                 color="white", pad=8)
+        ax.legend(bbox_to_anchor=(1.0, 1.02))
+        leg = ax.legend(bbox_to_anchor=(1.0, 1.02))
+        # make all legend texts white
+        for txt in leg.get_texts():
+            txt.set_color("white")
+        # also ensure the axis ticks & labels are white
+        ax.tick_params(axis='both', colors='white')
+        ax.xaxis.label.set_color('white')
+        ax.yaxis.label.set_color('white')
+
+    _save(fig, save_path)
 
 # In[23]:
 
 
 #Team Pace Comparison
 def team_pace(session, save_path):
-    laps = session.laps.pick_quicklaps()
-
-    transformed_laps = laps.copy()
-    transformed_laps["LapTime (s)"] = laps["LapTime"].dt.total_seconds()
+    laps = stint_table(session).laps
+    transformed_laps = (laps.loc[laps["Quick"], ["Team", "LapTime_s"]]
+                            .rename(columns={"LapTime_s": "LapTime (s)"}))
 
     # order the team from the fastest (lowest median lap time) tp slower
     team_order = (
         transformed_laps[["Team", "LapTime (s)"]]
-          .groupby("Team").median()["LapTime (s)"]
+          .groupby("Team", observed=True).median()["LapTime (s)"]
           .sort_values()
           .index
     )
@@ -739,51 +1117,49 @@ def team_pace(session, save_path):
     team_palette = {t: fastf1.plotting.get_team_color(t, session=session)
                     for t in team_order}
 
-    fig, ax = plt.subplots(figsize=(15, 10),  facecolor="#202020")
-    ax.set_facecolor("#202020")
-
-    sns.boxplot(
-        data=transformed_laps,
-        x="Team",
-        y="LapTime (s)",
-        order=team_order,
-        palette=team_palette,   
-        width=0.6,             
-        dodge=False,            # keep each box centred on its tick
-        whiskerprops=dict(color="white"),
-        boxprops=dict(edgecolor="white"),
-        medianprops=dict(color="white"),
-        capprops=dict(color="white"),
-        flierprops  =dict(marker="o",
-                          markeredgecolor="white",
-                          markersize=4,
-                          linestyle="none")
-    )
-    
+    with _figure_style(*_STYLE_RACE):
+        fig, ax = _subplots(figsize=(15, 10),  facecolor="#202020")
+        ax.set_facecolor("#202020")
+
+        sns.boxplot(
+            data=transformed_laps,
+            ax=ax,
+            x="Team",
+            y="LapTime (s)",
+            order=team_order,
+            palette=team_palette,   
+            width=0.6,             
+            dodge=False,            # keep each box centred on its tick
+            whiskerprops=dict(color="white"),
+            boxprops=dict(edgecolor="white"),
+            medianprops=dict(color="white"),
+            capprops=dict(color="white"),
+            flierprops  =dict(marker="o",
+                              markeredgecolor="white",
+                              markersize=4,
+                              linestyle="none")
+        )
 
-    ax.set_title(f"{session} Team Pace Comparison", color="white")
-    ax.set_xlabel("")
-    ax.tick_params(axis='x', colors='white')
-    ax.tick_params(axis='y', colors='white')
-    ax.margins(x=0.02)         
-    ax.xaxis.grid(False)
-    plt.tight_layout()
-    
-    fig.savefig(save_path)
-    plt.close(fig)
+
+        ax.set_title(f"{session} Team Pace Comparison", color="white")
+        ax.set_xlabel("")
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+        ax.margins(x=0.02)         
+        ax.xaxis.grid(False)
+        fig.tight_layout()
+
+    _save(fig, save_path)
 
 # In[16]:
 
 
 #Tyre Deg
 def tyre_deg(session, save_path):
-    laps = (session.laps.pick_quicklaps().reset_index(drop=True))
-
-    # Tyre age (lap‑counter within each stint)
-    laps["TyreAge"] = laps.groupby(["Driver", "Stint"]).cumcount() + 1
-
-    # Lap time in seconds
-    laps["LapTime_s"] = laps["LapTime"].dt.total_seconds()
+    # quick laps, with the tyre age (lap counter within each stint) and lap
+    # time in seconds from the shared stint table
+    laps = stint_table(session).laps
+    laps = laps.loc[laps["Quick"], ["Compound", "LapNumber", "LapTime_s", "TyreAge"]]
 
     # VERY simple fuel correction
     #  Rule of thumb:  0.03 s per kg  →  ~1.6 kg fuel burnt per lap
@@ -791,10 +1167,11 @@ def tyre_deg(session, save_path):
     FUEL_PER_LAP = 1.6        # kg
     PENALTY_PER_KG = 0.03     # s
 
-    laps["FuelCorrLapTime"] = (laps["LapTime_s"] - laps["LapNumber"] * FUEL_PER_LAP * PENALTY_PER_KG)
+    laps = laps.assign(FuelCorrLapTime=laps["LapTime_s"]
+                                       - laps["LapNumber"] * FUEL_PER_LAP * PENALTY_PER_KG)
 
     # Average lap‑time by tyre age & compound
-    deg = (laps.groupby(["Compound", "TyreAge"])["FuelCorrLapTime"].mean().reset_index())
+    deg = (laps.groupby(["Compound", "TyreAge"], observed=True)["FuelCorrLapTime"].mean().reset_index())
 
     # Order compounds as they appear on the legend
     compound_order = ["SOFT", "MEDIUM", "HARD"]
@@ -802,26 +1179,25 @@ def tyre_deg(session, save_path):
 
 
     # Plot
-    plt.style.use("dark_background")        # black backdrop like your sample
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    for comp in compound_order:
-        df = deg[deg["Compound"] == comp]
-        ax.plot(df["TyreAge"], df["FuelCorrLapTime"],
-                color=colours[comp], marker="o", lw=2, label=comp)
-
-    # Cosmetic tweaks ------------------------------------------------
-    ax.set_title(f"Tyre Degradation ({session})", pad=15, fontsize=16)
-    ax.set_xlabel("Tyre Age (Laps)")
-    ax.set_ylabel("Fuel‑Corrected LapTime (s)")
-    ax.set_xlim(left=0)
-    ax.grid(ls="--", lw=0.4, color="grey", alpha=0.4)
-    ax.legend(frameon=False, loc="upper right", fontsize=11)
-
-    plt.tight_layout()
-    
-    fig.savefig(save_path)
-    plt.close(fig)
+    with _figure_style(*_STYLE_TYRE_DEG):
+        fig, ax = _subplots(figsize=(10, 6))
+
+        for comp in compound_order:
+            df = deg[deg["Compound"] == comp]
+            ax.plot(df["TyreAge"], df["FuelCorrLapTime"],
+                    color=colours[comp], marker="o", lw=2, label=comp)
+
+        # Cosmetic tweaks ------------------------------------------------
+        ax.set_title(f"Tyre Degradation ({session})", pad=15, fontsize=16)
+        ax.set_xlabel("Tyre Age (Laps)")
+        ax.set_ylabel("Fuel‑Corrected LapTime (s)")
+        ax.set_xlim(left=0)
+        ax.grid(ls="--", lw=0.4, color="grey", alpha=0.4)
+        ax.legend(frameon=False, loc="upper right", fontsize=11)
+
+        fig.tight_layout()
+
+    _save(fig, save_path)
 
 # In[17]:
 
@@ -833,26 +1209,19 @@ def plot_top_speed_heatmap(session, save_path, n_top=15, cut_at=None):
     boxing DRS-on points, with a dark background and white text.
     """
     # 1) Gather per-lap max speed + DRS
-    rows = []
-    for _, lap in session.laps.iterlaps():
-        tel = lap.get_telemetry()
-        if tel.empty:
-            continue
-        idx = tel['Speed'].idxmax()
-        rows.append({
-            'Driver': lap['Driver'],
-            'TopSpeed': tel.at[idx, 'Speed'],
-            'DRS':      'on' if int(tel.at[idx, 'DRS']) % 2 == 0 else 'off'
-        })
-
-    df = pd.DataFrame(rows)
+    summary = lap_telemetry_summary(session)
+    df = pd.DataFrame({
+        'Driver':   summary['Driver'].values,
+        'TopSpeed': summary['MaxSpeed'].astype(float).values,
+        'DRS':      np.where(summary['DRSAtMax'].astype(int) % 2 == 0, 'on', 'off')
+    })
 
     # 2) Keep top n_top per driver
     df = (
         df.sort_values(['Driver','TopSpeed'], ascending=[True, False])
-          .groupby('Driver', group_keys=False)
+          .groupby('Driver', group_keys=False, observed=True)
           .head(n_top)
-          .assign(Rank=lambda d: d.groupby('Driver').cumcount()+1)
+          .assign(Rank=lambda d: d.groupby('Driver', observed=True).cumcount()+1)
     )
 
     # 3) Pivot to wide form
@@ -860,43 +1229,43 @@ def plot_top_speed_heatmap(session, save_path, n_top=15, cut_at=None):
     drs_mat   = df.pivot(index='Driver', columns='Rank', values='DRS')
 
     # 4) Plot setup
-    fig, ax = plt.subplots(figsize=(10, 6), facecolor='#202020')
-    ax.set_facecolor('#202020')
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-
-    im = ax.imshow(speed_mat, aspect='auto', cmap='plasma', origin='lower')
-
-    # 5) White axis labels & ticks
-    ax.set_xticks(np.arange(speed_mat.shape[1]))
-    ax.set_xticklabels(speed_mat.columns, color='white')
-    ax.set_yticks(np.arange(speed_mat.shape[0]))
-    ax.set_yticklabels(speed_mat.index, color='white')
-    ax.set_xlabel(f"Top {n_top} Lap Speeds\n(black: DRS On; white: DRS Off)", color='white')
-    ax.set_ylabel("Driver", color='white')
-    ax.set_title(f"{session.event['EventName']} {session.event.year}\nTop Speed Heatmap",
-                 color='white')
-    #cbar = fig.colorbar(im, ax=ax)
-    #cbar.ax.yaxis.set_tick_params(color='white')
-    #cbar.outline.set_edgecolor('white')
-    #cbar.set_label('Top Speed (km/h)', color='white')
-    #plt.setp(cbar.ax.get_yticklabels(), color='white')
-
-    # 8) Annotate speeds; bold if DRS was on
-    for i, drv in enumerate(speed_mat.index):
-        for j, rk in enumerate(speed_mat.columns):
-            val = speed_mat.at[drv, rk]
-            if pd.isna(val):
-                continue
-            drs_on = (drs_mat.at[drv, rk] == 'on')
-            ax.text(j, i, f"{val:.0f}",
-                    ha='center', va='center',
-                    color='black' if drs_on else 'white', fontsize = 10)
-
-    plt.tight_layout()
-    
-    fig.savefig(save_path)
-    plt.close(fig)
+    with _figure_style(*_STYLE_DARK):
+        fig, ax = _subplots(figsize=(10, 6), facecolor='#202020')
+        ax.set_facecolor('#202020')
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+
+        im = ax.imshow(speed_mat, aspect='auto', cmap='plasma', origin='lower')
+
+        # 5) White axis labels & ticks
+        ax.set_xticks(np.arange(speed_mat.shape[1]))
+        ax.set_xticklabels(speed_mat.columns, color='white')
+        ax.set_yticks(np.arange(speed_mat.shape[0]))
+        ax.set_yticklabels(speed_mat.index, color='white')
+        ax.set_xlabel(f"Top {n_top} Lap Speeds\n(black: DRS On; white: DRS Off)", color='white')
+        ax.set_ylabel("Driver", color='white')
+        ax.set_title(f"{session.event['EventName']} {session.event.year}\nTop Speed Heatmap",
+                     color='white')
+        #cbar = fig.colorbar(im, ax=ax)
+        #cbar.ax.yaxis.set_tick_params(color='white')
+        #cbar.outline.set_edgecolor('white')
+        #cbar.set_label('Top Speed (km/h)', color='white')
+        #plt.setp(cbar.ax.get_yticklabels(), color='white')
+
+        # 8) Annotate speeds; bold if DRS was on
+        for i, drv in enumerate(speed_mat.index):
+            for j, rk in enumerate(speed_mat.columns):
+                val = speed_mat.at[drv, rk]
+                if pd.isna(val):
+                    continue
+                drs_on = (drs_mat.at[drv, rk] == 'on')
+                ax.text(j, i, f"{val:.0f}",
+                        ha='center', va='center',
+                        color='black' if drs_on else 'white', fontsize = 10)
+
+        fig.tight_layout()
+
+    _save(fig, save_path)
 
 
 